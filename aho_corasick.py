@@ -0,0 +1,58 @@
+from typing import Dict, Iterable, List
+
+
+class AhoCorasick:
+    """
+    Counts the occurrences of many patterns in one pass over a text, overlapping ones included.
+    The trie's failure links are folded into a full transition table (a dict of next byte to state per state),
+    so each byte of the text is a single lookup; bytes no pattern contains go back to the root
+    """
+
+    def __init__(self, patterns: Iterable[bytes]):
+        self.patterns = list(dict.fromkeys(patterns))  # type: List[bytes]
+        if any(not pattern for pattern in self.patterns):
+            raise ValueError("Patterns must not be empty")
+
+        children = [dict()]  # type: List[Dict[int, int]]
+        self.terminals = dict()  # type: Dict[bytes, int]
+        for pattern in self.patterns:
+            state = 0
+            for byte in pattern:
+                child = children[state].get(byte)
+                if child is None:
+                    child = len(children)
+                    children.append(dict())
+                    children[state][byte] = child
+                state = child
+            self.terminals[pattern] = state
+
+        # Breadth-first, so a state's failure state (always shallower) is complete before the state itself
+        self.fail = [0] * len(children)
+        self.transitions = [children[0]]  # type: List[Dict[int, int]]
+        self.transitions.extend(dict() for _ in range(len(children) - 1))
+        self.order = []  # type: List[int]
+        frontier = list(children[0].values())
+        while frontier:
+            next_frontier = []
+            for state in frontier:
+                self.order.append(state)
+                self.transitions[state] = {**self.transitions[self.fail[state]], **children[state]}
+                for byte, child in children[state].items():
+                    self.fail[child] = self.transitions[self.fail[state]].get(byte, 0) if state else 0
+                    next_frontier.append(child)
+            frontier = next_frontier
+
+    def count(self, text: bytes) -> Dict[bytes, int]:
+        """
+        Occurrences of each pattern in `text`
+        """
+        # How many times each state is reached; a pattern ends wherever its state or a state failing into it is
+        visits = [0] * len(self.fail)
+        steps = [transitions.get for transitions in self.transitions]
+        state = 0
+        for byte in text:
+            state = steps[state](byte, 0)
+            visits[state] += 1
+        for state in reversed(self.order):
+            visits[self.fail[state]] += visits[state]
+        return {pattern: visits[terminal] for pattern, terminal in self.terminals.items()}
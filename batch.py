@@ -0,0 +1,170 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+import glob
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from typing import Dict, List, Optional
+
+from cache import CACHE_ENV
+from common import RESULTS_SINK_ENV, STATUS_FAIL, get_result_record
+from main import STATUS_FAILED, STATUS_OK, parse_selection
+from registry import PARTS, get_available_days, get_day_cases, get_day_module, run_solve
+
+
+@dataclass
+class BatchResult:
+    input_path: str
+    part: int
+    status: str
+    elapsed: float
+    record: Optional[Dict] = None
+    error: Optional[str] = None
+
+
+def get_input_paths(patterns: List[str]) -> List[str]:
+    """
+    Every file of the given directories, and every file matching the given globs
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            names = sorted(os.listdir(pattern))
+            paths.extend(os.path.join(pattern, name) for name in names if os.path.isfile(os.path.join(pattern, name)))
+        else:
+            paths.extend(sorted(path for path in glob.glob(pattern) if os.path.isfile(path)))
+    return [os.path.abspath(path) for path in paths]
+
+
+def warm_up(day: int):
+    # Imported once per worker: whatever the day builds at import time (regexes, tables, ...) and caches
+    # while solving is then shared by every file the worker gets, instead of being rebuilt per file
+    get_day_module(day)
+
+
+def solve_file(day: int, part: int, input_path: str, kwargs: Dict, trace_memory: bool = True) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(io.StringIO()):
+            result = run_solve(day, part, input_path, kwargs, trace_memory)
+    except Exception:
+        return BatchResult(input_path, part, STATUS_FAILED, time.perf_counter() - start, error=traceback.format_exc())
+    status = STATUS_FAILED if result.status == STATUS_FAIL else STATUS_OK
+    return BatchResult(input_path, part, status, time.perf_counter() - start, get_result_record(result))
+
+
+def get_expected_outputs(answers_path: Optional[str]) -> Dict[str, Dict[str, any]]:
+    """
+    Answers file: {"<input file name>": {"1": <part 1 answer>, "2": <part 2 answer>}, ...}
+    """
+    if answers_path is None:
+        return dict()
+    with open(answers_path) as f:
+        return json.load(f)
+
+
+def print_result(result: BatchResult):
+    name = os.path.relpath(result.input_path)
+    line = f"[{result.status}] part {result.part} {name} ({result.elapsed:.3f}s)"
+    if result.record is not None:
+        line += f": {result.record['solution']}"
+        if result.status == STATUS_FAILED:
+            line += f" (expected {result.record['expected']})"
+    print(line, flush=True)
+    if result.error:
+        print(f"    ! {result.error.rstrip().splitlines()[-1]}", flush=True)
+
+
+def run_batch(
+    day: int,
+    parts: List[int],
+    input_paths: List[str],
+    workers: Optional[int],
+    kwargs: Dict,
+    expected_outputs: Dict[str, Dict[str, any]],
+    trace_memory: bool = True,
+) -> List[BatchResult]:
+    """
+    Solves every part of every input across a process pool, printing results as they complete
+    """
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_up, initargs=(day,)) as executor:
+        futures = dict()
+        for input_path in input_paths:
+            expected = expected_outputs.get(os.path.basename(input_path), dict())
+            for part in parts:
+                part_kwargs = dict(kwargs)
+                if str(part) in expected:
+                    part_kwargs["expected_output"] = expected[str(part)]
+                future = executor.submit(solve_file, day, part, input_path, part_kwargs, trace_memory)
+                futures[future] = (input_path, part)
+
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception:
+                input_path, part = futures[future]
+                result = BatchResult(input_path, part, STATUS_FAILED, 0, error=traceback.format_exc())
+            print_result(result)
+            results.append(result)
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run one day of Advent of Code 2024 over many inputs")
+    parser.add_argument("--day", type=int, required=True, choices=get_available_days())
+    parser.add_argument("inputs", nargs="+", help="Directories and/or globs of input files")
+    parser.add_argument("--parts", default="1,2", help="Parts to run, e.g. 2")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--kwargs", default="{}", help='Extra solve_partN arguments as JSON, e.g. {"board_size": 71}')
+    parser.add_argument("--answers", default=None, help="JSON file of the expected answers of each input file")
+    parser.add_argument("--results", default=None, help="Append every result as a JSON line to this file")
+    parser.add_argument("--cache", action="store_true", help="Reuse parsed inputs cached on disk")
+    parser.add_argument("--no-trace-memory", action="store_true", help="Don't measure peak memory with tracemalloc")
+    args = parser.parse_args(argv)
+    try:
+        day_parts = {part for case in get_day_cases(args.day) for part in case.parts}
+        args.parts = parse_selection(args.parts, sorted(day_parts.intersection(PARTS)))
+        args.kwargs = json.loads(args.kwargs)
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    input_paths = get_input_paths(args.inputs)
+    if not input_paths:
+        print(f"No input files in {args.inputs}")
+        return 1
+
+    if args.results:
+        # Workers pick the sink up from the environment
+        os.environ[RESULTS_SINK_ENV] = os.path.abspath(args.results)
+    if args.cache:
+        os.environ[CACHE_ENV] = "1"
+
+    start = time.perf_counter()
+    results = run_batch(
+        args.day,
+        args.parts,
+        input_paths,
+        args.workers,
+        args.kwargs,
+        get_expected_outputs(args.answers),
+        not args.no_trace_memory,
+    )
+    failed = sum(result.status != STATUS_OK for result in results)
+    print(
+        f"{len(results) - failed} / {len(results)} OK, {len(input_paths)} inputs in {time.perf_counter() - start:.3f}s"
+    )
+    return int(failed > 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+import json
+import math
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+import traceback
+from typing import Dict, List, Optional
+
+from cache import CACHE_ENV
+from generate import get_generator, get_generator_days, get_min_size, get_solve_kwargs, write_input
+from main import parse_selection
+from registry import PARTS, Case, get_available_days, get_day_cases, get_day_module, run_case, select_cases
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+BASELINE_PATH = dir_path + os.sep + "bench_baseline.json"
+SCALING_PATH = dir_path + os.sep + "bench_scaling.json"
+DEFAULT_REPEAT = 5
+DEFAULT_WARMUP = 1
+DEFAULT_THRESHOLD = 0.2
+
+# Without explicit `--sizes`, scaling curves use these multiples of each generator's default size,
+# clamped to the generator's `MIN_SIZE`
+DEFAULT_SCALING_FACTORS = (0.25, 0.5, 1, 2, 4)
+
+# Below this, timer noise dominates and relative regressions are meaningless
+MIN_COMPARABLE_SECONDS = 0.005
+
+
+@dataclass
+class BenchResult:
+    key: str
+    day: int
+    parts: List[int]
+    source: str
+    status: str
+    wall_min: float = 0
+    wall_median: float = 0
+    wall_p95: float = 0
+    cpu_median: float = 0
+    peak_rss_bytes: int = 0
+    error: Optional[str] = None
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    rank = max(math.ceil(p / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def get_peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def bench_case(case: Case, repeat: int, warmup: int) -> BenchResult:
+    """
+    Runs inside a fresh worker process, so peak RSS belongs to this case alone.
+    The expected answers in the case make every timed run a correctness check as well
+    """
+    result = BenchResult(case.key, case.day, list(case.parts), case.source, "OK")
+    try:
+        module = get_day_module(case.day)
+        input_path = getattr(module, case.input_name, None)
+        if input_path is not None and not os.path.exists(input_path):
+            result.status, result.error = "MISSING", f"{input_path} does not exist"
+            return result
+
+        walls, cpus = [], []
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            for _ in range(warmup):
+                run_case(case, trace_memory=False)
+            for _ in range(repeat):
+                wall_start, cpu_start = time.perf_counter(), time.process_time()
+                context = run_case(case, trace_memory=False)
+                walls.append(time.perf_counter() - wall_start)
+                cpus.append(time.process_time() - cpu_start)
+                if context.has_failed:
+                    raise AssertionError(f"Wrong answer: {context.results}")
+    except Exception:
+        result.status, result.error = "FAILED", traceback.format_exc()
+        return result
+
+    result.wall_min = min(walls)
+    result.wall_median = statistics.median(walls)
+    result.wall_p95 = percentile(walls, 95)
+    result.cpu_median = statistics.median(cpus)
+    result.peak_rss_bytes = get_peak_rss_bytes()
+    return result
+
+
+def run_benchmarks(cases: List[Case], repeat: int, warmup: int) -> List[BenchResult]:
+    os.environ.pop(CACHE_ENV, None)
+    results = []
+    for case in cases:
+        # A process per case, run one at a time so cases don't compete for the CPU
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results.append(executor.submit(bench_case, case, repeat, warmup).result())
+    return results
+
+
+def get_scaling_case(day: int, part: int, size: int, seed: int) -> Case:
+    path = write_input(day, size, seed)
+    arguments = [repr(path)] + [f"{k}={v!r}" for k, v in get_solve_kwargs(day, size, part).items()]
+    return Case(day, (part,), size, "", f"solve_part{part}({', '.join(arguments)})")
+
+
+def get_scaling_sizes(day: int, sizes: Optional[List[int]]) -> List[int]:
+    if sizes:
+        return sizes
+    default_size, min_size = get_generator(day).DEFAULT_SIZE, get_min_size(day)
+    return sorted({max(int(default_size * factor), min_size) for factor in DEFAULT_SCALING_FACTORS})
+
+
+def get_scaling_exponent(sizes: List[int], seconds: List[float]) -> Optional[float]:
+    """
+    Least-squares slope of log(time) against log(size): ~1 for linear, ~2 for quadratic.
+    Only timings above the noise floor take part in the fit
+    """
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, seconds) if t >= MIN_COMPARABLE_SECONDS]
+    if len({x for x, _ in points}) < 2:
+        return None
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    return covariance / variance
+
+
+def get_throughput(size: int, result: BenchResult) -> Optional[float]:
+    """
+    Input size handled per second, in the unit of the day's generator `size` (reports, bytes, ...)
+    """
+    if result.status != "OK" or result.wall_median <= 0:
+        return None
+    return size / result.wall_median
+
+
+def run_scaling(
+    days: List[int], parts: List[int], sizes: Optional[List[int]], seed: int, repeat: int, warmup: int
+) -> Dict[str, Dict]:
+    """
+    Benchmarks every part on generated inputs of growing sizes.
+    Generated inputs have no known answers, so these runs only measure time, they don't check correctness
+    """
+    curves = dict()
+    for day in days:
+        day_parts = {part for case in get_day_cases(day) for part in case.parts}
+        for part in sorted(day_parts.intersection(parts)):
+            day_sizes = get_scaling_sizes(day, sizes)
+            cases = [get_scaling_case(day, part, size, seed) for size in day_sizes]
+            results = run_benchmarks(cases, repeat, warmup)
+            ok_results = [result for result in results if result.status == "OK"]
+            curves[f"day{day:02}:part{part}"] = {
+                "day": day,
+                "part": part,
+                "seed": seed,
+                "sizes": day_sizes,
+                "results": [asdict(result) for result in results],
+                "throughputs": [get_throughput(size, result) for size, result in zip(day_sizes, results)],
+                "exponent": get_scaling_exponent(
+                    [case.index for case, result in zip(cases, results) if result.status == "OK"],
+                    [result.wall_median for result in ok_results],
+                ),
+            }
+    return curves
+
+
+def print_scaling_report(curves: Dict[str, Dict]) -> bool:
+    has_failures = False
+    for name, curve in curves.items():
+        exponent = curve["exponent"]
+        print(f"{name}  time ~ size^{exponent:.2f}" if exponent is not None else f"{name}  time ~ size^?")
+        print(f"    {'size':>10} {'median':>9} {'cpu':>9} {'size/s':>12} {'rss MB':>8}")
+        for size, result, throughput in zip(curve["sizes"], curve["results"], curve["throughputs"]):
+            if result["status"] != "OK":
+                has_failures = True
+                print(f"    {size:>10} [{result['status']}]")
+                if result["error"]:
+                    print(f"        ! {result['error'].rstrip().splitlines()[-1]}")
+                continue
+            print(
+                f"    {size:>10} {result['wall_median']:>9.4f} {result['cpu_median']:>9.4f} {throughput:>12,.0f} "
+                f"{result['peak_rss_bytes'] / 2**20:>8.1f}"
+            )
+    return not has_failures
+
+
+def save_scaling(scaling_path: str, curves: Dict[str, Dict], repeat: int, warmup: int):
+    with open(scaling_path, "w") as f:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "repeat": repeat,
+                "warmup": warmup,
+                "curves": curves,
+            },
+            f,
+            indent=2,
+            sort_keys=True,
+        )
+
+
+def load_baseline(baseline_path: str) -> Dict[str, Dict]:
+    if not os.path.exists(baseline_path):
+        return dict()
+    with open(baseline_path) as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(baseline_path: str, results: List[BenchResult], repeat: int, warmup: int):
+    baseline = load_baseline(baseline_path)
+    for result in results:
+        if result.status == "OK":
+            baseline[result.key] = asdict(result)
+    with open(baseline_path, "w") as f:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "repeat": repeat,
+                "warmup": warmup,
+                "results": baseline,
+            },
+            f,
+            indent=2,
+            sort_keys=True,
+        )
+
+
+def get_regression(result: BenchResult, baseline: Dict[str, Dict], threshold: float) -> Optional[float]:
+    previous = baseline.get(result.key)
+    if result.status != "OK" or previous is None:
+        return None
+    if max(result.wall_median, previous["wall_median"]) < MIN_COMPARABLE_SECONDS:
+        return None
+    ratio = result.wall_median / previous["wall_median"] - 1 if previous["wall_median"] else math.inf
+    return ratio if ratio > threshold else None
+
+
+def print_report(results: List[BenchResult], baseline: Dict[str, Dict], threshold: float) -> bool:
+    has_failures = False
+    print(f"{'case':<60} {'min':>9} {'median':>9} {'p95':>9} {'cpu':>9} {'rss MB':>8}")
+    for result in results:
+        name = f"day{result.day:02} {result.source}"[:60]
+        if result.status != "OK":
+            has_failures |= result.status == "FAILED"
+            print(f"{name:<60} [{result.status}]")
+            if result.error:
+                print(f"    ! {result.error.rstrip().splitlines()[-1]}")
+            continue
+
+        line = (
+            f"{name:<60} {result.wall_min:>9.4f} {result.wall_median:>9.4f} {result.wall_p95:>9.4f} "
+            f"{result.cpu_median:>9.4f} {result.peak_rss_bytes / 2**20:>8.1f}"
+        )
+        regression = get_regression(result, baseline, threshold)
+        if regression is not None:
+            has_failures = True
+            line += f"  [REGRESSION +{regression:.0%}]"
+        print(line)
+    return not has_failures
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark Advent of Code 2024 solutions")
+    parser.add_argument("--days", default="1-25", help="Days to benchmark, e.g. 6,14,20-23")
+    parser.add_argument("--parts", default="1,2", help="Parts to benchmark, e.g. 2")
+    parser.add_argument("--inputs", choices=("all", "example", "input"), default="input")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown of the median against the baseline (0.2 = 20%%)",
+    )
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results to the baseline")
+    parser.add_argument(
+        "--scaling", action="store_true", help="Time each part on generated inputs of growing sizes instead"
+    )
+    parser.add_argument("--sizes", default=None, help="Generated input sizes, e.g. 1000,10000 (default: per day)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated inputs")
+    parser.add_argument("--scaling-output", default=SCALING_PATH, help="Where to write the scaling curves")
+    args = parser.parse_args(argv)
+    try:
+        args.days = parse_selection(args.days, get_generator_days() if args.scaling else get_available_days())
+        args.parts = parse_selection(args.parts, list(PARTS))
+        args.sizes = [int(size) for size in args.sizes.split(",") if size.strip()] if args.sizes else None
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.scaling:
+        curves = run_scaling(args.days, args.parts, args.sizes, args.seed, args.repeat, args.warmup)
+        is_passing = print_scaling_report(curves)
+        save_scaling(args.scaling_output, curves, args.repeat, args.warmup)
+        return int(not is_passing)
+
+    cases = select_cases(args.days, args.parts, args.inputs)
+    results = run_benchmarks(cases, args.repeat, args.warmup)
+    baseline = load_baseline(args.baseline)
+    is_passing = print_report(results, baseline, args.threshold)
+    if args.update_baseline:
+        save_baseline(args.baseline, results, args.repeat, args.warmup)
+    return int(not is_passing)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+from collections import Counter, OrderedDict
+import functools
+import os
+import sys
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional, Tuple
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+# Caching is opt-in (benchmarks must never measure a cache hit)
+CACHE_ENV = "AOC_CACHE"
+CACHE_DIR_ENV = "AOC_CACHE_DIR"
+CACHE_MAX_BYTES_ENV = "AOC_CACHE_MAX_BYTES"
+
+DEFAULT_CACHE_DIR = dir_path + os.sep + ".cache"
+DEFAULT_CACHE_MAX_BYTES = 512 * 2**20
+DEFAULT_MEMORY_CACHE_MAX_BYTES = 256 * 2**20
+
+# Entries being written, see `store`
+TEMP_SUFFIX = ".tmp"
+
+MISS = object()
+
+_file_digests = dict()  # type: Dict[Tuple[str, int, int], str]
+
+# In-process layer in front of the disk, for long-lived processes (see `enable_memory_cache`).
+# Entries are (value, pickled size, is live). Values are kept pickled, so every caller gets its own copy to mutate
+# as with the disk, except read-only ones (see `cached_parse`), kept live so hits skip unpickling
+_memory = None  # type: Optional[OrderedDict[str, Tuple[Any, int, bool]]]
+_memory_max_bytes = DEFAULT_MEMORY_CACHE_MAX_BYTES
+_memory_bytes = 0
+
+stats = Counter()  # type: Counter[str]
+
+
+def is_cache_enabled() -> bool:
+    return os.environ.get(CACHE_ENV, "") not in ("", "0")
+
+
+def enable_memory_cache(max_bytes: int = DEFAULT_MEMORY_CACHE_MAX_BYTES):
+    global _memory, _memory_max_bytes, _memory_bytes
+    _memory, _memory_max_bytes, _memory_bytes = OrderedDict(), max_bytes, 0
+
+
+def is_memory_cache_enabled() -> bool:
+    return _memory is not None
+
+
+def get_cache_dir() -> str:
+    return os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)
+
+
+def get_cache_max_bytes() -> int:
+    return int(os.environ.get(CACHE_MAX_BYTES_ENV, DEFAULT_CACHE_MAX_BYTES))
+
+
+def get_file_digest(path: str) -> str:
+    import hashlib
+
+    stat = os.stat(path)
+    stat_key = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+    if stat_key not in _file_digests:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(2**20), b""):
+                digest.update(chunk)
+        _file_digests[stat_key] = digest.hexdigest()
+    return _file_digests[stat_key]
+
+
+def get_code_version(module: ModuleType) -> str:
+    """
+    Hash of the module's source, and of every module of this repo it uses (e.g. `common`),
+    so editing a solution or a shared helper invalidates what was cached with the old code
+    """
+    import hashlib
+
+    paths = {module.__file__}
+    for value in vars(module).values():
+        dependency = value if isinstance(value, ModuleType) else sys.modules.get(getattr(value, "__module__", None))
+        dependency_path = getattr(dependency, "__file__", None) or ""
+        if dependency_path.startswith(dir_path + os.sep):
+            paths.add(dependency_path)
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(get_file_digest(path).encode())
+    return digest.hexdigest()
+
+
+def get_key(*parts) -> str:
+    import hashlib
+
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def get_entry_path(key: str) -> str:
+    return get_cache_dir() + os.sep + key[:2] + os.sep + key + ".pickle"
+
+
+def load(key: str):
+    import pickle
+
+    path = get_entry_path(key)
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return MISS
+    # The mtime doubles as the last-use time for LRU eviction
+    os.utime(path)
+    return value
+
+
+def store(key: str, value):
+    import pickle
+
+    try:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return
+    path = get_entry_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write-then-rename, so parallel workers never read half an entry
+    temp_path = f"{path}.{os.getpid()}{TEMP_SUFFIX}"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    evict(get_cache_max_bytes())
+
+
+def evict(max_bytes: int):
+    entries = []
+    for root, _, files in os.walk(get_cache_dir()):
+        for name in files:
+            if name.endswith(TEMP_SUFFIX):
+                # Still being written by a worker, which renames it in place once done
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+
+def load_from_memory(key: str):
+    if _memory is None or key not in _memory:
+        return MISS
+    _memory.move_to_end(key)
+    value, _, is_live = _memory[key]
+    if is_live:
+        return value
+    import pickle
+
+    return pickle.loads(value)
+
+
+def store_in_memory(key: str, value, live: bool = False):
+    """
+    With `live`, the value itself is kept rather than a pickled copy. It is still pickled once, to size it
+    """
+    global _memory_bytes
+    if _memory is None:
+        return
+    import pickle
+
+    try:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return
+    if key in _memory:
+        _memory_bytes -= _memory.pop(key)[1]
+    _memory[key] = (value if live else data, len(data), live)
+    _memory_bytes += len(data)
+    while _memory_bytes > _memory_max_bytes and _memory:
+        _memory_bytes -= _memory.popitem(last=False)[1][1]
+
+
+def cached_parse(func: Optional[Callable] = None, read_only: bool = False) -> Callable:
+    """
+    Caches the parsed structure returned by `func(input_path, ...)` on disk (and in memory when enabled),
+    keyed by the input's content and the code version of the module defining `func`.
+    `@cached_parse(read_only=True)` is for structures no caller mutates: memory hits return the same object
+    instead of an unpickled copy
+    """
+    if func is None:
+        return functools.partial(cached_parse, read_only=read_only)
+
+    @functools.wraps(func)
+    def wrapper(input_path: str, *args, **kwargs):
+        if not is_cache_enabled() and not is_memory_cache_enabled():
+            return func(input_path, *args, **kwargs)
+
+        module = sys.modules[func.__module__]
+        key = get_key(
+            "parse",
+            func.__module__,
+            func.__qualname__,
+            get_file_digest(input_path),
+            get_code_version(module),
+            args,
+            sorted(kwargs.items()),
+        )
+        value = load_from_memory(key)
+        if value is not MISS:
+            stats["parse_memory_hits"] += 1
+            return value
+
+        value = load(key) if is_cache_enabled() else MISS
+        if value is MISS:
+            stats["parse_misses"] += 1
+            value = func(input_path, *args, **kwargs)
+            if is_cache_enabled():
+                store(key, value)
+        else:
+            stats["parse_disk_hits"] += 1
+        store_in_memory(key, value, read_only)
+        return value
+
+    return wrapper
@@ -1,17 +1,158 @@
-from typing import List, Optional, Tuple
-from PIL import Image, ImageDraw, ImageFont
+from contextlib import contextmanager
+import mmap
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, TextIO, Tuple, Union
+
+# Every day imports this module: anything imported at the top (json, tracemalloc, dataclasses, ...)
+# counts against each day's import budget, so those are imported where they're used instead
 
 DIRECTIONS_RDLU = ((0, 1), (1, 0), (0, -1), (-1, 0))
 DIRECTIONS_WITH_DIAG = ((0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1))
 
+# Path of a JSON lines file every solution result is appended to ("-" for stdout)
+RESULTS_SINK_ENV = "AOC_RESULTS_SINK"
 
-def handle_solution(solution: any, expected_output: Optional[int] = None):
-    if expected_output:
-        assert expected_output == solution, f"Expected solution is {expected_output}. Got {solution}"
-        print("[OK]")
+STATUS_PASS = "pass"
+STATUS_FAIL = "fail"
+STATUS_UNCHECKED = "unchecked"
+
+# Implementations of the days that have several, picked through their solve_partN `engine` argument
+ENGINE_AUTO = "auto"
+ENGINE_NUMPY = "numpy"
+ENGINE_PYTHON = "python"
+ENGINES = (ENGINE_AUTO, ENGINE_NUMPY, ENGINE_PYTHON)
+
+
+class SolutionResult(NamedTuple):
+    day: Optional[int]
+    part: Optional[int]
+    input_path: Optional[str]
+    solution: any
+    expected: any
+    status: str
+    elapsed_ns: Optional[int]
+    peak_memory_bytes: Optional[int]
+
+
+class SolutionContext:
+    __slots__ = ("day", "parts", "input_path", "trace_memory", "start_ns", "results")
+
+    def __init__(self, day: int, parts: Tuple[int, ...], input_path: Optional[str], trace_memory: bool):
+        self.day = day
+        self.parts = parts
+        self.input_path = input_path
+        self.trace_memory = trace_memory
+        self.start_ns = 0
+        self.results = []  # type: List[SolutionResult]
+
+    @property
+    def has_failed(self) -> bool:
+        return any(result.status == STATUS_FAIL for result in self.results)
+
+
+_contexts = []  # type: List[SolutionContext]
+_result_sink = None  # type: Optional[TextIO]
+
+
+def set_result_sink(sink: Union[str, TextIO, None]):
+    global _result_sink
+    if isinstance(sink, str):
+        sink = open(sink, "a")
+    _result_sink = sink
+
+
+def get_result_sink() -> Optional[TextIO]:
+    if _result_sink is None and os.environ.get(RESULTS_SINK_ENV):
+        path = os.environ[RESULTS_SINK_ENV]
+        set_result_sink(sys.stdout if path == "-" else path)
+    return _result_sink
+
+
+def get_result_record(result: SolutionResult) -> Dict:
+    """
+    The result as a JSON-serializable dict (answers that aren't ints or strings are kept as their repr)
+    """
+    record = result._asdict()
+    for key in ("solution", "expected"):
+        if not isinstance(record[key], (int, str, type(None))):
+            record[key] = repr(record[key])
+    return record
+
+
+def emit_result(result: SolutionResult):
+    sink = get_result_sink()
+    if sink is None:
         return
+    import json
+
+    record = get_result_record(result)
+    # A single write per line, so records from parallel workers appending to the same file don't interleave
+    sink.write(json.dumps(record) + "\n")
+    sink.flush()
+
+
+@contextmanager
+def solution_context(
+    day: int, parts: Tuple[int, ...], input_path: Optional[str] = None, trace_memory: bool = True
+) -> Iterator[SolutionContext]:
+    """
+    Every `handle_solution` call made inside the context is reported with the day, part and input,
+    the time elapsed since entering the context, and (optionally) the tracemalloc peak.
+    A wrong answer is reported as failed instead of raising, so a batch can go on
+    """
+    import tracemalloc
+
+    context = SolutionContext(day, parts, input_path, trace_memory)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if trace_memory:
+        tracemalloc.reset_peak()
+    _contexts.append(context)
+    context.start_ns = time.perf_counter_ns()
+    try:
+        yield context
+    finally:
+        _contexts.pop()
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def handle_solution(solution: any, expected_output: Optional[int] = None):
+    context = _contexts[-1] if _contexts else None
+    if expected_output is None:
+        status = STATUS_UNCHECKED
+    else:
+        status = STATUS_PASS if expected_output == solution else STATUS_FAIL
 
-    print(solution)
+    if context is not None:
+        # Days solving both parts in one call report them in order
+        part = context.parts[min(len(context.results), len(context.parts) - 1)]
+        elapsed_ns = time.perf_counter_ns() - context.start_ns
+        if context.trace_memory:
+            import tracemalloc
+
+            peak = tracemalloc.get_traced_memory()[1]
+        else:
+            peak = None
+        result = SolutionResult(
+            context.day, part, context.input_path, solution, expected_output, status, elapsed_ns, peak
+        )
+        context.results.append(result)
+    else:
+        result = SolutionResult(None, None, None, solution, expected_output, status, None, None)
+    emit_result(result)
+
+    if status == STATUS_PASS:
+        print("[OK]")
+    elif status == STATUS_FAIL:
+        message = f"Expected solution is {expected_output}. Got {solution}"
+        assert context is not None, message
+        print(f"[FAIL] {message}")
+    else:
+        print(solution)
     return solution
 
 
@@ -26,12 +167,195 @@ def read_input_as_string(input_path: str) -> str:
         return f.read()
 
 
+def read_input_as_bytes(input_path: str) -> bytes:
+    with open(input_path, "rb") as f:
+        return f.read()
+
+
 def read_input_as_lines(input_path: str) -> List[str]:
     with open(input_path) as f:
         lines = f.readlines()
         return [line.removesuffix("\n") for line in lines]
 
 
+@contextmanager
+def open_input_as_mmap(input_path: str) -> Iterator[Union[mmap.mmap, bytes]]:
+    """
+    Maps the input read-only, so it can be scanned (`find`, `re.finditer`, slicing)
+    without being read into memory first. The map is only valid inside the context
+    """
+    with open(input_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files can't be mapped
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+@contextmanager
+def open_input_as_view(input_path: str) -> Iterator[memoryview]:
+    """
+    Zero-copy view of the input's bytes. Slices of it must not outlive the context
+    """
+    with open_input_as_mmap(input_path) as mapped:
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            view.release()
+
+
+def iter_input_lines(input_path: str) -> Iterator[str]:
+    """
+    Same lines as `read_input_as_lines`, one at a time, in constant memory.
+    The mapping is read as bytes, so CRLF line endings are stripped here rather than by text mode
+    """
+    with open_input_as_mmap(input_path) as mapped:
+        if not mapped:
+            return
+        for line in iter(mapped.readline, b""):
+            yield line.rstrip(b"\r\n").decode()
+
+
+def is_numpy_available() -> bool:
+    """
+    Whether the vectorised engines can run. Doesn't import numpy, so days falling back to pure Python don't pay for it
+    """
+    from importlib.util import find_spec
+
+    return find_spec("numpy") is not None
+
+
+def get_engine(engine: str, engines: Tuple[str, ...] = ENGINES) -> str:
+    """
+    Validates a solve_partN `engine` argument, resolving "auto" to numpy when it is installed, else pure Python
+    """
+    if engine not in engines:
+        raise ValueError(f"Unknown engine {engine!r}, expected one of {engines}")
+    if engine == ENGINE_AUTO:
+        return ENGINE_NUMPY if is_numpy_available() else ENGINE_PYTHON
+    return engine
+
+
+# Packed coordinates: (row, col) as the single int `row * stride + col`. Moving is adding an offset,
+# and visited sets hold plain ints, or become one byte per cell (`bytearray(rows * stride)`).
+# Offsets wrap around the row ends, so either the stride leaves room for a border (see Grid), or columns are checked
+def pack_position(row: int, col: int, stride: int) -> int:
+    return row * stride + col
+
+
+def unpack_position(position: int, stride: int) -> Tuple[int, int]:
+    return divmod(position, stride)
+
+
+def get_offsets(stride: int, directions: Tuple[Tuple[int, int], ...] = DIRECTIONS_RDLU) -> Tuple[int, ...]:
+    return tuple(pack_position(dr, dc, stride) for dr, dc in directions)
+
+
+class Grid:
+    """
+    A rectangular board stored as a single bytearray, one byte per cell, row after row.
+    With a `border`, the board is padded by one cell of that character on every side,
+    so stepping off the board lands on the border instead of needing a bounds check.
+    Cells are addressed by a flat index (`row * stride + col`, shifted by the border)
+    """
+
+    __slots__ = ("rows", "cols", "stride", "pad", "cells", "offsets")
+
+    def __init__(self, lines: List[str], border: Optional[str] = None):
+        self.rows = len(lines)
+        self.cols = len(lines[0]) if lines else 0
+        self.pad = 0 if border is None else 1
+        self.stride = self.cols + 2 * self.pad
+        if border is None:
+            self.cells = bytearray("".join(lines).encode())
+        else:
+            edge = (border * self.stride).encode()
+            self.cells = bytearray(edge + "".join(border + line + border for line in lines).encode() + edge)
+        assert len(self.cells) == self.stride * (self.rows + 2 * self.pad), "Grid rows must have the same length"
+        # Flat index offsets, in the order of DIRECTIONS_RDLU
+        self.offsets = get_offsets(self.stride)
+
+    @classmethod
+    def from_file(cls, input_path: str, border: Optional[str] = None) -> "Grid":
+        return cls(read_input_as_lines(input_path), border)
+
+    def copy(self) -> "Grid":
+        grid = Grid.__new__(Grid)
+        grid.rows, grid.cols, grid.stride, grid.pad = self.rows, self.cols, self.stride, self.pad
+        grid.cells = self.cells.copy()
+        grid.offsets = self.offsets
+        return grid
+
+    def index(self, row: int, col: int) -> int:
+        return (row + self.pad) * self.stride + col + self.pad
+
+    def position(self, index: int) -> Tuple[int, int]:
+        row, col = divmod(index, self.stride)
+        return row - self.pad, col - self.pad
+
+    def is_inside(self, index: int) -> bool:
+        row, col = self.position(index)
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def get(self, row: int, col: int) -> str:
+        return chr(self.cells[self.index(row, col)])
+
+    def set(self, row: int, col: int, char: str):
+        self.cells[self.index(row, col)] = ord(char)
+
+    def __getitem__(self, index: int) -> str:
+        return chr(self.cells[index])
+
+    def __setitem__(self, index: int, char: str):
+        self.cells[index] = ord(char)
+
+    def __len__(self) -> int:
+        return self.rows * self.cols
+
+    def neighbours(self, index: int) -> Iterator[int]:
+        """
+        Flat indexes of the RDLU neighbours. Without a border, neighbours off the board are skipped
+        """
+        if self.pad:
+            for offset in self.offsets:
+                yield index + offset
+            return
+        row, col = divmod(index, self.stride)
+        if col + 1 < self.cols:
+            yield index + 1
+        if row + 1 < self.rows:
+            yield index + self.stride
+        if col > 0:
+            yield index - 1
+        if row > 0:
+            yield index - self.stride
+
+    def find(self, char: str, start: int = 0) -> int:
+        return self.cells.find(ord(char), start)
+
+    def find_all(self, char: str) -> Iterator[int]:
+        index = self.cells.find(ord(char))
+        while index != -1:
+            yield index
+            index = self.cells.find(ord(char), index + 1)
+
+    def row(self, row: int) -> memoryview:
+        start = self.index(row, 0)
+        return memoryview(self.cells)[start : start + self.cols]
+
+    def to_lines(self) -> List[str]:
+        return [self.row(row).tobytes().decode() for row in range(self.rows)]
+
+    def __str__(self) -> str:
+        return "\n".join(self.to_lines())
+
+
+def read_input_as_grid(input_path: str, border: Optional[str] = None) -> Grid:
+    return Grid.from_file(input_path, border)
+
+
 def is_in_board(rows, cols, row, col):
     return 0 <= row < rows and 0 <= col < cols
 
@@ -57,6 +381,8 @@ def string_to_image(
     bg_color="white",
     text_color="black",
 ):
+    # PIL is only needed for day14's visualisation, keep it off the import path of every other day
+    from PIL import Image, ImageDraw, ImageFont
 
     img = Image.new("RGB", image_size, color=bg_color)
     draw = ImageDraw.Draw(img)
@@ -0,0 +1,13 @@
+import random
+from typing import Iterator
+
+# `size` is the number of location pairs
+DEFAULT_SIZE = 1000
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    # Drawing the right column from a smaller pool makes repeats (and part 2's histogram) matter
+    pool = [rng.randint(10000, 99999) for _ in range(max(size // 4, 1))]
+    for _ in range(size):
+        yield f"{rng.randint(10000, 99999)}   {rng.choice(pool)}"
@@ -1,34 +1,63 @@
+from array import array
 from collections import defaultdict
+from heapq import merge
 import os
 import re
-from typing import DefaultDict, List, Optional, Tuple
+from typing import TYPE_CHECKING, DefaultDict, Iterable, Iterator, List, Optional, Tuple
 
-from common import handle_solution
+from cache import cached_parse
+from common import (
+    ENGINE_AUTO,
+    ENGINE_NUMPY,
+    ENGINE_PYTHON,
+    get_engine,
+    handle_solution,
+    iter_input_lines,
+    read_input_as_bytes,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
 EXAMPLE_PATH = dir_path + os.sep + "example.txt"
 INPUT_PATH = dir_path + os.sep + "input.txt"
 
+# Out-of-core: sorted runs on disk, merged as streams, for inputs that don't fit in memory. Never picked by "auto"
+ENGINE_EXTERNAL = "external"
+ENGINES = (ENGINE_AUTO, ENGINE_NUMPY, ENGINE_PYTHON, ENGINE_EXTERNAL)
+
+# Values per column sorted in memory before being written out as a run (8 bytes each)
+DEFAULT_RUN_SIZE = 1 << 20
+# Values read at once from each run while merging
+MERGE_BLOCK_SIZE = 1 << 13
+# Runs merged at once: more are first merged into longer runs, keeping open files and merge buffers bounded
+MAX_MERGE_FAN_IN = 64
+
+LINE_PATTERN = re.compile(r"^(\d+)\s{3}(\d+)$")
+
+
+def parse_line(line: str) -> Tuple[int, int]:
+    match = LINE_PATTERN.match(line)
+    if not match:
+        raise AssertionError("Input is not in the expected format")
+    return int(match.group(1)), int(match.group(2))
+
 
-def parse_input(input: List[str]) -> Tuple[List[int], List[int]]:
-    line_pattern = r"^(\d+)\s{3}(\d+)$"
+def parse_input(input: Iterable[str]) -> Tuple[List[int], List[int]]:
     arr1 = []
     arr2 = []
     for line in input:
-        match = re.match(line_pattern, line)
-        if not match:
-            raise AssertionError("Input is not in the expected format")
-        arr1.append(int(match.group(1)))
-        arr2.append(int(match.group(2)))
+        element1, element2 = parse_line(line)
+        arr1.append(element1)
+        arr2.append(element2)
     return arr1, arr2
 
 
+@cached_parse(read_only=True)
 def get_sorted_arrays(input_path: str) -> Tuple[List[int], List[int]]:
-    arr1, arr2 = [], []
-    with open(input_path) as f:
-        lines = f.readlines()
-        arr1, arr2 = parse_input(lines)
+    arr1, arr2 = parse_input(iter_input_lines(input_path))
 
     arr1 = sorted(arr1)
     arr2 = sorted(arr2)
@@ -44,30 +73,221 @@ def get_histogram_from_array(array: List[int]) -> DefaultDict:
     return hist
 
 
-def solve_part1(input_path: str, expected_output: Optional[int] = None):
+@cached_parse(read_only=True)
+def get_sorted_numpy_arrays(input_path: str) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Both columns as sorted int64 arrays, parsed in one pass over the file's bytes
+    """
+    import numpy as np
+
+    # Whitespace separated: newlines count as separators too, so the columns come out interleaved
+    values = np.fromstring(read_input_as_bytes(input_path), dtype=np.int64, sep=" ")
+    if values.size % 2:
+        raise AssertionError("Input is not in the expected format")
+    columns = values.reshape(-1, 2)
+
+    return np.sort(columns[:, 0]), np.sort(columns[:, 1])
+
+
+def write_run(chunk: array, run_dir: str, name: str) -> str:
+    path = run_dir + os.sep + name
+    with open(path, "wb") as f:
+        array("q", sorted(chunk)).tofile(f)
+    return path
+
+
+def write_sorted_runs(input_path: str, run_dir: str, run_size: int) -> Tuple[List[str], List[str]]:
+    """
+    Splits both columns into runs of at most `run_size` values, each sorted and written to `run_dir` as packed int64.
+    Only one chunk per column is in memory at a time, the runs are then reduced to few enough to merge at once
+    """
+    runs1, runs2 = [], []
+    chunk1, chunk2 = array("q"), array("q")
+    for line in iter_input_lines(input_path):
+        element1, element2 = parse_line(line)
+        chunk1.append(element1)
+        chunk2.append(element2)
+        if len(chunk1) == run_size:
+            runs1.append(write_run(chunk1, run_dir, f"left-{len(runs1)}"))
+            runs2.append(write_run(chunk2, run_dir, f"right-{len(runs2)}"))
+            chunk1, chunk2 = array("q"), array("q")
+    if chunk1:
+        runs1.append(write_run(chunk1, run_dir, f"left-{len(runs1)}"))
+        runs2.append(write_run(chunk2, run_dir, f"right-{len(runs2)}"))
+    return reduce_runs(runs1, run_dir, "left"), reduce_runs(runs2, run_dir, "right")
+
+
+def iter_run(path: str) -> Iterator[int]:
+    with open(path, "rb") as f:
+        while True:
+            block = array("q")
+            try:
+                block.fromfile(f, MERGE_BLOCK_SIZE)
+            except EOFError:
+                # Last, partial block: `fromfile` still appended what was left
+                yield from block
+                return
+            yield from block
+
+
+def reduce_runs(runs: List[str], run_dir: str, name: str) -> List[str]:
+    """
+    Merges groups of runs into longer ones until at most `MAX_MERGE_FAN_IN` are left
+    """
+    level = 0
+    while len(runs) > MAX_MERGE_FAN_IN:
+        merged_runs = []
+        for start in range(0, len(runs), MAX_MERGE_FAN_IN):
+            group = runs[start : start + MAX_MERGE_FAN_IN]
+            path = run_dir + os.sep + f"{name}-{level}-{len(merged_runs)}"
+            with open(path, "wb") as f:
+                block = array("q")
+                for value in merge(*(iter_run(run) for run in group)):
+                    block.append(value)
+                    if len(block) == MERGE_BLOCK_SIZE:
+                        block.tofile(f)
+                        block = array("q")
+                block.tofile(f)
+            for run in group:
+                os.remove(run)
+            merged_runs.append(path)
+        runs = merged_runs
+        level += 1
+    return runs
+
+
+def iter_sorted_column(runs: List[str]) -> Iterator[int]:
+    """
+    k-way merge of the sorted runs (see `reduce_runs`), holding one block per run in memory
+    """
+    return merge(*(iter_run(path) for path in runs))
+
+
+def iter_counts(values: Iterator[int]) -> Iterator[Tuple[int, int]]:
+    """
+    (value, number of repeats) of a sorted stream
+    """
+    current, count = None, 0
+    for value in values:
+        if value == current:
+            count += 1
+            continue
+        if count:
+            yield current, count
+        current, count = value, 1
+    if count:
+        yield current, count
+
+
+def get_total_distance_external(input_path: str, run_size: int = DEFAULT_RUN_SIZE) -> int:
+    import tempfile
+
+    with tempfile.TemporaryDirectory(prefix="day01-") as run_dir:
+        runs1, runs2 = write_sorted_runs(input_path, run_dir, run_size)
+        # Both columns have as many values, merging them in lockstep pairs them up like the sorted lists would
+        return sum(
+            abs(element1 - element2) for element1, element2 in zip(iter_sorted_column(runs1), iter_sorted_column(runs2))
+        )
+
+
+def get_similarity_score_external(input_path: str, run_size: int = DEFAULT_RUN_SIZE) -> int:
+    import tempfile
+
+    sol = 0
+    with tempfile.TemporaryDirectory(prefix="day01-") as run_dir:
+        runs1, runs2 = write_sorted_runs(input_path, run_dir, run_size)
+        # Merge-join of the two sorted streams: the right column's histogram is never held in memory
+        counts2 = iter_counts(iter_sorted_column(runs2))
+        value2, count2 = next(counts2, (None, 0))
+        for value1, count1 in iter_counts(iter_sorted_column(runs1)):
+            while value2 is not None and value2 < value1:
+                value2, count2 = next(counts2, (None, 0))
+            if value2 is None:
+                break
+            if value2 == value1:
+                sol += value1 * count1 * count2
+    return sol
+
+
+def get_total_distance(input_path: str) -> int:
     sol = 0
     arr1, arr2 = get_sorted_arrays(input_path)
 
     for element1, element2 in zip(arr1, arr2):
         sol += abs(element1 - element2)
 
-    handle_solution(sol, expected_output)
+    return sol
+
+
+def get_total_distance_numpy(input_path: str) -> int:
+    import numpy as np
+
+    arr1, arr2 = get_sorted_numpy_arrays(input_path)
+    return int(np.abs(arr1 - arr2).sum())
 
 
-def solve_part2(input_path: str, expected_output: Optional[int] = None):
+def get_similarity_score(input_path: str) -> int:
     sol = 0
     arr1, arr2 = get_sorted_arrays(input_path)
     hist = get_histogram_from_array(arr2)
     for element in arr1:
         sol += hist[element] * element
 
+    return sol
+
+
+def get_similarity_score_numpy(input_path: str) -> int:
+    import numpy as np
+
+    arr1, arr2 = get_sorted_numpy_arrays(input_path)
+    values, counts = np.unique(arr2, return_counts=True)
+    if not values.size:
+        return 0
+    # Index of each left value among the distinct right ones, kept in bounds for the values past the last one
+    indexes = np.minimum(np.searchsorted(values, arr1), values.size - 1)
+    found = values[indexes] == arr1
+    return int((arr1[found] * counts[indexes[found]]).sum())
+
+
+def solve_part1(
+    input_path: str, expected_output: Optional[int] = None, engine: str = ENGINE_AUTO, run_size: int = DEFAULT_RUN_SIZE
+):
+    engine = get_engine(engine, ENGINES)
+    if engine == ENGINE_NUMPY:
+        sol = get_total_distance_numpy(input_path)
+    elif engine == ENGINE_EXTERNAL:
+        sol = get_total_distance_external(input_path, run_size)
+    else:
+        sol = get_total_distance(input_path)
+
+    handle_solution(sol, expected_output)
+
+
+def solve_part2(
+    input_path: str, expected_output: Optional[int] = None, engine: str = ENGINE_AUTO, run_size: int = DEFAULT_RUN_SIZE
+):
+    engine = get_engine(engine, ENGINES)
+    if engine == ENGINE_NUMPY:
+        sol = get_similarity_score_numpy(input_path)
+    elif engine == ENGINE_EXTERNAL:
+        sol = get_similarity_score_external(input_path, run_size)
+    else:
+        sol = get_similarity_score(input_path)
+
     handle_solution(sol, expected_output)
 
 
 def day01():
     solve_part1(EXAMPLE_PATH, 11)
+    solve_part1(EXAMPLE_PATH, 11, engine=ENGINE_NUMPY)
+    solve_part1(EXAMPLE_PATH, 11, engine=ENGINE_PYTHON)
+    # Runs of 2 values, so the merge has several runs per column
+    solve_part1(EXAMPLE_PATH, 11, engine=ENGINE_EXTERNAL, run_size=2)
     solve_part1(INPUT_PATH, 1970720)
     solve_part2(EXAMPLE_PATH, 31)
+    solve_part2(EXAMPLE_PATH, 31, engine=ENGINE_NUMPY)
+    solve_part2(EXAMPLE_PATH, 31, engine=ENGINE_PYTHON)
+    solve_part2(EXAMPLE_PATH, 31, engine=ENGINE_EXTERNAL, run_size=2)
     solve_part2(INPUT_PATH, 17191599)
 
 
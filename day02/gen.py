@@ -0,0 +1,18 @@
+import random
+from typing import Iterator
+
+# `size` is the number of reports
+DEFAULT_SIZE = 1000
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    for _ in range(size):
+        direction = rng.choice((-1, 1))
+        levels = [rng.randint(20, 80)]
+        for _ in range(rng.randint(4, 7)):
+            levels.append(levels[-1] + direction * rng.randint(1, 3))
+        # Roughly half the reports get one or two bad levels
+        for _ in range(rng.choice((0, 0, 1, 2))):
+            levels[rng.randrange(len(levels))] += rng.randint(-5, 5)
+        yield " ".join(str(level) for level in levels)
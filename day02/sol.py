@@ -1,98 +1,221 @@
-from collections import defaultdict
-import math
+from itertools import chain
 import os
-import re
-from typing import DefaultDict, List, Optional, Tuple
-
-from common import handle_solution
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+from cache import cached_parse
+from common import (
+    ENGINE_AUTO,
+    ENGINE_NUMPY,
+    ENGINE_PYTHON,
+    get_engine,
+    handle_solution,
+    iter_input_lines,
+    read_input_as_bytes,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
 EXAMPLE_PATH = dir_path + os.sep + "example.txt"
 INPUT_PATH = dir_path + os.sep + "input.txt"
 
+DIRECTIONS = (1, -1)
 
-def get_parsed_input(input_path: str):
-    with open(input_path) as f:
-        lines = f.readlines()
+# Reports padded into a 2-D array. "numpy" keeps them ragged instead (one flat array of levels, and offsets)
+ENGINE_PADDED = "padded"
+ENGINES = (ENGINE_AUTO, ENGINE_NUMPY, ENGINE_PYTHON, ENGINE_PADDED)
 
-        parsed_input = parse_input(lines)
-    return parsed_input
+
+@cached_parse(read_only=True)
+def get_parsed_input(input_path: str):
+    return parse_input(iter_input_lines(input_path))
 
 
 def parse_line(line):
     return [int(n) for n in line.split()]
 
 
-def parse_input(input: List[str]) -> List[List[int]]:
+def parse_input(input: Iterable[str]) -> List[List[int]]:
     return [parse_line(line) for line in input]
 
 
-def get_increasing_sign(n1, n2) -> int:
-    return math.copysign(1, n2 - n1)
+def is_safe_step(diff: int, direction: int) -> bool:
+    return 1 <= diff * direction <= 3
 
 
-def get_arr_increasing_sign(arr) -> int:
+def is_safe_in_direction(levels: List[int], direction: int, can_remove: bool) -> bool:
     """
-    If at least 2/3 are increasing (or decreasing),
-    the whole sequence should be as well (with the exception of maybe 1)
+    One pass over the steps, recording the first and last unsafe ones (step `i` goes from level `i - 1` to `i`).
+    Removing level `k` drops steps `k` and `k + 1`, so it can only help if every unsafe step is one of those:
+    `k` is the first unsafe step or the level before it, and the step bridging the gap must be safe
     """
-    if len(arr) < 4:
-        return get_increasing_sign(arr[0], arr[1])
-    return get_increasing_sign(
-        0,
-        get_increasing_sign(arr[0], arr[1]) + get_increasing_sign(arr[1], arr[2]) + get_increasing_sign(arr[2], arr[3]),
+    first_unsafe = last_unsafe = None
+    for i in range(1, len(levels)):
+        if not is_safe_step(levels[i] - levels[i - 1], direction):
+            if not can_remove:
+                return False
+            if first_unsafe is None:
+                first_unsafe = i
+            last_unsafe = i
+    if first_unsafe is None:
+        return True
+
+    for k in (first_unsafe - 1, first_unsafe):
+        if k < last_unsafe - 1:
+            continue
+        if 0 < k < len(levels) - 1 and not is_safe_step(levels[k + 1] - levels[k - 1], direction):
+            continue
+        return True
+    return False
+
+
+def is_safe(levels: List[int], can_remove: bool = False) -> bool:
+    return any(is_safe_in_direction(levels, direction, can_remove) for direction in DIRECTIONS)
+
+
+def get_padded_reports(reports: List[List[int]]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Reports as the rows of a 2-D array, padded with zeros to the longest, and the length of each
+    """
+    import numpy as np
+
+    lengths = np.fromiter(map(len, reports), dtype=np.int64, count=len(reports))
+    padded = np.zeros((len(reports), int(lengths.max(initial=0))), dtype=np.int64)
+    # The mask is True over each row's levels, and row-major assignment fills them in order
+    padded[np.arange(padded.shape[1]) < lengths[:, None]] = np.fromiter(
+        chain.from_iterable(reports), dtype=np.int64, count=int(lengths.sum())
     )
+    return padded, lengths
 
 
-def get_first_problematic_index(arr, is_increasing) -> Optional[int]:
-    for i in range(1, len(arr)):
-        diff = arr[i] - arr[i - 1]
-        if 1 <= abs(diff) <= 3 and (is_increasing * diff > 0):
+def get_safe_mask(padded: "np.ndarray", lengths: "np.ndarray", can_remove: bool) -> "np.ndarray":
+    """
+    `is_safe` of every report at once: the same first/last unsafe step reasoning, over the rows of the padded array
+    """
+    import numpy as np
+
+    rows = np.arange(padded.shape[0])
+    diffs = np.diff(padded, axis=1)
+    # Steps past the end of a report (into the padding) are never unsafe
+    is_step = np.arange(diffs.shape[1]) < (lengths - 1)[:, None]
+
+    safe = np.zeros(padded.shape[0], dtype=bool)
+    for direction in DIRECTIONS:
+        signed = diffs * direction
+        unsafe = is_step & ((signed < 1) | (signed > 3))
+        has_unsafe = unsafe.any(axis=1)
+        safe |= ~has_unsafe
+        if not can_remove or not unsafe.shape[1]:
             continue
-        return i
-    return None
-
-
-def is_error_forgivable(arr, is_increasing, error_index) -> bool:
-    levels_without_i = arr.copy()
-    levels_without_i.pop(error_index)
-    levels_without_i_minus_1 = arr.copy()
-    levels_without_i_minus_1.pop(error_index - 1)
-    return (
-        get_first_problematic_index(levels_without_i, is_increasing) is None
-        or get_first_problematic_index(levels_without_i_minus_1, is_increasing) is None
-    )
 
+        # Step indexes count from 1, as in is_safe_in_direction
+        first_unsafe = unsafe.argmax(axis=1) + 1
+        last_unsafe = unsafe.shape[1] - unsafe[:, ::-1].argmax(axis=1)
+        for k in (first_unsafe - 1, first_unsafe):
+            before = padded[rows, np.clip(k - 1, 0, padded.shape[1] - 1)]
+            after = padded[rows, np.clip(k + 1, 0, padded.shape[1] - 1)]
+            bridge = (after - before) * direction
+            is_inner = (k > 0) & (k < lengths - 1)
+            safe |= has_unsafe & (k >= last_unsafe - 1) & (~is_inner | ((bridge >= 1) & (bridge <= 3)))
+    return safe
 
-def solve_part1(input_path: str, expected_output: Optional[int] = None):
-    sol = 0
-    parsed_input = get_parsed_input(input_path)
-    for levels in parsed_input:
-        is_increasing = get_arr_increasing_sign(levels)
-        first_problematic_index = get_first_problematic_index(levels, is_increasing)
-        sol += int(first_problematic_index is None)
 
-    handle_solution(sol, expected_output)
+@cached_parse(read_only=True)
+def get_ragged_reports(input_path: str) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Levels of every report in one flat int32 array, report `r` being `values[offsets[r]:offsets[r + 1]]`,
+    read straight from the file's bytes
+    """
+    import numpy as np
+
+    text = read_input_as_bytes(input_path)
+    data = np.frombuffer(text, dtype=np.uint8)
+    is_digit = (data >= ord("0")) & (data <= ord("9"))
+    number_starts = is_digit.copy()
+    number_starts[1:] &= ~is_digit[:-1]
+    newlines = np.flatnonzero(data == ord("\n"))
+    num_reports = newlines.size + int(data.size > 0 and data[-1] != ord("\n"))
+    # Line of each number: how many newlines come before it
+    report_ids = np.searchsorted(newlines, np.flatnonzero(number_starts))
+    values = np.fromstring(text, dtype=np.int32, sep=" ")
+
+    offsets = np.zeros(num_reports + 1, dtype=np.int64)
+    np.cumsum(np.bincount(report_ids, minlength=num_reports), out=offsets[1:])
+    return values, offsets
 
 
-def solve_part2(input_path: str, expected_output: Optional[int] = None):
-    sol = 0
-    parsed_input = get_parsed_input(input_path)
-    for levels in parsed_input:
-        is_increasing = get_arr_increasing_sign(levels)
-        first_problematic_index = get_first_problematic_index(levels, is_increasing)
-        if first_problematic_index is None:
-            sol += 1
+def get_ragged_safe_mask(values: "np.ndarray", offsets: "np.ndarray", can_remove: bool) -> "np.ndarray":
+    """
+    `get_safe_mask` over the ragged reports: diffs of the flat array, masked where they straddle two reports.
+    Step `j` goes from level `j` to `j + 1` (flat indexes), and report `r` has the levels `offsets[r]` to `ends[r]`
+    """
+    import numpy as np
+
+    num_reports = offsets.size - 1
+    starts, ends = offsets[:-1], offsets[1:] - 1
+    diffs = np.diff(values.astype(np.int64))
+    is_step = np.ones(diffs.size, dtype=bool)
+    boundaries = offsets[1:-1]
+    is_step[boundaries[(boundaries > 0) & (boundaries < values.size)] - 1] = False
+
+    safe = np.zeros(num_reports, dtype=bool)
+    for direction in DIRECTIONS:
+        signed = diffs * direction
+        unsafe_steps = np.flatnonzero(is_step & ((signed < 1) | (signed > 3)))
+        # Sorted, since the steps are
+        step_reports = np.searchsorted(offsets, unsafe_steps, side="right") - 1
+        has_unsafe = np.bincount(step_reports, minlength=num_reports) > 0
+        safe |= ~has_unsafe
+        if not can_remove or not unsafe_steps.size:
             continue
-        sol += int(is_error_forgivable(levels, is_increasing, first_problematic_index))
+
+        unsafe_reports, first_indexes = np.unique(step_reports, return_index=True)
+        last_indexes = np.append(first_indexes[1:], step_reports.size) - 1
+        first_unsafe, last_unsafe = unsafe_steps[first_indexes], unsafe_steps[last_indexes]
+        report_starts, report_ends = starts[unsafe_reports], ends[unsafe_reports]
+        # Removing level `k` drops steps `k - 1` and `k`: it must be the first unsafe step's start or end
+        for k in (first_unsafe, first_unsafe + 1):
+            bridge = (values[np.minimum(k + 1, values.size - 1)] - values[np.maximum(k - 1, 0)]).astype(np.int64)
+            bridge *= direction
+            is_inner = (k > report_starts) & (k < report_ends)
+            fixed = (k - 1 <= last_unsafe) & (last_unsafe <= k) & (~is_inner | ((bridge >= 1) & (bridge <= 3)))
+            safe[unsafe_reports[fixed]] = True
+    return safe
+
+
+def count_safe_reports(input_path: str, can_remove: bool, engine: str) -> int:
+    engine = get_engine(engine, ENGINES)
+    if engine == ENGINE_NUMPY:
+        return int(get_ragged_safe_mask(*get_ragged_reports(input_path), can_remove).sum())
+    if engine == ENGINE_PADDED:
+        return int(get_safe_mask(*get_padded_reports(get_parsed_input(input_path)), can_remove).sum())
+    return sum(is_safe(levels, can_remove) for levels in get_parsed_input(input_path))
+
+
+def solve_part1(input_path: str, expected_output: Optional[int] = None, engine: str = ENGINE_AUTO):
+    sol = count_safe_reports(input_path, False, engine)
+
+    handle_solution(sol, expected_output)
+
+
+def solve_part2(input_path: str, expected_output: Optional[int] = None, engine: str = ENGINE_AUTO):
+    sol = count_safe_reports(input_path, True, engine)
+
     handle_solution(sol, expected_output)
 
 
 def day02():
     solve_part1(EXAMPLE_PATH, 2)
+    solve_part1(EXAMPLE_PATH, 2, engine=ENGINE_NUMPY)
+    solve_part1(EXAMPLE_PATH, 2, engine=ENGINE_PYTHON)
+    solve_part1(EXAMPLE_PATH, 2, engine=ENGINE_PADDED)
     solve_part1(INPUT_PATH, 287)
     solve_part2(EXAMPLE_PATH, 4)
+    solve_part2(EXAMPLE_PATH, 4, engine=ENGINE_NUMPY)
+    solve_part2(EXAMPLE_PATH, 4, engine=ENGINE_PYTHON)
+    solve_part2(EXAMPLE_PATH, 4, engine=ENGINE_PADDED)
     solve_part2(INPUT_PATH, 354)
 
 
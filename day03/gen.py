@@ -0,0 +1,34 @@
+import random
+from typing import Iterator
+
+# `size` is the approximate number of bytes of corrupted memory
+DEFAULT_SIZE = 20000
+LINE_LENGTH = 3000
+
+JUNK = "!@#$%^&*()[]{}<>?,;:'+-_ mulodnt"
+
+
+def get_token(rng: random.Random) -> str:
+    choice = rng.random()
+    if choice < 0.5:
+        return f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})"
+    if choice < 0.6:
+        return "do()"
+    if choice < 0.7:
+        return "don't()"
+    # Almost-tokens, which must not be matched
+    return rng.choice(("mul(4*", "mul ( 2 , 4 )", "mul[3,7]", "do_not_mul(5,5", "don't", "mul(1234,5)"))
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    written = 0
+    while written < size:
+        parts = []
+        line_length = 0
+        while line_length < min(LINE_LENGTH, size - written):
+            part = get_token(rng) + "".join(rng.choice(JUNK) for _ in range(rng.randint(0, 12)))
+            parts.append(part)
+            line_length += len(part)
+        written += line_length
+        yield "".join(parts)
@@ -1,96 +1,187 @@
-from collections import defaultdict
 import os
 import re
-from typing import DefaultDict, List, Optional, Tuple
+from typing import Iterator, Optional, Tuple, Union
 
-from common import handle_solution, read_input_as_string
+from cache import cached_parse
+from common import handle_solution, open_input_as_mmap, open_input_as_view
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
 EXAMPLE_PATH = dir_path + os.sep + "example.txt"
 INPUT_PATH = dir_path + os.sep + "input.txt"
 
-MUL_REGEX_PATTERN = r"^mul\((\d{1,3}),(\d{1,3})\)"
-DO_PATTERN = "^do\(\)"
-DONT_PATTERN = "^don't\(\)"
+# Every instruction in one alternation, so a single pass finds them all in order
+TOKEN_PATTERN = rb"mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)"
 
-ENABLE = "e"
-DISABLE = "d"
-NO_MATCH = "n"
+# Compiled once per process, and reused by every input it solves
+TOKEN_REGEX = re.compile(TOKEN_PATTERN)
 
+DO = b"do()"
+# A token split across two chunks has at most this many bytes in the first (the longest is "mul(999,999)")
+OVERLAP = len(b"mul(999,999)") - 1
 
-def try_matching_mul_command(input, position):
-    assert input[position] == "m"
-    relevant_slice = input[position : position + 12]
-    match_or_none = re.match(MUL_REGEX_PATTERN, relevant_slice)
-    if match_or_none is None:
-        # <mul outcome>, <pos addition>
-        return 0, 1
-    outcome = int(match_or_none.group(1)) * int(match_or_none.group(2))
-    pos_addition = match_or_none.span()[1]
-    return outcome, pos_addition
+# The whole input mapped and scanned at once
+MODE_MMAP = "mmap"
+# Read in chunks of `chunk_size` bytes, in constant memory
+MODE_STREAM = "stream"
+# Chunks of `chunk_size` bytes scanned on `workers` processes
+MODE_PARALLEL = "parallel"
+MODES = (MODE_MMAP, MODE_STREAM, MODE_PARALLEL)
 
+DEFAULT_CHUNK_SIZE = 1 << 24
 
-def try_matching_toggling_command(input, position):
-    assert input[position] == "d"
-    relevant_slice = input[position : position + 8]
-    match_outcome = re.match(DO_PATTERN, relevant_slice)
-    if match_outcome is not None:
-        return ENABLE, 4
 
-    match_outcome = re.match(DONT_PATTERN, relevant_slice)
-    if match_outcome is not None:
-        return DISABLE, 7
-
-    return NO_MATCH, 1
-
-
-def parse_input(input: List[str]):
-    pass
-
-
-def solve_part1(input_path: str, expected_output: Optional[int] = None):
+def scan(
+    data: Union[bytes, memoryview], handle_toggles: bool, enabled: bool = True, overlap: int = 0
+) -> Tuple[int, bool]:
+    """
+    Sum of the `mul`s enabled when they occur, and whether they still are at the end of `data`.
+    `do()` / `don't()` only toggle when `handle_toggles`.
+    Tokens ending within the first `overlap` bytes were already seen with the previous chunk, and are skipped
+    """
     sol = 0
-    position = 0
-    input_string = read_input_as_string(input_path)
-    while position < len(input_string):
-        if input_string[position] != "m":
-            position += 1
+    for match in TOKEN_REGEX.finditer(data):
+        if match.end() <= overlap:
             continue
-
-        outcome, pos_addition = try_matching_mul_command(input_string, position)
-        sol += outcome
-        position += pos_addition
+        left = match[1]
+        if left is not None:
+            if enabled:
+                sol += int(left) * int(match[2])
+        elif handle_toggles:
+            enabled = match[0] == DO
+    return sol, enabled
+
+
+def iter_chunks(input_path: str, chunk_size: int) -> Iterator[bytes]:
+    """
+    The input `chunk_size` bytes at a time, each prefixed with the last `OVERLAP` bytes of the previous one
+    """
+    tail = b""
+    with open(input_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            buffer = tail + chunk
+            yield buffer
+            tail = buffer[-OVERLAP:]
+
+
+def scan_stream(input_path: str, handle_toggles: bool, chunk_size: int) -> int:
+    sol, enabled = 0, True
+    overlap = 0
+    for buffer in iter_chunks(input_path, chunk_size):
+        chunk_sol, enabled = scan(buffer, handle_toggles, enabled, overlap)
+        sol += chunk_sol
+        overlap = min(OVERLAP, len(buffer))
+    return sol
+
+
+def scan_range(input_path: str, start: int, end: int, handle_toggles: bool) -> Tuple[int, int, Optional[bool]]:
+    """
+    Scans the tokens ending in `input_path[start:end]`, whatever the state at `start`:
+    the `mul`s before its first toggle (enabled or not depending on the state at `start`),
+    the enabled `mul`s after it, and the state its last toggle leaves (None without toggles)
+    """
+    before_toggle, after_toggle = 0, 0
+    state = None  # type: Optional[bool]
+    with open_input_as_view(input_path) as view:
+        data = view[max(start - OVERLAP, 0) : end]
+        overlap = start - max(start - OVERLAP, 0)
+        for match in TOKEN_REGEX.finditer(data):
+            if match.end() <= overlap:
+                continue
+            left = match[1]
+            if left is not None:
+                if state is None:
+                    before_toggle += int(left) * int(match[2])
+                elif state:
+                    after_toggle += int(left) * int(match[2])
+            elif handle_toggles:
+                state = match[0] == DO
+        # The view can't be released while a slice of it is alive
+        data.release()
+    return before_toggle, after_toggle, state
+
+
+def scan_parallel(input_path: str, handle_toggles: bool, chunk_size: int, workers: Optional[int]) -> int:
+    """
+    Chunks are scanned independently, then the state at each chunk boundary is resolved in order:
+    it is the last toggle of the chunks before, which decides whether a chunk's first `mul`s count
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    size = os.path.getsize(input_path)
+    starts = range(0, size, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(scan_range, input_path, start, min(start + chunk_size, size), handle_toggles)
+            for start in starts
+        ]
+        sol, enabled = 0, True
+        for future in futures:
+            before_toggle, after_toggle, state = future.result()
+            sol += (before_toggle if enabled else 0) + after_toggle
+            if state is not None:
+                enabled = state
+    return sol
+
+
+@cached_parse(read_only=True)
+def scan_mapped(input_path: str, handle_toggles: bool) -> int:
+    """
+    The whole input scanned at once. The scan is all the day does, so this is what a warm process keeps
+    """
+    with open_input_as_mmap(input_path) as mapped:
+        sol, _ = scan(mapped, handle_toggles)
+    return sol
+
+
+def get_sum_of_muls(
+    input_path: str, handle_toggles: bool, mode: str, chunk_size: int, workers: Optional[int] = None
+) -> int:
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}, expected one of {MODES}")
+    if mode == MODE_STREAM:
+        return scan_stream(input_path, handle_toggles, chunk_size)
+    if mode == MODE_PARALLEL:
+        return scan_parallel(input_path, handle_toggles, chunk_size, workers)
+    return scan_mapped(input_path, handle_toggles)
+
+
+def solve_part1(
+    input_path: str,
+    expected_output: Optional[int] = None,
+    mode: str = MODE_MMAP,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+):
+    sol = get_sum_of_muls(input_path, False, mode, chunk_size, workers)
 
     handle_solution(sol, expected_output)
 
 
-def solve_part2(input_path: str, expected_output: Optional[int] = None):
-    sol = 0
-    position = 0
-    toggle = ENABLE
-    input_string = read_input_as_string(input_path)
-    while position < len(input_string):
-        pos_addition = 1
-        sol_addition = 0
-        if input_string[position] == "m" and toggle == ENABLE:
-            sol_addition, pos_addition = try_matching_mul_command(input_string, position)
-
-        if input_string[position] == "d":
-            output, pos_addition = try_matching_toggling_command(input_string, position)
-            if output != NO_MATCH:
-                toggle = output
-
-        sol += sol_addition
-        position += pos_addition
+def solve_part2(
+    input_path: str,
+    expected_output: Optional[int] = None,
+    mode: str = MODE_MMAP,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+):
+    sol = get_sum_of_muls(input_path, True, mode, chunk_size, workers)
 
     handle_solution(sol, expected_output)
 
 
 def day03():
     solve_part1(EXAMPLE_PATH, 161)
+    # Chunks of 7 bytes, so tokens get split across chunk boundaries
+    solve_part1(EXAMPLE_PATH, 161, mode=MODE_STREAM, chunk_size=7)
+    solve_part1(EXAMPLE_PATH, 161, mode=MODE_PARALLEL, chunk_size=7, workers=2)
     solve_part1(INPUT_PATH, 184122457)
     solve_part2(EXAMPLE_PATH, 48)
+    solve_part2(EXAMPLE_PATH, 48, mode=MODE_STREAM, chunk_size=7)
+    solve_part2(EXAMPLE_PATH, 48, mode=MODE_PARALLEL, chunk_size=7, workers=2)
     solve_part2(INPUT_PATH, 107862689)
 
 
@@ -0,0 +1,11 @@
+import random
+from typing import Iterator
+
+# `size` is the side of the (square) word search
+DEFAULT_SIZE = 140
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    for _ in range(size):
+        yield "".join(rng.choice("XMAS") for _ in range(size))
@@ -1,8 +1,22 @@
 from collections import defaultdict
 import os
-from typing import List, Optional, Tuple
+import re
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
-from common import handle_solution, read_input_as_matrix
+from aho_corasick import AhoCorasick
+from cache import cached_parse
+from common import (
+    ENGINE_AUTO,
+    ENGINE_NUMPY,
+    ENGINE_PYTHON,
+    get_engine,
+    handle_solution,
+    read_input_as_bytes,
+    read_input_as_matrix,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
@@ -12,6 +26,26 @@ INPUT_PATH = dir_path + os.sep + "input.txt"
 WORD_TO_SEARCH = "XMAS"
 DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1)]
 
+# Every grid line in one text, searched for many words at once (see `search`)
+ENGINE_AUTOMATON = "automaton"
+ENGINES = (ENGINE_AUTO, ENGINE_NUMPY, ENGINE_PYTHON, ENGINE_AUTOMATON)
+
+# 2-D templates, "." matching any letter. Each is searched in all its rotations and mirror images
+X_MAS = "X-MAS"
+STENCILS = {
+    X_MAS: ("M.S", ".A.", "M.S"),
+}  # type: Dict[str, Tuple[str, ...]]
+
+
+@cached_parse(read_only=True)
+def get_parsed_input(input_path: str) -> List[List[str]]:
+    return read_input_as_matrix(input_path)
+
+
+@cached_parse(read_only=True)
+def get_rows(input_path: str) -> List[bytes]:
+    return read_input_as_bytes(input_path).splitlines()
+
 
 def check_bounds(row, col, row_count, col_count):
     result = 0 <= row < row_count and 0 <= col < col_count
@@ -85,9 +119,157 @@ def count_x_from_cell(matrix, row, col, row_count, col_count, word_index=0, dire
     return 1
 
 
-def solve_part1(input_path: str, expected_output: Optional[int] = None):
+@cached_parse(read_only=True)
+def read_input_as_array(input_path: str) -> "np.ndarray":
+    """
+    The letters as a 2-D uint8 array
+    """
+    import numpy as np
+
+    lines = get_rows(input_path)
+    if not lines:
+        return np.zeros((0, 0), dtype=np.uint8)
+    return np.frombuffer(b"".join(lines), dtype=np.uint8).reshape(len(lines), len(lines[0]))
+
+
+def get_shifted(grid: "np.ndarray", row_shift: int, col_shift: int, rows: int, cols: int) -> "np.ndarray":
+    """
+    The `rows` x `cols` window of `grid` starting at (row_shift, col_shift)
+    """
+    return grid[row_shift : row_shift + rows, col_shift : col_shift + cols]
+
+
+def count_words_numpy(grid: "np.ndarray", word: str = WORD_TO_SEARCH) -> int:
+    """
+    For each direction, one equality mask per letter of `word`, each over the grid shifted by that letter's offset.
+    A cell where all masks hold starts an occurrence
+    """
+    import numpy as np
+
+    row_count, col_count = grid.shape
+    length = len(word)
     total_count = 0
-    matrix = read_input_as_matrix(input_path)
+    for row_diff, col_diff in DIRECTIONS:
+        # Starting cells from which the whole word stays inside the grid
+        rows = row_count - (length - 1) * abs(row_diff)
+        cols = col_count - (length - 1) * abs(col_diff)
+        if rows <= 0 or cols <= 0:
+            continue
+        first_row = (length - 1) * max(-row_diff, 0)
+        first_col = (length - 1) * max(-col_diff, 0)
+        found = np.ones((rows, cols), dtype=bool)
+        for i, letter in enumerate(word.encode()):
+            found &= get_shifted(grid, first_row + i * row_diff, first_col + i * col_diff, rows, cols) == letter
+        total_count += int(np.count_nonzero(found))
+    return total_count
+
+
+def count_x_numpy(grid: "np.ndarray") -> int:
+    """
+    Every inner `A` at once, with both diagonals through it reading "MAS" one way or the other
+    """
+    import numpy as np
+
+    rows, cols = grid.shape[0] - 2, grid.shape[1] - 2
+    if rows <= 0 or cols <= 0:
+        return 0
+    m, s = ord("M"), ord("S")
+    top_left, top_right = get_shifted(grid, 0, 0, rows, cols), get_shifted(grid, 0, 2, rows, cols)
+    bottom_left, bottom_right = get_shifted(grid, 2, 0, rows, cols), get_shifted(grid, 2, 2, rows, cols)
+    found = get_shifted(grid, 1, 1, rows, cols) == ord("A")
+    found &= ((top_left == m) & (bottom_right == s)) | ((top_left == s) & (bottom_right == m))
+    found &= ((top_right == m) & (bottom_left == s)) | ((top_right == s) & (bottom_left == m))
+    return int(np.count_nonzero(found))
+
+
+def get_grid_text(rows: List[bytes]) -> bytes:
+    """
+    Every row, column, diagonal and anti-diagonal of the grid, separated by newlines.
+    With a newline ending each row, the flat grid has a separator column: stepping through it by the row stride
+    (plus or minus one) walks a diagonal, and crosses the separator whenever the diagonal would wrap around
+    """
+    flat = b"".join(row + b"\n" for row in rows)
+    stride = len(rows[0]) + 1 if rows else 1
+    lines = [flat]
+    lines.extend(flat[col::stride] for col in range(stride - 1))
+    lines.extend(flat[start :: stride + 1] for start in range(stride + 1))
+    lines.extend(flat[start :: stride - 1] for start in range(stride - 1))
+    return b"\n".join(lines)
+
+
+def count_words_automaton(rows: List[bytes], words: Iterable[str]) -> Dict[str, int]:
+    """
+    Occurrences of each word in the 8 directions: forwards and backwards along every grid line
+    """
+    words = list(words)
+    patterns = [word.encode() for word in words] + [word[::-1].encode() for word in words]
+    counts = AhoCorasick(patterns).count(get_grid_text(rows))
+    # A palindrome reads the same both ways, and is counted twice like the other words
+    return {word: counts[word.encode()] + counts[word[::-1].encode()] for word in words}
+
+
+def get_orientations(template: Tuple[str, ...]) -> List[Tuple[str, ...]]:
+    """
+    The distinct rotations and mirror images of a template
+    """
+    orientations = []
+    for mirrored in (template, tuple(row[::-1] for row in template)):
+        rotated = mirrored
+        for _ in range(4):
+            if rotated not in orientations:
+                orientations.append(rotated)
+            # Clockwise quarter turn
+            rotated = tuple("".join(column) for column in zip(*reversed(rotated)))
+    return orientations
+
+
+def count_stencil(rows: List[bytes], template: Tuple[str, ...]) -> int:
+    """
+    Occurrences of the template as is: one regex over the flat grid, its rows joined by skips to the next grid row
+    """
+    height, width = len(template), len(template[0])
+    if not rows or height > len(rows) or width > len(rows[0]):
+        return 0
+    stride = len(rows[0]) + 1
+    flat = b"".join(row + b"\n" for row in rows)
+    skip = b".{%d}" % (stride - width)
+    pattern = skip.join(re.escape(row.encode()).replace(b"\\.", b".") for row in template)
+    # In a lookahead, so overlapping occurrences are all found
+    regex = re.compile(b"(?=" + pattern + b")", re.DOTALL)
+    last_col = stride - 1 - width
+    return sum(match.start() % stride <= last_col for match in regex.finditer(flat))
+
+
+def count_stencils(rows: List[bytes], stencils: Dict[str, Tuple[str, ...]]) -> Dict[str, int]:
+    return {
+        name: sum(count_stencil(rows, orientation) for orientation in get_orientations(template))
+        for name, template in stencils.items()
+    }
+
+
+def search(
+    input_path: str, words: Iterable[str], stencils: Optional[Dict[str, Tuple[str, ...]]] = None
+) -> Dict[str, int]:
+    """
+    Counts of every word (in the 8 directions) and every stencil (in all orientations), by name
+    """
+    rows = get_rows(input_path)
+    counts = count_words_automaton(rows, words)
+    counts.update(count_stencils(rows, stencils or dict()))
+    return counts
+
+
+def solve_part1(input_path: str, expected_output: Optional[int] = None, engine: str = ENGINE_AUTO):
+    engine = get_engine(engine, ENGINES)
+    if engine == ENGINE_NUMPY:
+        handle_solution(count_words_numpy(read_input_as_array(input_path)), expected_output)
+        return
+    if engine == ENGINE_AUTOMATON:
+        handle_solution(search(input_path, [WORD_TO_SEARCH])[WORD_TO_SEARCH], expected_output)
+        return
+
+    total_count = 0
+    matrix = get_parsed_input(input_path)
     for row_index, row in enumerate(matrix):
         for col_index, cell in enumerate(row):
             total_count += count_words_from_cell(
@@ -100,9 +282,17 @@ def solve_part1(input_path: str, expected_output: Optional[int] = None):
     handle_solution(total_count, expected_output)
 
 
-def solve_part2(input_path: str, expected_output: Optional[int] = None):
+def solve_part2(input_path: str, expected_output: Optional[int] = None, engine: str = ENGINE_AUTO):
+    engine = get_engine(engine, ENGINES)
+    if engine == ENGINE_NUMPY:
+        handle_solution(count_x_numpy(read_input_as_array(input_path)), expected_output)
+        return
+    if engine == ENGINE_AUTOMATON:
+        handle_solution(search(input_path, [], {X_MAS: STENCILS[X_MAS]})[X_MAS], expected_output)
+        return
+
     total_count = 0
-    matrix = read_input_as_matrix(input_path)
+    matrix = get_parsed_input(input_path)
     for row_index, row in enumerate(matrix):
         for col_index, cell in enumerate(row):
             total_count += count_x_from_cell(
@@ -117,8 +307,14 @@ def solve_part2(input_path: str, expected_output: Optional[int] = None):
 
 def day04():
     solve_part1(EXAMPLE_PATH, 18)
+    solve_part1(EXAMPLE_PATH, 18, engine=ENGINE_NUMPY)
+    solve_part1(EXAMPLE_PATH, 18, engine=ENGINE_PYTHON)
+    solve_part1(EXAMPLE_PATH, 18, engine=ENGINE_AUTOMATON)
     solve_part1(INPUT_PATH, 2447)
     solve_part2(EXAMPLE_PATH, 9)
+    solve_part2(EXAMPLE_PATH, 9, engine=ENGINE_NUMPY)
+    solve_part2(EXAMPLE_PATH, 9, engine=ENGINE_PYTHON)
+    solve_part2(EXAMPLE_PATH, 9, engine=ENGINE_AUTOMATON)
     solve_part2(INPUT_PATH, 1868)
 
 
@@ -0,0 +1,25 @@
+import random
+from typing import Iterator
+
+# `size` is the number of updates
+DEFAULT_SIZE = 200
+DEFAULT_PAGES = 49
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0, pages: int = DEFAULT_PAGES) -> Iterator[str]:
+    rng = random.Random(seed)
+    page_numbers = rng.sample(range(10, 10 + pages * 10), pages)
+    # A hidden total order, with a rule for every pair of pages (like the real input)
+    rank = {page: i for i, page in enumerate(page_numbers)}
+    rules = [(a, b) for i, a in enumerate(page_numbers) for b in page_numbers[i + 1 :]]
+    rng.shuffle(rules)
+    for a, b in rules:
+        yield f"{a}|{b}"
+    yield ""
+
+    for _ in range(size):
+        update = rng.sample(page_numbers, rng.randrange(5, min(pages, 24), 2))
+        # Half of the updates are already in the right order
+        if rng.random() < 0.5:
+            update.sort(key=rank.get)
+        yield ",".join(str(page) for page in update)
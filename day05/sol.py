@@ -1,126 +1,264 @@
-from collections import defaultdict
-from copy import deepcopy
-import copy
+from functools import cmp_to_key
+from itertools import islice, takewhile
 import os
-import re
-from typing import DefaultDict, List, Optional, Tuple
-import graphlib
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from common import handle_solution, read_input_as_lines
+from cache import cached_parse
+from common import handle_solution, iter_input_lines
+
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
 EXAMPLE_PATH = dir_path + os.sep + "example.txt"
 INPUT_PATH = dir_path + os.sep + "input.txt"
 
+# Whole input parsed up front
+MODE_MEMORY = "memory"
+# Updates streamed in batches of `batch_size` lines to `workers` processes, in constant memory
+MODE_PARALLEL = "parallel"
+MODES = (MODE_MEMORY, MODE_PARALLEL)
+
+DEFAULT_BATCH_SIZE = 2000
+# Batches submitted ahead of the results, per worker
+BATCHES_IN_FLIGHT_PER_WORKER = 2
+
+# How the rules order two pages, as stored in `Rules.ordered`
+ORDER_NONE = 0
+ORDER_BEFORE = 1
+ORDER_AFTER = 2
+# `Rules.compare` result for each order
+COMPARISONS = (0, -1, 1)
+
+
+class Rules:
+    """
+    The page ordering rules as a dense matrix over the pages they mention, numbered by `indices`:
+    `ordered[indices[page1] * size + indices[page2]]` is ORDER_BEFORE when a rule puts `page1` first,
+    ORDER_AFTER when one puts `page2` first, ORDER_NONE otherwise.
+    Its size depends on how many pages the rules mention, not on how large their numbers are, but grows as the square
+    of that count (a byte per pair: 10k distinct pages take 100 MB)
+    """
+
+    __slots__ = ("indices", "ordered", "size")
+
+    def __init__(self, indices: Dict[int, int], ordered: bytearray):
+        self.indices = indices
+        self.ordered = ordered
+        self.size = len(indices)
+
+    def get_order(self, page1: int, page2: int) -> int:
+        try:
+            return self.ordered[self.indices[page1] * self.size + self.indices[page2]]
+        except KeyError:
+            # A page in no rule
+            return ORDER_NONE
+
+    def is_before(self, before: int, after: int) -> bool:
+        return self.get_order(before, after) == ORDER_BEFORE
+
+    def compare(self, page1: int, page2: int) -> int:
+        return COMPARISONS[self.get_order(page1, page2)]
+
+
+def parse_rule(line: str) -> Tuple[int, int]:
+    before, _, after = line.partition("|")
+    return int(before), int(after)
+
 
-def parse_input(input: List[str]):
-    is_reading_edges = True
-    edges = []
+def parse_update(line: str) -> List[int]:
+    return [int(page) for page in line.split(",")]
+
+
+def parse_input(input: Iterable[str]) -> Tuple[List[Tuple[int, int]], List[List[int]]]:
+    is_reading_rules = True
+    rules = []
     updates = []
     for line in input:
-        if line == "\n":
-            is_reading_edges = False
+        if not line:
+            is_reading_rules = False
             continue
 
-        if is_reading_edges:
-            line_match = re.match(r"(\d+)\|(\d+)", line)
-            edges.append((line_match.group(1), line_match.group(2)))
+        if is_reading_rules:
+            rules.append(parse_rule(line))
         else:
-            updates.append(line.replace("\n", "").split(","))
-    return edges, updates
+            updates.append(parse_update(line))
+    return rules, updates
 
 
-def construct_graph_from_edges(edges):
-    vertices = set([edge[0] for edge in edges] + [edge[1] for edge in edges])
-    graph = {vertex: set() for vertex in vertices}
-    for edge in edges:
-        graph[edge[0]].add(edge[1])
-    return graph
+@cached_parse(read_only=True)
+def get_parsed_input(input_path: str) -> Tuple[List[Tuple[int, int]], List[List[int]]]:
+    return parse_input(iter_input_lines(input_path))
 
 
-def should_add_edge(source, target, nodes):
-    return source in nodes and target in nodes
+def compile_rules(rules: List[Tuple[int, int]]) -> Rules:
+    indices = dict()  # type: Dict[int, int]
+    for before, after in rules:
+        indices.setdefault(before, len(indices))
+        indices.setdefault(after, len(indices))
+    size = len(indices)
+    ordered = bytearray(size * size)
+    for before, after in rules:
+        forward = indices[before] * size + indices[after]
+        if ordered[forward] == ORDER_AFTER:
+            # Contradicts an earlier rule, which wins
+            continue
+        ordered[forward] = ORDER_BEFORE
+        ordered[indices[after] * size + indices[before]] = ORDER_AFTER
+    return Rules(indices, ordered)
 
 
-def solve_part1(input_path: str, expected_output: Optional[int] = None):
-    sol = 0
-    input_lines = read_input_as_lines(input_path)
-    edges, updates = parse_input(input_lines)
-
-    for update in updates:
-        temp_edges = []  # copy.copy(edges)
-        temp_nodes = set()
-        for i in range(1, len(update)):
-            source, target = update[i - 1], update[i]
-            temp_edges.append((source, target))
-            temp_nodes.add(source)
-            temp_nodes.add(target)
-
-        for source, target in edges:
-            if should_add_edge(source, target, temp_nodes):
-                temp_edges.append((source, target))
-
-        graph = construct_graph_from_edges(temp_edges)
-        topological_sorted_graph = graphlib.TopologicalSorter(graph)
-        try:
-            tuple(topological_sorted_graph.static_order())  # Check the topological order is alright
-            middle = len(update) // 2
-            sol += int(update[middle])
-        except graphlib.CycleError as e:
-            # print(e)
-            pass
+def is_chained(update: List[int], rules: Rules) -> bool:
+    """
+    Whether a rule puts each page of the update before the next one
+    """
+    return all(order == ORDER_BEFORE for order in map(rules.get_order, update, update[1:]))
+
+
+def is_correctly_ordered(update: List[int], rules: Rules) -> bool:
+    """
+    When the rules order every pair of neighbouring pages, checking those is enough.
+    Otherwise a rule may still order pages further apart, so every pair is checked
+    """
+    chained = True
+    for order in map(rules.get_order, update, update[1:]):
+        if order != ORDER_BEFORE:
+            if order == ORDER_AFTER:
+                return False
+            chained = False
+    if chained:
+        return True
+    return not any(rules.is_before(update[j], update[i]) for i in range(len(update)) for j in range(i + 2, len(update)))
+
+
+def get_topological_order(update: List[int], rules: Rules) -> List[int]:
+    from graphlib import TopologicalSorter
+
+    predecessors = {page: {other for other in update if rules.is_before(other, page)} for page in update}
+    return list(TopologicalSorter(predecessors).static_order())
+
+
+def get_corrected_update(update: List[int], rules: Rules) -> List[int]:
+    """
+    Sorting with the rules as comparison is only right when they order every pair of pages of the update:
+    when the result isn't chained by the rules, falls back to a topological sort of the rules among its pages
+    """
+    corrected = sorted(update, key=cmp_to_key(rules.compare))
+    if is_chained(corrected, rules):
+        return corrected
+    return get_topological_order(update, rules)
 
-    handle_solution(sol, expected_output)
 
+def get_middle_page(update: List[int]) -> int:
+    return update[len(update) // 2]
+
+
+def get_update_score(update: List[int], rules: Rules, corrected: bool) -> int:
+    """
+    Middle page of a correctly ordered update (part 1), or of an incorrectly ordered one once corrected (part 2)
+    """
+    if is_correctly_ordered(update, rules):
+        return 0 if corrected else get_middle_page(update)
+    return get_middle_page(get_corrected_update(update, rules)) if corrected else 0
+
+
+# Worker side: the compiled rules, set once when the worker starts
+_worker_rules = None  # type: Optional[Rules]
+
+
+def set_worker_rules(rules: Rules):
+    global _worker_rules
+    _worker_rules = rules
+
+
+def score_batch(lines: List[str], corrected: bool) -> int:
+    return sum(get_update_score(parse_update(line), _worker_rules, corrected) for line in lines if line)
+
+
+def iter_batches(lines: Iterator[str], batch_size: int) -> Iterator[List[str]]:
+    while True:
+        batch = list(islice(lines, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def get_pool_context() -> "BaseContext":
+    import multiprocessing
+
+    # Forked workers inherit the rules given to their initializer, instead of unpickling a copy each
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def get_score_parallel(input_path: str, corrected: bool, workers: Optional[int], batch_size: int) -> int:
+    """
+    Reads the rules, then streams the updates as batches of lines to the workers, summing their results as they
+    complete. At most `BATCHES_IN_FLIGHT_PER_WORKER` batches per worker are read ahead of the results
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    lines = iter_input_lines(input_path)
+    rules = compile_rules([parse_rule(line) for line in takewhile(bool, lines)])
+    workers = workers or os.cpu_count() or 1
 
-def solve_part2(input_path: str, expected_output: Optional[int] = None):
     sol = 0
-    input_lines = read_input_as_lines(input_path)
-    edges, updates = parse_input(input_lines)
-
-    for update in updates:
-        original_relevant_edges = []
-        temp_edges = []  # copy.copy(edges)
-        temp_nodes = set()
-        for i in range(1, len(update)):
-            source, target = update[i - 1], update[i]
-            temp_edges.append((source, target))
-            temp_nodes.add(source)
-            temp_nodes.add(target)
-
-        for source, target in edges:
-            if should_add_edge(source, target, temp_nodes):
-                original_relevant_edges.append((source, target))
-                temp_edges.append((source, target))
-
-        graph = construct_graph_from_edges(temp_edges)
-        topological_sorted_graph = graphlib.TopologicalSorter(graph)
-        try:
-            tuple(topological_sorted_graph.static_order())  # Check the topological order is alright
-            continue
-        except graphlib.CycleError as e:
-            pass
+    pending = set()
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=get_pool_context(), initializer=set_worker_rules, initargs=(rules,)
+    ) as executor:
+        for batch in iter_batches(lines, batch_size):
+            if len(pending) >= workers * BATCHES_IN_FLIGHT_PER_WORKER:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                sol += sum(future.result() for future in done)
+            pending.add(executor.submit(score_batch, batch, corrected))
+        sol += sum(future.result() for future in pending)
+    return sol
 
-        try:
-            # print("!!!!!!!!!!!!! YEAHGGGGGGGGGGGGGGGG")
-            # print(original_relevant_edges)
-            graph = construct_graph_from_edges(original_relevant_edges)
-            topological_sorted_graph = graphlib.TopologicalSorter(graph)
-            fixed_update = tuple(topological_sorted_graph.static_order())
-            middle = len(fixed_update) // 2
-            sol += int(fixed_update[middle])
-        except graphlib.CycleError as e:
-            print("!!!!!!!!!!!!!!! NOOOOOOOOOOOOO")
-            exit(1)
+
+def get_score(input_path: str, corrected: bool, mode: str, workers: Optional[int], batch_size: int) -> int:
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}, expected one of {MODES}")
+    if mode == MODE_PARALLEL:
+        return get_score_parallel(input_path, corrected, workers, batch_size)
+    rules, updates = get_parsed_input(input_path)
+    rules = compile_rules(rules)
+    return sum(get_update_score(update, rules, corrected) for update in updates)
+
+
+def solve_part1(
+    input_path: str,
+    expected_output: Optional[int] = None,
+    mode: str = MODE_MEMORY,
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+):
+    sol = get_score(input_path, False, mode, workers, batch_size)
+
+    handle_solution(sol, expected_output)
+
+
+def solve_part2(
+    input_path: str,
+    expected_output: Optional[int] = None,
+    mode: str = MODE_MEMORY,
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+):
+    sol = get_score(input_path, True, mode, workers, batch_size)
 
     handle_solution(sol, expected_output)
 
 
 def day05():
     solve_part1(EXAMPLE_PATH, 143)
+    # Batches of 2 lines, so the updates are spread over several batches and workers
+    solve_part1(EXAMPLE_PATH, 143, mode=MODE_PARALLEL, workers=2, batch_size=2)
     solve_part1(INPUT_PATH, 6384)
     solve_part2(EXAMPLE_PATH, 123)
+    solve_part2(EXAMPLE_PATH, 123, mode=MODE_PARALLEL, workers=2, batch_size=2)
     solve_part2(INPUT_PATH, 5353)
 
 
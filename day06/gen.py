@@ -0,0 +1,39 @@
+import random
+from typing import Iterator, List
+
+# `size` is the side of the (square) map
+DEFAULT_SIZE = 130
+OBSTACLE_DENSITY = 0.02
+
+
+def is_guard_leaving(rows: List[bytearray], row: int, col: int) -> bool:
+    size = len(rows)
+    directions = ((-1, 0), (0, 1), (1, 0), (0, -1))
+    direction = 0
+    seen = set()
+    while True:
+        dr, dc = directions[direction]
+        next_row, next_col = row + dr, col + dc
+        if not (0 <= next_row < size and 0 <= next_col < size):
+            return True
+        if rows[next_row][next_col] == ord("#"):
+            # Only turns can repeat in a loop, so only they are remembered
+            if (row, col, direction) in seen:
+                return False
+            seen.add((row, col, direction))
+            direction = (direction + 1) % 4
+            continue
+        row, col = next_row, next_col
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    # Part 1 needs the guard to walk off the map, so maps trapping the guard are redrawn
+    while True:
+        rows = [bytearray(b"#."[int(rng.random() >= OBSTACLE_DENSITY)] for _ in range(size)) for _ in range(size)]
+        row, col = rng.randrange(size), rng.randrange(size)
+        rows[row][col] = ord("^")
+        if is_guard_leaving(rows, row, col):
+            break
+    for line in rows:
+        yield line.decode()
@@ -1,111 +1,164 @@
-from collections import defaultdict
+from array import array
 import os
 from typing import List, Optional, Tuple
 
-from common import handle_solution, read_input_as_matrix
+from cache import cached_parse
+from common import Grid, handle_solution, read_input_as_grid
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
 EXAMPLE_PATH = dir_path + os.sep + "example.txt"
 INPUT_PATH = dir_path + os.sep + "input.txt"
 
-INITIAL_DIRECTION = (-1, 0)
-
-
-def get_guard_location(input: List[List[str]]):
-    for i, line in enumerate(input):
-        try:
-            guard_col = line.index("^")
-        except:
-            continue
-        print(f"Guard location: {i, guard_col}")
-        return (i, guard_col)
-    raise ValueError("Guard not found")
-
-
-def get_next_direction(curr_direction: Tuple[int, int]):
-    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    index = directions.index(curr_direction)
-    next_index = (index + 1) % 4
-    return directions[next_index]
-
-
-def is_about_to_hit_obstacle(board: List[str], curr_location: Tuple[int, int], curr_direction: Tuple[int, int]):
-    curr_x, curr_y = curr_location
-    dir_x, dir_y = curr_direction
-    return board[curr_x + dir_x][curr_y + dir_y] == "#"
-
-
-def is_legal_step(board: List[str], curr_location: Tuple[int, int], curr_direction: Tuple[int, int]):
-    rows = len(board)
-    cols = len(board[0])
-    next_row = curr_location[0] + curr_direction[0]
-    next_col = curr_location[1] + curr_direction[1]
-    return 0 <= next_row < rows and 0 <= next_col < cols
-
-
-def print_board(board: List[List[str]], direction: Tuple[int, int]):
-    for line in board:
-        print(line)
-    print(f"direction: {direction}")
-    print("-----" * len(board[0]))
-
-
-def move_guard(board: List[str], curr_location: Tuple[int, int], curr_direction: Tuple[int, int]):
-    while is_about_to_hit_obstacle(board, curr_location, curr_direction):
-        curr_direction = get_next_direction(curr_direction)
-    row, col = curr_location
-    row_dir, col_dir = curr_direction
-    new_position = board[row][col] != "X"
-    board[row][col] = "X"
-
-    return (row + row_dir, col + col_dir), curr_direction, new_position
+# The board is bordered with OUTSIDE, so the guard leaves it by stepping on a border cell
+OUTSIDE = "@"
+OBSTACLE = ord("#")
+
+# Directions are indexes into Grid.offsets (RDLU), so turning right is moving to the next one
+INITIAL_DIRECTION = 3
+
+# The jump table holds cell positions: a C int is 4 bytes per entry, and fits grids of up to 2**31 cells
+JUMP_TYPECODE = "i"
+
+
+def get_guard_location(grid: Grid) -> int:
+    position = grid.find("^")
+    if position == -1:
+        raise ValueError("Guard not found")
+    return position
+
+
+def fill_line_jumps(jumps: array, cells: bytearray, offsets: Tuple[int, ...], first: int, step: int, count: int):
+    """
+    Fills the table for the `count` cells of a row (`step` 1) or column (`step` the stride) starting at `first`,
+    one run of cells between obstacles at a time: walking forwards they all stop at the run's last cell,
+    walking backwards at its first one. Without an obstacle there, that cell is on the border, where the guard leaves
+    """
+    line = bytes(cells[first : first + step * count : step])
+    forward, backward = offsets.index(step), offsets.index(-step)
+    run_start = 0
+    while run_start < count:
+        run_end = line.find(OBSTACLE, run_start)
+        if run_end == -1:
+            run_end = count
+        if run_end > run_start:
+            # States of the run's cells, for direction 0
+            states_start, states_end = (first + run_start * step) * 4, (first + run_end * step) * 4
+            last, first_of_run = first + (run_end - 1) * step, first + run_start * step
+            length = run_end - run_start
+            jumps[states_start + forward : states_end + forward : step * 4] = array(JUMP_TYPECODE, [last]) * length
+            jumps[states_start + backward : states_end + backward : step * 4] = (
+                array(JUMP_TYPECODE, [first_of_run]) * length
+            )
+        run_start = run_end + 1
+
+
+def get_jump_table(grid: Grid) -> array:
+    """
+    `jumps[position * 4 + direction]` is where the guard, walking from `position` in `direction`, stops:
+    the cell before the next obstacle, or the border cell where it leaves the board
+    """
+    cells, stride = grid.cells, grid.stride
+    height = len(cells) // stride
+    jumps = array(JUMP_TYPECODE, [0]) * (len(cells) * 4)
+    for row in range(height):
+        fill_line_jumps(jumps, cells, grid.offsets, row * stride, 1, stride)
+    for col in range(stride):
+        fill_line_jumps(jumps, cells, grid.offsets, col, stride, height)
+    return jumps
+
+
+def patch_jump_table(grid: Grid, jumps: array, obstacle: int) -> List[Tuple[int, int]]:
+    """
+    Updates the table for an extra obstacle: only the cells with a line of sight to it stop somewhere else.
+    Returns the (state, previous stop) pairs to undo it with `restore_jump_table`
+    """
+    cells, offsets, outside = grid.cells, grid.offsets, ord(OUTSIDE)
+    patched = []
+    for direction, offset in enumerate(offsets):
+        stop = obstacle - offset
+        position = stop
+        while cells[position] != outside and cells[position] != OBSTACLE:
+            state = position * 4 + direction
+            patched.append((state, jumps[state]))
+            jumps[state] = stop
+            position -= offset
+    return patched
+
+
+def restore_jump_table(jumps: array, patched: List[Tuple[int, int]]):
+    for state, stop in patched:
+        jumps[state] = stop
+
+
+def mark_segment(visited: bytearray, start: int, stop: int, offset: int):
+    end = stop + offset
+    visited[start : end if end >= 0 else None : offset] = b"\x01" * ((stop - start) // offset + 1)
+
+
+def get_visited_locations(grid: Grid, jumps: array, start: int) -> bytearray:
+    """
+    One byte per cell of the grid, set where the guard walks before leaving
+    """
+    cells, offsets, outside = grid.cells, grid.offsets, ord(OUTSIDE)
+    visited = bytearray(len(cells))
+    position, direction = start, INITIAL_DIRECTION
+    while True:
+        stop = jumps[position * 4 + direction]
+        mark_segment(visited, position, stop, offsets[direction])
+        if cells[stop] == outside:
+            # The border cell it left by isn't part of the board
+            visited[stop] = 0
+            return visited
+        position, direction = stop, (direction + 1) % 4
+
+
+@cached_parse(read_only=True)
+def get_parsed_input(input_path: str) -> Tuple[Grid, array, int]:
+    """
+    The bordered grid, its jump table and the guard's starting location
+    """
+    grid = read_input_as_grid(input_path, border=OUTSIDE)
+    return grid, get_jump_table(grid), get_guard_location(grid)
 
 
 def solve_part1(input_path: str, expected_output: Optional[int] = None):
-    sol = 0
-    board = read_input_as_matrix(input_path)
-    (row, col) = get_guard_location(board)
-    direction = INITIAL_DIRECTION
-    visited_locations = set()
-    visited_locations.add((row, col))
-    while is_legal_step(board, (row, col), direction):
-        (row, col), direction, new_position = move_guard(board, (row, col), direction)
-        sol += int(new_position)
-        visited_locations.add((row, col))
-
-    sol += board[row][col] != "X"
+    grid, jumps, start = get_parsed_input(input_path)
+    sol = get_visited_locations(grid, jumps, start).count(1)
     handle_solution(sol, expected_output)
-    return visited_locations
 
 
-def is_looped(board: List[List[str]], initial_position: Tuple[int, int], initial_direction: Tuple[int, int]):
-    row, col = initial_position
-    hist = defaultdict(lambda: 0)
-    direction = initial_direction
-    while is_legal_step(board, (row, col), direction):
-        (row, col), direction, new_position = move_guard(board, (row, col), direction)
-        hist[(row, col)] += 1
-        if hist[(row, col)] > 4:
+def is_looped(grid: Grid, jumps: array, start: int) -> bool:
+    """
+    Jumps from turn to turn. A loop keeps turning at the same cells, so the (cell, direction) states of turns
+    are recorded, and one repeating means the guard never leaves
+    """
+    cells, outside = grid.cells, ord(OUTSIDE)
+    turns = set()
+    position, direction = start, INITIAL_DIRECTION
+    while True:
+        stop = jumps[position * 4 + direction]
+        if cells[stop] == outside:
+            return False
+        state = stop * 4 + direction
+        if state in turns:
             return True
-    return False
+        turns.add(state)
+        position, direction = stop, (direction + 1) % 4
 
 
 def solve_part2(input_path: str, expected_output: Optional[int] = None):
     sol = 0
-    board = read_input_as_matrix(input_path)
-    initial_position = get_guard_location(board)
-    visited_locations = solve_part1(input_path)
-    for i, position in enumerate(visited_locations):
-        if i % 100 == 0:
-            print(f"{i} / {len(visited_locations)}")
-        if position == initial_position:
-            continue
-        row, col = position
-        prev_value = board[row][col]
-        board[row][col] = "#"
-        sol += int(is_looped(board, initial_position, INITIAL_DIRECTION))
-        board[row][col] = prev_value
+    grid, jumps, start = get_parsed_input(input_path)
+    # Patched for each obstacle below: a copy, as the cached table is shared
+    jumps = jumps[:]
+    # Only cells on the original route can change it
+    visited_locations = get_visited_locations(grid, jumps, start)
+    for position, is_visited in enumerate(visited_locations):
+        if is_visited and position != start:
+            patched = patch_jump_table(grid, jumps, position)
+            sol += int(is_looped(grid, jumps, start))
+            restore_jump_table(jumps, patched)
 
     handle_solution(sol, expected_output)
 
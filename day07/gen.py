@@ -0,0 +1,25 @@
+from operator import add, mul
+import random
+from typing import Iterator
+
+# `size` is the number of equations
+DEFAULT_SIZE = 850
+
+
+def concat(n1: int, n2: int) -> int:
+    return int(str(n1) + str(n2))
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    for _ in range(size):
+        numbers = [rng.randint(1, 999) for _ in range(rng.randint(3, 12))]
+        if rng.random() < 0.5:
+            # Solvable, with the operators of part 1 and sometimes part 2
+            operators = (add, mul, concat) if rng.random() < 0.5 else (add, mul)
+            answer = numbers[0]
+            for n in numbers[1:]:
+                answer = rng.choice(operators)(answer, n)
+        else:
+            answer = rng.randint(1, 10 ** rng.randint(3, 15))
+        yield f"{answer}: " + " ".join(str(n) for n in numbers)
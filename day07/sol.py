@@ -1,9 +1,10 @@
 from collections import defaultdict
 import os
 import re
-from typing import DefaultDict, List, Optional, Tuple
+from typing import DefaultDict, Iterable, List, Optional, Tuple
 
-from common import handle_solution, read_input_as_lines
+from cache import cached_parse
+from common import handle_solution, iter_input_lines
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
@@ -11,12 +12,12 @@ EXAMPLE_PATH = dir_path + os.sep + "example.txt"
 INPUT_PATH = dir_path + os.sep + "input.txt"
 
 
+@cached_parse(read_only=True)
 def get_parsed_input(input_path: str) -> Tuple[List[int], List[List[int]]]:
-    _input = read_input_as_lines(input_path)
-    return parse_input(_input)
+    return parse_input(iter_input_lines(input_path))
 
 
-def parse_input(_input: List[str]) -> Tuple[List[int], List[List[int]]]:
+def parse_input(_input: Iterable[str]) -> Tuple[List[int], List[List[int]]]:
     answers = []
     numbers = []
     for line in _input:
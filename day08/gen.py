@@ -0,0 +1,14 @@
+import random
+import string
+from typing import Iterator
+
+# `size` is the side of the (square) map
+DEFAULT_SIZE = 50
+ANTENNA_DENSITY = 0.05
+FREQUENCIES = string.digits + string.ascii_letters
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    for _ in range(size):
+        yield "".join(rng.choice(FREQUENCIES) if rng.random() < ANTENNA_DENSITY else "." for _ in range(size))
@@ -1,10 +1,11 @@
 from collections import defaultdict
-from itertools import product
+from itertools import permutations
 import os
 import re
-from typing import DefaultDict, List, Optional, Tuple
+from typing import DefaultDict, Dict, List, Optional, Tuple
 
-from common import handle_solution, read_input_as_lines
+from cache import cached_parse
+from common import handle_solution, pack_position, read_input_as_lines
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
@@ -25,53 +26,53 @@ def is_in_board(rows, cols, row, col):
     return 0 <= row < rows and 0 <= col < cols
 
 
-def create_hist(input_lines: List[str]):
-    hist = defaultdict(lambda: set())
+def create_hist(input_lines: List[str]) -> DefaultDict[str, List[Tuple[int, int]]]:
+    hist = defaultdict(list)
     for row, line in enumerate(input_lines):
         for col, c in enumerate(line):
             if c != ".":
-                hist[c].add((row, col))
+                hist[c].append((row, col))
     return hist
 
 
+@cached_parse(read_only=True)
+def get_antennas(input_path: str) -> Tuple[int, int, Dict[str, List[Tuple[int, int]]]]:
+    """
+    The board's size, and the locations of the antennas of each frequency
+    """
+    lines = get_parsed_input(input_path)
+    return len(lines), len(lines[0]), dict(create_hist(lines))
+
+
 def solve_part1(input_path: str, expected_output: Optional[int] = None):
     sol = 0
-    lines = get_parsed_input(input_path)
-    rows = len(lines)
-    cols = len(lines[0])
-    hist = create_hist(lines)
-    anti_locations = set()
+    rows, cols, hist = get_antennas(input_path)
+    # One byte per cell (packed as row * cols + col) instead of a set of (row, col) tuples
+    anti_locations = bytearray(rows * cols)
     for c in hist.keys():
-        for first, second in product(hist[c], hist[c]):
-            if first == second:
-                continue
-            diff = first[0] - second[0], first[1] - second[1]
-            anti_row, anti_col = first[0] + diff[0], first[1] + diff[1]
+        for first, second in permutations(hist[c], 2):
+            anti_row, anti_col = 2 * first[0] - second[0], 2 * first[1] - second[1]
             if is_in_board(rows, cols, anti_row, anti_col):
-                anti_locations.add((anti_row, anti_col))
-    sol = len(anti_locations)
+                anti_locations[pack_position(anti_row, anti_col, cols)] = 1
+    sol = anti_locations.count(1)
 
     handle_solution(sol, expected_output)
 
 
 def solve_part2(input_path: str, expected_output: Optional[int] = None):
     sol = 0
-    lines = get_parsed_input(input_path)
-    rows = len(lines)
-    cols = len(lines[0])
-    hist = create_hist(lines)
-    anti_locations = set()
+    rows, cols, hist = get_antennas(input_path)
+    anti_locations = bytearray(rows * cols)
     for c in hist.keys():
-        for first, second in product(hist[c], hist[c]):
-            anti_locations.add(first)
-            if first == second:
-                continue
-            diff = first[0] - second[0], first[1] - second[1]
-            anti_row, anti_col = first[0] + diff[0], first[1] + diff[1]
+        for row, col in hist[c]:
+            anti_locations[pack_position(row, col, cols)] = 1
+        for first, second in permutations(hist[c], 2):
+            diff_row, diff_col = first[0] - second[0], first[1] - second[1]
+            anti_row, anti_col = first
             while is_in_board(rows, cols, anti_row, anti_col):
-                anti_locations.add((anti_row, anti_col))
-                anti_row, anti_col = anti_row + diff[0], anti_col + diff[1]
-    sol = len(anti_locations)
+                anti_locations[pack_position(anti_row, anti_col, cols)] = 1
+                anti_row, anti_col = anti_row + diff_row, anti_col + diff_col
+    sol = anti_locations.count(1)
     handle_solution(sol, expected_output)
 
 
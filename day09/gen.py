@@ -0,0 +1,12 @@
+import random
+from typing import Iterator
+
+# `size` is the length of the disk map
+DEFAULT_SIZE = 19999
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    # Files (even positions) are never empty, and the map starts and ends with a file
+    length = size if size % 2 else size + 1
+    yield "".join(str(rng.randint(1, 9) if i % 2 == 0 else rng.randint(0, 9)) for i in range(length))
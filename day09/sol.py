@@ -4,6 +4,7 @@ import os
 import re
 from typing import DefaultDict, List, Optional, Tuple
 
+from cache import cached_parse
 from common import handle_solution, read_input_as_lines
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
@@ -12,11 +13,12 @@ EXAMPLE_PATH = dir_path + os.sep + "example.txt"
 INPUT_PATH = dir_path + os.sep + "input.txt"
 
 
-def parse_input(_input: List[str]):
-    pass
+def parse_input(_input: List[str]) -> List[int]:
+    return [int(c) for c in _input[0]]
 
 
-def get_parsed_input(input_path: str):
+@cached_parse(read_only=True)
+def get_parsed_input(input_path: str) -> List[int]:
     _input = read_input_as_lines(input_path)
     return parse_input(_input)
 
@@ -24,16 +26,16 @@ def get_parsed_input(input_path: str):
 def solve_part1(input_path: str, expected_output: Optional[int] = None):
     sol = 0
     start = 0
-    input_string = read_input_as_lines(input_path)[0]
-    end = len(input_string) - 1
+    disk_map = get_parsed_input(input_path)
+    end = len(disk_map) - 1
     end_block_index = end // 2
     curr_block_for_checksum = 0
-    remaining_blocks_in_end = int(input_string[end])
+    remaining_blocks_in_end = disk_map[end]
     while start < end:
-        start_block_length = int(input_string[start])
+        start_block_length = disk_map[start]
         start_block_index = start // 2
         end_block_index = end // 2
-        free_block_length = int(input_string[start + 1])
+        free_block_length = disk_map[start + 1]
         # Add start_block to checksum
         for _ in range(start_block_length):
             sol += curr_block_for_checksum * start_block_index
@@ -44,7 +46,7 @@ def solve_part1(input_path: str, expected_output: Optional[int] = None):
             # Skip if no free block
             while remaining_blocks_in_end == 0:  # I think while should be sufficient here
                 end -= 2
-                remaining_blocks_in_end = int(input_string[end])
+                remaining_blocks_in_end = disk_map[end]
 
             if start >= end:
                 break
@@ -86,9 +88,8 @@ def get_diff_in_blocks(arr: List[int], curr_block: int):
 
 
 def solve_part2(input_path: str, expected_output: Optional[int] = None):
-    input_string = read_input_as_lines(input_path)[0]
-    arr = [int(c) for c in input_string]
-    new_arr = [(int(c), i // 2) if i % 2 == 0 else (int(c), -1) for i, c in enumerate(input_string)]
+    arr = get_parsed_input(input_path)
+    new_arr = [(c, i // 2) if i % 2 == 0 else (c, -1) for i, c in enumerate(arr)]
     free_blocks_by_size = get_free_blocks_by_size(arr)  # type: List[List[int]]
     total_blocks = sum(arr)
     curr_block_location = total_blocks - arr[-1]
@@ -0,0 +1,21 @@
+import random
+from typing import Iterator
+
+# `size` is the side of the (square) map
+DEFAULT_SIZE = 50
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    heights = [[rng.randint(0, 9) for _ in range(size)] for _ in range(size)]
+    # Lay gentle uphill trails over the noise, so there is something to find
+    for _ in range(max(size * size // 40, 1)):
+        row, col = rng.randrange(size), rng.randrange(size)
+        for height in range(10):
+            heights[row][col] = height
+            dr, dc = rng.choice(((0, 1), (1, 0), (0, -1), (-1, 0)))
+            if not (0 <= row + dr < size and 0 <= col + dc < size):
+                break
+            row, col = row + dr, col + dc
+    for line in heights:
+        yield "".join(str(height) for height in line)
@@ -1,75 +1,71 @@
-from collections import defaultdict
 import os
-import re
-from typing import DefaultDict, List, Optional, Set, Tuple
+from typing import Optional, Set, Tuple
 
-from common import handle_solution, is_in_board, read_input_as_lines
+from cache import cached_parse
+from common import Grid, handle_solution, read_input_as_grid
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
 EXAMPLE_PATH = dir_path + os.sep + "example.txt"
 INPUT_PATH = dir_path + os.sep + "input.txt"
 
-DIRECTIONS = [(0, 1), (1, 0), (-1, 0), (0, -1)]
+# Trails climb one digit at a time, from 0 to 9. The border is no digit, so trails stop there without bounds checks
+BORDER = "."
+TRAILHEAD = ord("0")
+TOP = ord("9")
 
 
-def parse_input(input_lines: List[str]) -> List[List[int]]:
-    return [[int(x) for x in line] for line in input_lines]
+@cached_parse(read_only=True)
+def get_parsed_input(input_path: str) -> Grid:
+    return read_input_as_grid(input_path, border=BORDER)
 
 
-def get_parsed_input(input_path: str):
-    _input = read_input_as_lines(input_path)
-    return parse_input(_input)
-
-
-def count_paths_to_top(
-    input_matrix: List[List[int]],
-    rows: int,
-    cols: int,
-    curr_height: int,
-    row: int,
-    col: int,
-    visited_nines: Optional[Set],
-):
-    if not is_in_board(rows, cols, row, col):
-        return 0
-
-    if input_matrix[row][col] != curr_height:
-        return 0
-
-    if curr_height == 9:
+def count_paths_to_top(grid: Grid, position: int, visited_nines: Optional[Set[int]]) -> int:
+    height = grid.cells[position]
+    if height == TOP:
         if isinstance(visited_nines, set):
-            visited_nines.add((row, col))
+            visited_nines.add(position)
         return 1
 
     sol = 0
-    for row_diff, col_diff in DIRECTIONS:
-        sol += count_paths_to_top(
-            input_matrix, rows, cols, curr_height + 1, row + row_diff, col + col_diff, visited_nines
-        )
+    for offset in grid.offsets:
+        if grid.cells[position + offset] == height + 1:
+            sol += count_paths_to_top(grid, position + offset, visited_nines)
     return sol
 
 
-def solve(
-    input_matrix: List[List[int]], expected_part1: Optional[int] = None, expected_part2: Optional[int] = None
-) -> int:
+def get_trailhead_scores(grid: Grid) -> Tuple[int, int]:
+    """
+    Sum of the trailheads' scores (tops reachable, part 1) and ratings (distinct trails, part 2), in one traversal
+    """
     sol1 = 0
     sol2 = 0
-    rows = len(input_matrix)
-    cols = len(input_matrix[0])
-    for row in range(rows):
-        for col in range(cols):
-            visited = set()
-            paths2 = count_paths_to_top(input_matrix, rows, cols, 0, row, col, visited)
-            paths1 = len(visited)
-            sol1 += paths1
-            sol2 += paths2
+    for position in grid.find_all(chr(TRAILHEAD)):
+        visited = set()
+        paths2 = count_paths_to_top(grid, position, visited)
+        paths1 = len(visited)
+        sol1 += paths1
+        sol2 += paths2
+    return (sol1, sol2)
 
+
+def solve(grid: Grid, expected_part1: Optional[int] = None, expected_part2: Optional[int] = None) -> Tuple[int, int]:
+    sol1, sol2 = get_trailhead_scores(grid)
     handle_solution(sol1, expected_part1)
     handle_solution(sol2, expected_part2)
     return (sol1, sol2)
 
 
+def solve_part1(input_path: str, expected_output: Optional[int] = None):
+    sol = get_trailhead_scores(get_parsed_input(input_path))[0]
+    return handle_solution(sol, expected_output)
+
+
+def solve_part2(input_path: str, expected_output: Optional[int] = None):
+    sol = get_trailhead_scores(get_parsed_input(input_path))[1]
+    return handle_solution(sol, expected_output)
+
+
 def day10():
     solve(get_parsed_input(EXAMPLE_PATH), 36, 81)
     solve(get_parsed_input(INPUT_PATH), 552, 1225)
@@ -0,0 +1,10 @@
+import random
+from typing import Iterator
+
+# `size` is the number of stones
+DEFAULT_SIZE = 8
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    yield " ".join(str(rng.randint(0, 10 ** rng.randint(1, 7))) for _ in range(size))
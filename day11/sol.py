@@ -1,6 +1,7 @@
 import os
 from typing import Dict, List, Optional
 
+from cache import cached_parse
 from common import handle_solution, read_input_as_lines
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
@@ -51,6 +52,7 @@ def parse_input(_input: List[str]):
     return [int(n) for n in _input[0].split(" ")]
 
 
+@cached_parse(read_only=True)
 def get_parsed_input(input_path: str):
     _input = read_input_as_lines(input_path)
     return parse_input(_input)
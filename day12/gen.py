@@ -0,0 +1,21 @@
+import random
+import string
+from typing import Iterator
+
+# `size` is the side of the (square) garden
+DEFAULT_SIZE = 140
+REGION_SIZE = 8
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    blocks = size // REGION_SIZE + 1
+    block_letters = [[rng.choice(string.ascii_uppercase) for _ in range(blocks)] for _ in range(blocks)]
+    for row in range(size):
+        line = []
+        for col in range(size):
+            # Jitter the block borders so regions get ragged edges and holes
+            block_row = (row + rng.randint(-1, 1)) // REGION_SIZE
+            block_col = (col + rng.randint(-1, 1)) // REGION_SIZE
+            line.append(block_letters[max(block_row, 0)][max(block_col, 0)])
+        yield "".join(line)
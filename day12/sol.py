@@ -1,9 +1,10 @@
 from collections import defaultdict
 import os
 import re
-from typing import DefaultDict, Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
-from common import DIRECTIONS_RDLU, handle_solution, is_in_board, read_input_as_lines, read_input_as_matrix
+from cache import cached_parse
+from common import Grid, handle_solution, is_in_board, read_input_as_matrix
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
@@ -59,133 +60,81 @@ def get_parsed_input(input_path: str):
     return read_input_as_matrix(input_path)
 
 
-def get_new_perimeter(matrix: List[List[int]], letter: str, row: int, col: int):
-    new_perimeter = 4
-    rows = len(matrix)
-    cols = len(matrix[0])
-    if is_in_board(rows, cols, row, col - 1) and matrix[row][col - 1] == letter:
-        new_perimeter -= 2
-    if is_in_board(rows, cols, row - 1, col) and matrix[row - 1][col] == letter:
-        new_perimeter -= 2
-    return new_perimeter
-
-
-def eat_shape_up(matrix: List[List[int]], letter: str, row: int, col: int, visited: Set[Tuple[int, int]]):
-    if (row, col) in visited:
-        return 0
-    rows = len(matrix)
-    cols = len(matrix[0])
-    if not is_in_board(rows, cols, row, col):
-        return 0
-    if matrix[row][col] != letter:
-        return 0
-    visited.add((row, col))
-    added_perimeters = get_new_perimeter(matrix, letter, row, col)
-    for r, c in DIRECTIONS_RDLU:
-        if is_in_board(rows, cols, row + r, col + c):
-            added_perimeters += eat_shape_up(matrix, letter, row + r, col + c, visited)
-    return added_perimeters
-
-
-def eat_all_shapes_up(matrix: List[List[int]]):
-    sol = 0
-    rows = len(matrix)
-    cols = len(matrix[0])
-    visited = set()
-    for row in range(rows):
-        for col in range(cols):
-            if (row, col) in visited:
+def get_regions(grid: Grid) -> Iterator[List[int]]:
+    """
+    Packed positions of each region (connected cells of the same letter), flood filled one after the other
+    """
+    cells, offsets = grid.cells, grid.offsets
+    visited = bytearray(len(cells))
+    for row in range(grid.rows):
+        for col in range(grid.cols):
+            start = grid.index(row, col)
+            if visited[start]:
                 continue
-            letter = matrix[row][col]
-            old_visited_len = len(visited)
-            perimeter = eat_shape_up(matrix, letter, row, col, visited)
-            area = len(visited) - old_visited_len
-            sol += perimeter * area
-    return sol
-
-
-#############################################
-
-
-def side_counter(blocks: Set[Tuple[int, int]]) -> int:
-    min_row = min([block[0] for block in blocks])
-    max_row = max([block[0] for block in blocks])
-    min_col = min([block[1] for block in blocks])
-    max_col = max([block[1] for block in blocks])
-    cnt = 0
-    for col in range(min_col, max_col + 1):
-        sides_to_right = 0
-        sides_to_left = 0
-        for row in range(min_row, max_row + 1):
-            if (row, col) not in blocks:
-                continue
-            # Block to left doesn't exist
-            if (row, col - 1) not in blocks:
-                # block up doesn't exist - new side!
-                if (row - 1, col) not in blocks:
-                    sides_to_left += 1
-                # block up exists, but it has another block to its left - new side!
-                elif (row - 1, col - 1) in blocks:
-                    sides_to_left += 1
-            # Block to right doesn't exist
-            if (row, col + 1) not in blocks:
-                # block up doesn't exist - new side!
-                if (row - 1, col) not in blocks:
-                    sides_to_right += 1
-                # block up exists, but it has another block to its right - new side!
-                elif (row - 1, col + 1) in blocks:
-                    sides_to_right += 1
-        cnt += sides_to_left + sides_to_right
-
-    return cnt * 2
-
-
-def eat_shape_up_p2(matrix: List[List[int]], letter: str, row: int, col: int, visited: Set[Tuple[int, int]]):
-    if (row, col) in visited:
-        return 0
-    rows = len(matrix)
-    cols = len(matrix[0])
-    if not is_in_board(rows, cols, row, col):
-        return 0
-    if matrix[row][col] != letter:
-        return 0
-    visited.add((row, col))
-    for r, c in DIRECTIONS_RDLU:
-        if is_in_board(rows, cols, row + r, col + c):
-            eat_shape_up_p2(matrix, letter, row + r, col + c, visited)
-
-
-def eat_all_shapes_up_p2(matrix: List[List[int]]):
-    sol = 0
-    rows = len(matrix)
-    cols = len(matrix[0])
-    all_visited = set()
-    shapes_list = []
-    for row in range(rows):
-        for col in range(cols):
-            if (row, col) in all_visited:
-                continue
-            old_all_visited = all_visited.copy()
-            letter = matrix[row][col]
-            eat_shape_up_p2(matrix, letter, row, col, all_visited)
-            new_visited = all_visited.difference(old_all_visited)
-            shapes_list.append(new_visited)
-            sides = side_counter(new_visited)
-            area = len(new_visited)
-            sol += sides * area
-    return sol
+            letter = cells[start]
+            visited[start] = 1
+            region = [start]
+            for position in region:
+                for offset in offsets:
+                    neighbour = position + offset
+                    if not visited[neighbour] and cells[neighbour] == letter:
+                        visited[neighbour] = 1
+                        region.append(neighbour)
+            yield region
+
+
+def get_perimeter(grid: Grid, region: List[int]) -> int:
+    cells, offsets = grid.cells, grid.offsets
+    letter = cells[region[0]]
+    return sum(cells[position + offset] != letter for position in region for offset in offsets)
+
+
+def get_sides(grid: Grid, region: List[int]) -> int:
+    """
+    A polygon has as many sides as corners. Each cell has a corner between every two adjacent directions
+    where both neighbours are outside the region (convex), or both are inside but the diagonal isn't (concave)
+    """
+    cells, offsets = grid.cells, grid.offsets
+    letter = cells[region[0]]
+    corners = 0
+    for position in region:
+        for i in range(4):
+            first, second = offsets[i], offsets[(i + 1) % 4]
+            is_first_in = cells[position + first] == letter
+            is_second_in = cells[position + second] == letter
+            if not is_first_in and not is_second_in:
+                corners += 1
+            elif is_first_in and is_second_in and cells[position + first + second] != letter:
+                corners += 1
+    return corners
+
+
+@cached_parse(read_only=True)
+def get_garden(input_path: str) -> Tuple[Grid, List[List[int]]]:
+    """
+    The garden as a grid, and its regions
+    """
+    # The border never matches a letter, so neighbours need no bounds checks
+    grid = Grid(["".join(line) for line in get_parsed_input(input_path)], border=".")
+    return grid, list(get_regions(grid))
+
+
+def eat_all_shapes_up(grid: Grid, regions: List[List[int]]):
+    return sum(len(region) * get_perimeter(grid, region) for region in regions)
+
+
+def eat_all_shapes_up_p2(grid: Grid, regions: List[List[int]]):
+    return sum(len(region) * get_sides(grid, region) for region in regions)
 
 
 def solve_part1(input_path: str, expected_output: Optional[int] = None):
-    matrix = get_parsed_input(input_path)
-    sol = eat_all_shapes_up(matrix)
+    sol = eat_all_shapes_up(*get_garden(input_path))
 
     handle_solution(sol, expected_output)
 
 
 def solve_part2(input_path: str, expected_output: Optional[int] = None):
-    matrix = get_parsed_input(input_path)
-    sol = eat_all_shapes_up_p2(matrix)
+    sol = eat_all_shapes_up_p2(*get_garden(input_path))
 
     handle_solution(sol, expected_output)
 
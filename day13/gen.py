@@ -0,0 +1,22 @@
+import random
+from typing import Iterator
+
+# `size` is the number of claw machines
+DEFAULT_SIZE = 320
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    for i in range(size):
+        ax, ay = rng.randint(10, 99), rng.randint(10, 99)
+        bx, by = rng.randint(10, 99), rng.randint(10, 99)
+        if rng.random() < 0.5:
+            a, b = rng.randint(0, 100), rng.randint(0, 100)
+            prize = (a * ax + b * bx, a * ay + b * by)
+        else:
+            prize = (rng.randint(1000, 20000), rng.randint(1000, 20000))
+        if i:
+            yield ""
+        yield f"Button A: X+{ax}, Y+{ay}"
+        yield f"Button B: X+{bx}, Y+{by}"
+        yield f"Prize: X={prize[0]}, Y={prize[1]}"
@@ -2,7 +2,8 @@ import math
 import os
 import re
 from typing import List, Optional, Tuple
-import numpy as np
+
+from cache import cached_parse
 from common import handle_solution, read_input_as_lines
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
@@ -25,6 +26,7 @@ def parse_input(_input: List[str]):
     return A_buttons, B_buttons, targets
 
 
+@cached_parse(read_only=True)
 def get_parsed_input(input_path: str):
     _input = read_input_as_lines(input_path)
     return parse_input(_input)
@@ -37,6 +39,8 @@ def is_linear_dependent(vec1: Tuple[int, int], vec2: Tuple[int, int]) -> bool:
 
 
 def solve_linear_equations_system(vec1: Tuple[int, int], vec2: Tuple[int, int], target: Tuple[int, int]):
+    import numpy as np
+
     matrix = [[vec1[0], vec2[0]], [vec1[1], vec2[1]]]
     result = np.linalg.solve(matrix, target)
     return result
@@ -0,0 +1,14 @@
+import random
+from typing import Iterator
+
+# `size` is the number of robots
+DEFAULT_SIZE = 500
+ROWS, COLS = 101, 103
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    for _ in range(size):
+        px, py = rng.randrange(ROWS), rng.randrange(COLS)
+        vx, vy = rng.randint(-99, 99), rng.randint(-99, 99)
+        yield f"p={px},{py} v={vx},{vy}"
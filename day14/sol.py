@@ -6,6 +6,7 @@ import re
 from time import sleep
 from typing import DefaultDict, List, Optional, Set, Tuple, Dict
 
+from cache import cached_parse
 from common import (
     DIRECTIONS_RDLU,
     add_2d_vectors,
@@ -112,6 +113,7 @@ def parse_input(_input: List[str]) -> Tuple[List[Tuple[int, int]], List[Tuple[in
     return positions, velocities
 
 
+@cached_parse(read_only=True)
 def get_parsed_input(input_path: str):
     _input = read_input_as_lines(input_path)
     return parse_input(_input)
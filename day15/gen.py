@@ -0,0 +1,29 @@
+import random
+from typing import Iterator
+
+# `size` is the side of the (square) warehouse, and there are `size * 20` moves
+DEFAULT_SIZE = 50
+WALL_DENSITY = 0.05
+BOX_DENSITY = 0.3
+MOVES_PER_LINE = 1000
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    board = [["#"] * size]
+    for _ in range(size - 2):
+        line = ["#"]
+        for _ in range(size - 2):
+            cell = rng.random()
+            line.append("#" if cell < WALL_DENSITY else "O" if cell < WALL_DENSITY + BOX_DENSITY else ".")
+        board.append(line + ["#"])
+    board.append(["#"] * size)
+    board[rng.randrange(1, size - 1)][rng.randrange(1, size - 1)] = "@"
+    for line in board:
+        yield "".join(line)
+    yield ""
+
+    moves = size * 20
+    while moves > 0:
+        yield "".join(rng.choice("<>^v") for _ in range(min(moves, MOVES_PER_LINE)))
+        moves -= MOVES_PER_LINE
@@ -1,6 +1,7 @@
 import os
 from typing import List, Optional, Set, Tuple
 
+from cache import cached_parse
 from common import DIRECTIONS_RDLU, handle_solution, read_input_as_lines
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
@@ -18,6 +19,7 @@ def print_board(matrix):
         print()
 
 
+@cached_parse
 def parse_input(input_path: str) -> Tuple[List[List[str]], List[int], int, int]:
     convert_direction_to_index = {">": 0, "v": 1, "<": 2, "^": 3}
     lines = read_input_as_lines(input_path)
@@ -47,6 +49,7 @@ def find_last_block_in_line(matrix: List[List[str]], bot_location: Tuple[int, in
     return (row, col)
 
 
+@cached_parse
 def parse_input_p2(input_path: str) -> Tuple[List[List[str]], List[int], int, int]:
     convert_direction_to_index = {">": 0, "v": 1, "<": 2, "^": 3}
     lines = read_input_as_lines(input_path)
@@ -0,0 +1,41 @@
+import random
+from typing import Iterator
+
+# `size` is the side of the (square) maze, rounded up to an odd number
+DEFAULT_SIZE = 141
+# Walls knocked down after carving, so there are several best paths
+LOOP_DENSITY = 0.05
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    size = max(size, 5) | 1
+    maze = [["#"] * size for _ in range(size)]
+    # Carve a perfect maze over the odd cells with an iterative DFS
+    start = (size - 2, 1)
+    maze[start[0]][start[1]] = "."
+    stack = [start]
+    while stack:
+        row, col = stack[-1]
+        options = [
+            (row + dr, col + dc)
+            for dr, dc in ((0, 2), (2, 0), (0, -2), (-2, 0))
+            if 0 < row + dr < size - 1 and 0 < col + dc < size - 1 and maze[row + dr][col + dc] == "#"
+        ]
+        if not options:
+            stack.pop()
+            continue
+        next_row, next_col = rng.choice(options)
+        maze[(row + next_row) // 2][(col + next_col) // 2] = "."
+        maze[next_row][next_col] = "."
+        stack.append((next_row, next_col))
+
+    for _ in range(int(size * size * LOOP_DENSITY)):
+        row, col = rng.randrange(1, size - 1), rng.randrange(1, size - 1)
+        if (row % 2) != (col % 2):
+            maze[row][col] = "."
+
+    maze[size - 2][1] = "S"
+    maze[1][size - 2] = "E"
+    for line in maze:
+        yield "".join(line)
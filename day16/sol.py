@@ -1,9 +1,9 @@
-from math import inf
 import os
-from typing import List, Optional, Tuple
+from typing import Iterator, Optional, Tuple
 
-from common import DIRECTIONS_RDLU, handle_solution, is_in_board, read_input_as_lines, read_input_as_matrix
-import networkx as nx
+from cache import cached_parse
+from common import DIRECTIONS_RDLU, Grid, handle_solution, read_input_as_grid
+from search import UNREACHED, WeightedNeighbours, dijkstra
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
@@ -11,103 +11,73 @@ EXAMPLE1_PATH = dir_path + os.sep + "example1.txt"
 EXAMPLE2_PATH = dir_path + os.sep + "example2.txt"
 INPUT_PATH = dir_path + os.sep + "input.txt"
 
+# The reindeer starts facing east, i.e. DIRECTIONS_RDLU[0]
+START_DIRECTION = 0
+TURN_COST = 1000
 
-def is_cell_habbitable(matrix: List[List[str]], row, col):
-    rows = len(matrix)
-    cols = len(matrix[0])
-    if not is_in_board(rows, cols, row, col):
-        return False
-    return matrix[row][col] != "#"
-
-
-def get_start_and_end(matrix: List[List[str]]):
-    start = None
-    end = None
-    rows = len(matrix)
-    cols = len(matrix[0])
-    for row in range(rows):
-        for col in range(cols):
-            if matrix[row][col] == "S":
-                start = (row, col)
-            if matrix[row][col] == "E":
-                end = (row, col)
-            if start and end:
-                return start, end
-    raise ValueError("Bad matrix!")
-
-
-def construct_graph_from_board(matrix: List[List[str]]) -> nx.Graph:
-    G = nx.Graph()
-    rows = len(matrix)
-    cols = len(matrix[0])
-    for row in range(rows):
-        for col in range(cols):
-            for dir in DIRECTIONS_RDLU:
-                G.add_node((row, col, dir))
-
-    edges = []
-    for row in range(rows):
-        for col in range(cols):
-            if not is_cell_habbitable(matrix, row, col):
-                continue
-            for dir_dst in DIRECTIONS_RDLU:
-                dst_dr, dst_dc = dir_dst
-                if not is_cell_habbitable(matrix, row + dst_dr, col + dst_dc):
-                    continue
-                for dir_src in DIRECTIONS_RDLU:
-                    if dir_src[0] + dir_dst[0] == 0 and dir_src[1] + dir_dst[1] == 0:
-                        continue
-                    weight = 1 + 1000 * int(dir_src != dir_dst)
-                    src = (row, col, dir_src)
-                    dst = (row + dst_dr, col + dst_dc, dir_dst)
-                    edges.append((src, dst, weight))
-    G.add_weighted_edges_from(edges)
-    return G
-
-
-def get_path_weight(path: List[Tuple[int, int, Tuple[int, int]]]):
-    weight = 0
-    for i in range(1, len(path)):
-        src_dir = path[i - 1][2]
-        dst_dir = path[i][2]
-        weight += 1 + (1000 * int(src_dir != dst_dir))
+
+# A state is a cell and a direction, packed as `index * 4 + direction` (index into DIRECTIONS_RDLU)
+def get_state(index: int, direction: int) -> int:
+    return index * len(DIRECTIONS_RDLU) + direction
+
+
+def get_moves(grid: Grid, reverse: bool = False) -> WeightedNeighbours:
+    """
+    Step forward for 1, or turn 90 degrees for TURN_COST.
+    With `reverse`, yields the states leading to `state` instead of the states it leads to
+    """
+    cells, offsets, wall = grid.cells, grid.offsets, ord("#")
+    sign = -1 if reverse else 1
+
+    def moves(state: int) -> Iterator[Tuple[int, int]]:
+        index, direction = divmod(state, len(DIRECTIONS_RDLU))
+        ahead = index + sign * offsets[direction]
+        if cells[ahead] != wall:
+            yield get_state(ahead, direction), 1
+        for turn in (1, 3):
+            yield get_state(index, (direction + turn) % len(DIRECTIONS_RDLU)), TURN_COST
+
+    return moves
+
+
+@cached_parse(read_only=True)
+def get_parsed_input(input_path: str) -> Tuple[Grid, int, int]:
+    grid = read_input_as_grid(input_path, border="#")
+    return grid, grid.find("S"), grid.find("E")
+
+
+def get_distances_from_start(grid: Grid, start: int):
+    return dijkstra(len(grid.cells) * len(DIRECTIONS_RDLU), [get_state(start, START_DIRECTION)], get_moves(grid))
+
+
+def get_shortest_path_weight(distances, end: int) -> int:
+    weight = min(distances[get_state(end, direction)] for direction in range(len(DIRECTIONS_RDLU)))
+    if weight == UNREACHED:
+        raise ValueError("No path to the end")
     return weight
 
 
 def solve_part1(input_path: str, expected_output: Optional[int] = None):
-    sol = 0
-    matrix = read_input_as_matrix(input_path)
-    s, e = get_start_and_end(matrix)
-    sr, sc = s
-    er, ec = e
-    start = (sr, sc, DIRECTIONS_RDLU[0])
-    shortest = inf
-    G = construct_graph_from_board(matrix)
-    for end in [(er, ec, direction) for direction in DIRECTIONS_RDLU]:
-        p = nx.shortest_path(G, start, end, "weight")
-        path_weight = get_path_weight(p)
-        shortest = min(shortest, path_weight)
-    sol = shortest
+    grid, start, end = get_parsed_input(input_path)
+    sol = get_shortest_path_weight(get_distances_from_start(grid, start), end)
     return handle_solution(sol, expected_output)
 
 
 def solve_part2(input_path: str, expected_output: Optional[int] = None):
-    sol = 0
-    matrix = read_input_as_matrix(input_path)
-    s, e = get_start_and_end(matrix)
-    sr, sc = s
-    er, ec = e
-    start = (sr, sc, DIRECTIONS_RDLU[0])
+    grid, start, end = get_parsed_input(input_path)
+    num_states = len(grid.cells) * len(DIRECTIONS_RDLU)
+    from_start = get_distances_from_start(grid, start)
+    shortest_path_weight = get_shortest_path_weight(from_start, end)
+    # Distances to the end, ignoring which way the reindeer faces when it gets there
+    to_end = dijkstra(
+        num_states, [get_state(end, direction) for direction in range(len(DIRECTIONS_RDLU))], get_moves(grid, True)
+    )
+
+    # A state is on some best path exactly when the best paths through it weigh the shortest path's weight
     best_locations = set()
-    shortest_path_weight = solve_part1(input_path)
-    G = construct_graph_from_board(matrix)
-    for end in [(er, ec, direction) for direction in DIRECTIONS_RDLU]:
-        all_paths = nx.all_shortest_paths(G, source=start, target=end, weight="weight")
-        for path in all_paths:
-            if get_path_weight(path) != shortest_path_weight:
-                continue
-            nodes_on_path = [(node[0], node[1]) for node in path]
-            best_locations = best_locations.union(set(nodes_on_path))
+    for state in range(num_states):
+        if from_start[state] != UNREACHED and from_start[state] + to_end[state] == shortest_path_weight:
+            best_locations.add(state // len(DIRECTIONS_RDLU))
 
     sol = len(best_locations)
     handle_solution(sol, expected_output)
@@ -0,0 +1,37 @@
+import random
+from typing import Iterator, List
+
+# `size` is the number of octal digits of register A, i.e. roughly the length of the output.
+# The program has the same shape as the real ones (a quine candidate for part 2), with random constants
+DEFAULT_SIZE = 16
+
+
+def get_output(a: int, xor1: int, xor2: int) -> int:
+    # One iteration of the program below: bst A, bxl xor1, cdv B, bxl xor2, adv 3, bxc, out B
+    b = (a % 8) ^ xor1
+    return (b ^ xor2 ^ (a >> b)) % 8
+
+
+def has_quine(program: List[int], xor1: int, xor2: int) -> bool:
+    # Same digit-by-digit search as part 2, so the generated inputs always have an answer
+    candidates = {0}
+    for expected in reversed(program):
+        candidates = {a * 8 + d for a in candidates for d in range(8) if get_output(a * 8 + d, xor1, xor2) == expected}
+        candidates.discard(0)
+    return bool(candidates)
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    register_a = rng.randrange(8 ** (size - 1), 8**size)
+    constants = [(xor1, xor2) for xor1 in range(1, 8) for xor2 in range(1, 8)]
+    rng.shuffle(constants)
+    for xor1, xor2 in constants:
+        program = [2, 4, 1, xor1, 7, 5, 1, xor2, 0, 3, 4, 5, 5, 5, 3, 0]
+        if has_quine(program, xor1, xor2):
+            break
+    yield f"Register A: {register_a}"
+    yield "Register B: 0"
+    yield "Register C: 0"
+    yield ""
+    yield "Program: " + ",".join(str(n) for n in program)
@@ -2,6 +2,7 @@ from operator import xor
 import os
 from typing import List, Optional
 
+from cache import cached_parse
 from common import handle_solution, read_input_as_lines
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
@@ -24,6 +25,7 @@ def parse_input(_input: List[str]):
 
 
 
+@cached_parse
 def get_parsed_input(input_path: str):
     lines = read_input_as_lines(input_path)
     return parse_input(lines)
@@ -100,12 +102,14 @@ def cdv(tape: List[int], registers: List[int], ip: int, out_tape: Optional[List[
         print(f"cdv called, registers = {registers}")
     return ret
 
+# Opcode dispatch table of the VM, built once per process
+OPERATORS = [adv, bxl, bst, jnz, bxc, out, bdv, cdv]
+
 def run_machine(tape: List[int], registers: List[int]):
-    operators = [adv, bxl, bst, jnz, bxc, out, bdv, cdv]
     ip = 0
     out_tape = []
     while ip < len(tape):
-        operator = operators[tape[ip]]
+        operator = OPERATORS[tape[ip]]
         ip = operator(tape, registers, ip, out_tape)
         if DEBUG and ip < len(tape) and tape[ip] == 3:
             print(f"tape: {tape}")
@@ -122,11 +126,10 @@ def solve_part1(input_path: str, expected_output: Optional[int] = None):
     handle_solution(sol, expected_output)
 
 def run_machine_iteration(tape: List[int], registers: List[int]):
-    operators = [adv, bxl, bst, jnz, bxc, out, bdv, cdv]
     ip = 0
     out_tape = []
     while ip < len(tape) and tape[ip] != 3:
-        operator = operators[tape[ip]]
+        operator = OPERATORS[tape[ip]]
         ip = operator(tape, registers, ip, out_tape)
     assert len(out_tape) == 1
     return out_tape[0]
@@ -0,0 +1,21 @@
+import random
+from typing import Dict, Iterator
+
+# `size` is the side of the memory space. Part 2 starts looking after 1024 bytes, so `size` should be at least 33
+DEFAULT_SIZE = 71
+MIN_SIZE = 33
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    cells = [(x, y) for x in range(size) for y in range(size) if (x, y) not in ((0, 0), (size - 1, size - 1))]
+    rng.shuffle(cells)
+    for x, y in cells:
+        yield f"{x},{y}"
+
+
+def get_solve_kwargs(size: int, part: int) -> Dict:
+    if part == 1:
+        # Few enough corrupted bytes that a path surely still exists
+        return {"board_size": size, "k": size * size // 10}
+    return {"board_size": size}
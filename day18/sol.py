@@ -1,10 +1,9 @@
 import os
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from networkx import NetworkXNoPath
-
-from common import DIRECTIONS_RDLU, handle_solution, is_in_board, read_input_as_lines, read_input_as_matrix
-import networkx as nx
+from cache import cached_parse
+from common import Grid, handle_solution, iter_input_lines
+from search import UNREACHED, grid_bfs
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
@@ -15,115 +14,61 @@ EXAMPLE_BOARD_SIZE = 7
 INPUT_BOARD_SIZE = 71
 
 
-def print_board(matrix):
-    for line in matrix:
-        for c in line:
-            print(c, end="")
-        print()
+@cached_parse(read_only=True)
+def get_blocks(input_path: str) -> List[Tuple[int, int]]:
+    blocks = []
+    for line in iter_input_lines(input_path):
+        x, y = [int(n) for n in line.split(",")]
+        blocks.append((x, y))
+    return blocks
+
 
+def get_board_after_first_k_blocks(blocks: List[Tuple[int, int]], board_size: int, k: int) -> Grid:
+    grid = Grid(["." * board_size] * board_size, border="#")
+    for x, y in blocks[:k]:
+        grid.set(y, x, "#")
+    return grid
 
-def get_board_after_first_k_blocks(input_path: str, board_size: int, k: int):
-    lines = read_input_as_lines(input_path)
-    board = [["." for i in range(board_size)] for i in range(board_size)]
-    for i in range(k):
-        line = lines[i]
-        x, y = [int(n) for n in line.split(",")]
-        board[y][x] = "#"
-    return board
-
-
-def is_cell_habbitable(matrix: List[List[str]], row, col):
-    rows = len(matrix)
-    cols = len(matrix[0])
-    if not is_in_board(rows, cols, row, col):
-        return False
-    return matrix[row][col] != "#"
-
-
-def construct_graph_from_board(matrix: List[List[str]]) -> nx.Graph:
-    G = nx.Graph()
-    rows = len(matrix)
-    cols = len(matrix[0])
-    for row in range(rows):
-        for col in range(cols):
-            G.add_node((row, col))
-
-    for row in range(rows):
-        for col in range(cols):
-            if not is_cell_habbitable(matrix, row, col):
-                continue
-            for dir_dst in DIRECTIONS_RDLU:
-                dst_dr, dst_dc = dir_dst
-                if not is_cell_habbitable(matrix, row + dst_dr, col + dst_dc):
-                    continue
-                src = (row, col)
-                dst = (row + dst_dr, col + dst_dc)
-                # edges.append((src, dst))
-                G.add_edge(src, dst)
-    # G.add
-    return G
+
+def get_exit_distance(grid: Grid, board_size: int) -> int:
+    """
+    Steps from the top left corner to the exit in the bottom right one, or `UNREACHED`
+    """
+    distances = grid_bfs(grid, [grid.index(0, 0)])
+    return distances[grid.index(board_size - 1, board_size - 1)]
+
+
+def get_shortest_path_length(grid: Grid, board_size: int) -> int:
+    length = get_exit_distance(grid, board_size)
+    if length == UNREACHED:
+        raise ValueError("No path to the exit")
+    return length
 
 
 def solve_part1(input_path: str, board_size: int, k: int = 1024, expected_output: Optional[int] = None):
-    matrix = get_board_after_first_k_blocks(input_path, board_size, k)
-    # print_board(matrix)
-    G = construct_graph_from_board(matrix)
-    start = (0, 0)
-    end = (board_size - 1, board_size - 1)
-    shortest_path_length = nx.shortest_path_length(G, start, end)
-    sol = shortest_path_length
+    grid = get_board_after_first_k_blocks(get_blocks(input_path), board_size, k)
+    sol = get_shortest_path_length(grid, board_size)
     return handle_solution(sol, expected_output)
 
 
-# ---------------------------------------------------------------
-# An attempt to do it more efficiently started below (binary search k values),
-# but iterating over all k values was enough (ran this while coding)
-# Graph construction can also be improved by adding one edge at a time,
-# instead of constructing the whole graph again
-# ---------------------------------------------------------------
 def solve_part2(input_path: str, board_size: int, expected_output: Optional[int] = None):
-    lines = read_input_as_lines(input_path)
+    blocks = get_blocks(input_path)
+    # Once blocked, the exit stays blocked: binary search for the first k blocks cutting it off.
+    # `max_k` past the last block stands for the exit never being cut off, so all the blocks get tested
     min_k = 0 if board_size == EXAMPLE_BOARD_SIZE else 1024
-    max_k = len(lines)
-    for k in range(min_k, max_k):
-        print(f"Trying k = {k}...", end="")
-        matrix = get_board_after_first_k_blocks(input_path, board_size, k)
-        # print_board(matrix)
-        G = construct_graph_from_board(matrix)
-        start = (0, 0)
-        end = (board_size - 1, board_size - 1)
-        try:
-            shortest_path_length = nx.shortest_path_length(G, start, end)
-            print("[OK]")
-        except NetworkXNoPath as e:
-            print("[FAILED]")
-            sol = lines[k - 1]
-            return handle_solution(sol, expected_output)
-    raise ValueError("No solution")
-
-
-# def solve_part2(input_path: str, board_size: int, expected_output: Optional[int] = None):
-#     min_k = 0
-#     max_k = len(read_input_as_lines(input_path))
-#     prev_min_k = min_k
-#     prev_max_k = max_k
-#     while min_k <= max_k:
-#         k = (min_k + max_k) // 2
-#         print(f"Trying k = {k}...", end="")
-#         matrix = get_board_after_first_k_blocks(input_path, board_size, k)
-#         # print_board(matrix)
-#         G = construct_graph_from_board(matrix)
-#         start = (0, 0)
-#         end = (board_size - 1, board_size - 1)
-#         try:
-#             shortest_path_length = nx.shortest_path_length(G, start, end)
-#             print("[OK]")
-#             min_k = k + 1
-#         except NetworkXNoPath as e:
-#             print("[FAILED]")
-#             sol = k
-#             return handle_solution(sol, expected_output)
-#     raise ValueError("No solution")
+    max_k = len(blocks) + 1
+    while min_k < max_k:
+        k = (min_k + max_k) // 2
+        grid = get_board_after_first_k_blocks(blocks, board_size, k)
+        if get_exit_distance(grid, board_size) == UNREACHED:
+            max_k = k
+        else:
+            min_k = k + 1
+    if min_k > len(blocks):
+        raise ValueError("No solution")
+    x, y = blocks[min_k - 1]
+    sol = f"{x},{y}"
+    return handle_solution(sol, expected_output)
 
 
 def day18():
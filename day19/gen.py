@@ -0,0 +1,21 @@
+import random
+from typing import Iterator
+
+# `size` is the number of designs
+DEFAULT_SIZE = 400
+PATTERNS = 450
+COLORS = "wubrg"
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    patterns = set()
+    while len(patterns) < PATTERNS:
+        pattern = "".join(rng.choice(COLORS) for _ in range(rng.randint(1, 8)))
+        # Without a plain "g" towel, not every design is possible
+        if pattern != "g":
+            patterns.add(pattern)
+    yield ", ".join(sorted(patterns))
+    yield ""
+    for _ in range(size):
+        yield "".join(rng.choice(COLORS) for _ in range(rng.randint(20, 60)))
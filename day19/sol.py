@@ -2,6 +2,7 @@ import functools
 import os
 from typing import List, Optional, Tuple
 
+from cache import cached_parse
 from common import handle_solution, read_input_as_lines
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
@@ -16,6 +17,7 @@ def parse_input(_input: List[str]) -> Tuple[Tuple[str], List[str]]:
     return tuple(available_patterns), desired_patterns
 
 
+@cached_parse(read_only=True)
 def get_parsed_input(input_path: str) -> Tuple[Tuple[str], List[str]]:
     _input = read_input_as_lines(input_path)
     return parse_input(_input)
@@ -0,0 +1,29 @@
+import random
+from typing import Iterator
+
+# `size` is the side of the (square) map, rounded up to an odd number.
+# The racetrack is a single path snaking between walls, row after row
+DEFAULT_SIZE = 141
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    size = max(size, 7) | 1
+    grid = [["#"] * size for _ in range(size)]
+    track_rows = range(1, size - 1, 2)
+    col = rng.randint(1, size // 2)
+    start = (track_rows[0], col)
+    going_right = True
+    for row in track_rows:
+        end = rng.randint(max(col, size // 2), size - 2) if going_right else rng.randint(1, min(col, size // 2))
+        for c in range(min(col, end), max(col, end) + 1):
+            grid[row][c] = "."
+        if row != track_rows[-1]:
+            grid[row + 1][end] = "."
+        col = end
+        going_right = not going_right
+
+    grid[start[0]][start[1]] = "S"
+    grid[track_rows[-1]][col] = "E"
+    for line in grid:
+        yield "".join(line)
@@ -1,153 +1,52 @@
 import os
-import re
-from typing import Dict, List, Optional, Set, Tuple
-import networkx as nx
+from typing import List, Optional, Tuple
 
-from common import DIRECTIONS_RDLU, handle_solution, is_in_board, read_input_as_lines, read_input_as_matrix
+from cache import cached_parse
+from common import Grid, handle_solution, read_input_as_grid
+from search import UNREACHED, grid_bfs
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
 EXAMPLE_PATH = dir_path + os.sep + "example.txt"
 INPUT_PATH = dir_path + os.sep + "input.txt"
 
-DEBUG = False
 
+@cached_parse(read_only=True)
+def get_parsed_input(input_path: str) -> Tuple[Grid, int, int]:
+    grid = read_input_as_grid(input_path)
+    return grid, grid.find("S"), grid.find("E")
 
-def is_cell_habbitable(matrix: List[List[str]], row, col):
-    rows = len(matrix)
-    cols = len(matrix[0])
-    if not is_in_board(rows, cols, row, col):
-        return False
-    return matrix[row][col] != "#"
 
-
-def add_valid_edges(G: nx.DiGraph, matrix: List[List[str]]):
-    rows = len(matrix)
-    cols = len(matrix[0])
-    edges = []
-    for row in range(rows):
-        for col in range(cols):
-            if not is_cell_habbitable(matrix, row, col):
-                continue
-
-            for dr, dc in DIRECTIONS_RDLU:
-                if is_cell_habbitable(matrix, row + dr, col + dc):
-                    src, dst = (row, col), (row + dr, col + dc)
-                    edges.append((src, dst))
-
-    G.add_edges_from(edges)
-
-
-def get_possible_dsts(start: Tuple[int, int], matrix: List[List[str]], steps: int) -> Set[Tuple[int, int]]:
-    dsts = set()
-    curr = set()
-    curr.add(start)
-
-    row, col = start
-
-    for dr in range(-steps, steps + 1):
-        for dc in range(-steps, steps + 1):
-            if abs(dr) + abs(dc) > steps:
-                continue
-            if not is_cell_habbitable(matrix, row + dr, col + dc):
-                continue
-            dst = row + dr, col + dc
-            dsts.add(dst)
-
-    dsts.remove(start)
-    return dsts
-
-
-def get_cheating_edges(matrix: List[List[str]], max_cheats: int) -> List[Tuple[int, int, int]]:
-    rows = len(matrix)
-    cols = len(matrix[0])
-    edges = []
-    for row in range(rows):
-        for col in range(cols):
-            if not is_cell_habbitable(matrix, row, col):
-                continue
-
-            src = (row, col)
-            possible_cheating_dst = get_possible_dsts(src, matrix, max_cheats)
-            for dst in possible_cheating_dst:
-                man_dist = abs(src[0] - dst[0]) + abs(src[1] - dst[1])
-                edges.append((src, dst, man_dist))
-    if DEBUG:
-        print(len(edges))
-    return edges
-
-
-def add_cheating_edges(G: nx.DiGraph, matrix: List[List[str]], max_cheats: int):
-    if max_cheats == 0:
-        return
-    edges = get_cheating_edges(matrix, max_cheats)
-    G.add_weighted_edges_from(edges)
-
-
-def construct_graph_from_board(matrix: List[List[str]]) -> nx.DiGraph:
-    G = nx.DiGraph()
-    rows = len(matrix)
-    cols = len(matrix[0])
-    for row in range(rows):
-        for col in range(cols):
-            G.add_node((row, col))
-
-    add_valid_edges(G, matrix)
-    return G
-
-
-def get_start_and_end(matrix: List[List[str]]):
-    start = None
-    end = None
-    rows = len(matrix)
-    cols = len(matrix[0])
-    for row in range(rows):
-        for col in range(cols):
-            if matrix[row][col] == "S":
-                start = (row, col)
-            if matrix[row][col] == "E":
-                end = (row, col)
-            if start and end:
-                return start, end
-    raise ValueError("Bad matrix!")
-
-
-def get_parsed_input(input_path: str):
-    matrix = read_input_as_matrix(input_path)
-    start, end = get_start_and_end(matrix)
-    return construct_graph_from_board(matrix), start, end
-
-
-def find_cheating_edge_from_path(
-    path: List[Tuple[int, int, bool]]
-) -> Tuple[Tuple[int, int, bool], Tuple[int, int, bool]]:
-    for i in range(1, len(path)):
-        src = path[i - 1]
-        dst = path[i]
-        if src[2] != dst[2]:
-            return (src, dst)
+def get_cheat_offsets(max_cheats: int) -> List[Tuple[int, int, int]]:
+    # Every (dr, dc) a cheat of at most `max_cheats` steps can jump by, with its length
+    offsets = []
+    for dr in range(-max_cheats, max_cheats + 1):
+        for dc in range(-max_cheats, max_cheats + 1):
+            if 0 < abs(dr) + abs(dc) <= max_cheats:
+                offsets.append((dr, dc, abs(dr) + abs(dc)))
+    return offsets
 
 
 def solve_part1(input_path: str, expected_output: Optional[int] = None, max_cheats: int = 2, min_discount: int = 100):
     sol = 0
-    matrix = read_input_as_matrix(input_path)
-    cheatless_G, start, end = get_parsed_input(input_path)
-    if DEBUG:
-        print(cheatless_G)
-    shortest_paths_to_end = nx.shortest_path_length(cheatless_G, target=end)
-    shortest_paths_from_start = nx.shortest_path_length(cheatless_G, source=start)
-    shortest_path_length = nx.shortest_path_length(cheatless_G, start, end)
-
-    cheating_edges = get_cheating_edges(matrix, max_cheats)
-    progress_indicator = 0
-    for i, edge in enumerate(cheating_edges):
-        if DEBUG and i // 100 != progress_indicator:
-            progress_indicator += 1
-            print(f"{i} / {len(cheating_edges)}")
-        edge_src = edge[0]
-        edge_dst = edge[1]
-        weight = shortest_paths_from_start[edge_src] + edge[2] + shortest_paths_to_end[edge_dst]
-        sol += int(shortest_path_length - weight >= min_discount)
+    grid, start, end = get_parsed_input(input_path)
+    from_start = grid_bfs(grid, [start])
+    to_end = grid_bfs(grid, [end])
+    if from_start[end] == UNREACHED:
+        raise ValueError("No path to the end")
+    max_weight = from_start[end] - min_discount
+
+    # A cheat from `src` to `dst` gives a path of from_start[src] + cheat length + to_end[dst]
+    offsets = get_cheat_offsets(max_cheats)
+    for src, src_weight in enumerate(from_start):
+        if src_weight == UNREACHED:
+            continue
+        row, col = grid.position(src)
+        for dr, dc, cheat_length in offsets:
+            if not (0 <= row + dr < grid.rows and 0 <= col + dc < grid.cols):
+                continue
+            dst_weight = to_end[grid.index(row + dr, col + dc)]
+            sol += int(dst_weight != UNREACHED and src_weight + cheat_length + dst_weight <= max_weight)
 
     handle_solution(sol, expected_output)
 
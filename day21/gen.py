@@ -0,0 +1,11 @@
+import random
+from typing import Iterator
+
+# `size` is the number of door codes
+DEFAULT_SIZE = 5
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    for _ in range(size):
+        yield "".join(rng.choice("0123456789") for _ in range(3)) + "A"
@@ -19,9 +19,11 @@
 
 
 from collections import Counter
+from functools import cache
 import os
 from typing import Dict, Optional, Tuple
 
+from cache import cached_parse
 from common import handle_solution, read_input_as_lines
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
@@ -35,6 +37,7 @@ NUMPAD_POSITIONS = {c: (i // 3, i % 3) for i, c in enumerate("789456123 0A")}
 DIRECTIONS_POSITIONS = {c: (i // 3, i % 3) for i, c in enumerate(" ^A<v>")}
 
 
+@cached_parse(read_only=True)
 def get_parsed_input(input_path: str):
     lines = read_input_as_lines(input_path)
     return lines
@@ -58,6 +61,15 @@ def get_steps_counter(chars_to_positions: Dict[Tuple[int, int], str], code: str,
     return steps_to_perform_action
 
 
+@cache
+def get_directions_steps_counter(path: str) -> Counter:
+    """
+    Actions a directional keypad path takes, once. Only a handful of distinct paths exist,
+    so the table fills up on the first code and is shared by every code and input after it
+    """
+    return get_steps_counter(DIRECTIONS_POSITIONS, path)
+
+
 def get_code_complexity(code: str, repeats: int = 2):
     sol = get_steps_counter(NUMPAD_POSITIONS, code)
     # sol contains the `abstract` actions performed, and how many times
@@ -84,8 +96,8 @@ def get_code_complexity(code: str, repeats: int = 2):
                 print(f" >> Final path:       {path}")
             steps_to_add = sol[(dx, dy, has_passed_next_to_forbidden_cell)]
 
-            next_counter = get_steps_counter(DIRECTIONS_POSITIONS, path, steps_to_add)
-            next_sol += next_counter
+            for step, count in get_directions_steps_counter(path).items():
+                next_sol[step] += count * steps_to_add
             if DEBUG:
                 print(f" >> Updated counter:  {next_sol}")
                 print("----------------")
@@ -0,0 +1,11 @@
+import random
+from typing import Iterator
+
+# `size` is the number of buyers
+DEFAULT_SIZE = 2000
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    for _ in range(size):
+        yield str(rng.randrange(1, 2**24))
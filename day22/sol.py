@@ -5,7 +5,8 @@ import os
 from typing import List, Optional
 
 
-from common import handle_solution, read_input_as_lines
+from cache import cached_parse
+from common import handle_solution, iter_input_lines
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
@@ -22,9 +23,9 @@ def mix(secret: int, result: int) -> int:
 def prune(secret: int) -> int:
     return secret % 16777216 # pow(2, 24)
 
+@cached_parse(read_only=True)
 def get_parsed_input(input_path: str) -> List[int]:
-    lines = read_input_as_lines(input_path)
-    return [int(n) for n in lines]
+    return [int(n) for n in iter_input_lines(input_path)]
 
 def get_next_pseudurandom(secret: int) -> int:
     step1 = secret * 64 # pow(2, 6)
@@ -0,0 +1,35 @@
+import math
+import random
+import string
+from typing import Iterator
+
+# `size` is the number of computers
+DEFAULT_SIZE = 520
+DEGREE = 13
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    # Two letters like the real input, longer names once those run out
+    name_length = max(2, math.ceil(math.log(size, 26)) if size > 1 else 2)
+    names = set()
+    while len(names) < size:
+        names.add("".join(rng.choice(string.ascii_lowercase) for _ in range(name_length)))
+    names = sorted(names)
+    rng.shuffle(names)
+
+    edges = set()
+    # One planted LAN party, hidden among random connections
+    clique = names[: DEGREE + 1]
+    for i, n1 in enumerate(clique):
+        for n2 in clique[i + 1 :]:
+            edges.add((n1, n2))
+    while len(edges) < size * DEGREE // 2:
+        n1, n2 = rng.sample(names, 2)
+        if (n2, n1) not in edges:
+            edges.add((n1, n2))
+
+    edges = list(edges)
+    rng.shuffle(edges)
+    for n1, n2 in edges:
+        yield f"{n1}-{n2}"
@@ -1,20 +1,19 @@
 from collections import defaultdict
-import functools
 import os
-from typing import Optional, Tuple
-
+from typing import DefaultDict, Dict, Optional, Set, Tuple
 
+from cache import cached_parse
 from common import handle_solution, read_input_as_lines
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
 EXAMPLE_PATH = dir_path + os.sep + "example.txt"
 INPUT_PATH = dir_path + os.sep + "input.txt"
-ACTIVE_PATH = INPUT_PATH
 
 DEBUG = True
 
 
+@cached_parse(read_only=True)
 def get_parsed_input(input_path: str):
     lines = read_input_as_lines(input_path)
     graph = defaultdict(lambda: (set(), set()))
@@ -32,13 +31,11 @@ def get_parsed_input(input_path: str):
         if n1.startswith("t"):
             graph[n2][1].add(n1)
 
-    return graph, edges
-
+    # A plain dict, as the default factory can't be pickled. Only nodes of the edges are looked up
+    return dict(graph), edges
 
-graph, edges = get_parsed_input(ACTIVE_PATH)
 
-
-def get_t_trio_from_edge(edge: Tuple[str, str]):
+def get_t_trio_from_edge(graph: DefaultDict[str, Tuple[Set[str], Set[str]]], edge: Tuple[str, str]):
     n1, n2 = edge
     achieveable_t1 = graph[n1][1]
     achieveable_t2 = graph[n2][1]
@@ -47,7 +44,7 @@ def get_t_trio_from_edge(edge: Tuple[str, str]):
     return [tuple(sorted([n1, n2, t])) for t in common]
 
 
-def get_3cliques_from_edge(edge: Tuple[str, str]):
+def get_3cliques_from_edge(graph: DefaultDict[str, Tuple[Set[str], Set[str]]], edge: Tuple[str, str]):
     n1, n2 = edge
     achieveables1 = graph[n1][0]
     achieveables2 = graph[n2][0]
@@ -56,24 +53,29 @@ def get_3cliques_from_edge(edge: Tuple[str, str]):
     return [set([n1, n2, t]) for t in common]
 
 
-@functools.lru_cache(maxsize=None)
-def get_largest_clique(clique_so_far: Tuple[str]):
+def get_largest_clique(
+    graph: DefaultDict[str, Tuple[Set[str], Set[str]]], clique_so_far: Tuple[str], cache: Dict[Tuple[str], Tuple[str]]
+):
+    if clique_so_far in cache:
+        return cache[clique_so_far]
     largest_clique = clique_so_far
     for n in graph:
         if n in clique_so_far:
             continue
         if all([clique_node in graph[n][0] for clique_node in clique_so_far]):
-            new_clique = get_largest_clique(tuple(sorted([*clique_so_far, n])))
+            new_clique = get_largest_clique(graph, tuple(sorted([*clique_so_far, n])), cache)
             if len(new_clique) > len(largest_clique):
                 largest_clique = new_clique
+    cache[clique_so_far] = largest_clique
     return largest_clique
 
 
 def solve_part1(input_path: str, expected_output: Optional[int] = None):
     sol = 0
+    graph, edges = get_parsed_input(input_path)
     trios = set()
     for edge in edges:
-        new_trios = get_t_trio_from_edge(edge)
+        new_trios = get_t_trio_from_edge(graph, edge)
         trios.update(new_trios)
     sol = len(trios)
     handle_solution(sol, expected_output)
@@ -92,14 +94,15 @@ def solve_part2(input_path: str, expected_output: Optional[int] = None):
     sol = 0
     graph, edges = get_parsed_input(input_path)
     largest_clique = []
+    cache = dict()
     # Seems like each node is connected to exactly 13 other nodes...
     # print_nodes_degree_histogram(graph)
 
     for i, edge in enumerate(edges):
         print(f"{i} / {len(edges)}")
-        trios = get_3cliques_from_edge(edge)
+        trios = get_3cliques_from_edge(graph, edge)
         for trio in trios:
-            clique = get_largest_clique(tuple(sorted(trio)))
+            clique = get_largest_clique(graph, tuple(sorted(trio)), cache)
             if len(largest_clique) < len(clique):
                 largest_clique = clique
 
@@ -109,12 +112,10 @@ def solve_part2(input_path: str, expected_output: Optional[int] = None):
 
 
 def day23():
-    if ACTIVE_PATH == EXAMPLE_PATH:
-        solve_part1(EXAMPLE_PATH, 7)
-        solve_part2(EXAMPLE_PATH, "co,de,ka,ta")
-    if ACTIVE_PATH == INPUT_PATH:
-        solve_part1(INPUT_PATH, 1215)
-        solve_part2(INPUT_PATH, "bm,by,dv,ep,ia,ja,jb,ks,lv,ol,oy,uz,yt")
+    solve_part1(EXAMPLE_PATH, 7)
+    solve_part1(INPUT_PATH, 1215)
+    solve_part2(EXAMPLE_PATH, "co,de,ka,ta")
+    solve_part2(INPUT_PATH, "bm,by,dv,ep,ia,ja,jb,ks,lv,ol,oy,uz,yt")
 
 
 if __name__ == "__main__":
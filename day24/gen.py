@@ -0,0 +1,53 @@
+import math
+import random
+import string
+from typing import Iterator, List
+
+# `size` is the number of input bits. The gates form a correct ripple-carry adder
+DEFAULT_SIZE = 45
+
+
+def get_wire_names(rng: random.Random, count: int) -> List[str]:
+    # Three letters like the real input, longer names once those run out
+    name_length = max(3, math.ceil(math.log(count * 4, 26)))
+    names = set()
+    while len(names) < count:
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(name_length))
+        if name[0] not in "xyz":
+            names.add(name)
+    return list(names)
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    width = max(2, len(str(size)))
+    x = [f"x{i:0{width}}" for i in range(size)]
+    y = [f"y{i:0{width}}" for i in range(size)]
+    z = [f"z{i:0{width}}" for i in range(size + 1)]
+    for wire in x + y:
+        yield f"{wire}: {rng.randint(0, 1)}"
+    yield ""
+
+    names = iter(get_wire_names(rng, 5 * size))
+    gates = [(x[0], "XOR", y[0], z[0])]
+    carry = next(names)
+    gates.append((x[0], "AND", y[0], carry))
+    for i in range(1, size):
+        half_sum, half_carry, carry_through = next(names), next(names), next(names)
+        next_carry = z[size] if i == size - 1 else next(names)
+        gates += [
+            (x[i], "XOR", y[i], half_sum),
+            (x[i], "AND", y[i], half_carry),
+            (half_sum, "XOR", carry, z[i]),
+            (half_sum, "AND", carry, carry_through),
+            (half_carry, "OR", carry_through, next_carry),
+        ]
+        carry = next_carry
+    if size == 1:
+        gates[-1] = (x[0], "AND", y[0], z[1])
+
+    rng.shuffle(gates)
+    for w1, gate, w2, output in gates:
+        if rng.random() < 0.5:
+            w1, w2 = w2, w1
+        yield f"{w1} {gate} {w2} -> {output}"
@@ -6,6 +6,7 @@ from operator import and_, or_, xor
 import os
 from typing import DefaultDict, Dict, List, Optional, Tuple
 
+from cache import cached_parse
 from common import handle_solution, read_input_as_lines
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
@@ -91,6 +92,7 @@ def add_gate(graph: DefaultDict[str, Node], gate: str):
     graph[w2].add_output(o)
 
 
+@cached_parse
 def get_parsed_input(input_path: str) -> Tuple[DefaultDict[str, Node], List[str]]:
     lines = read_input_as_lines(input_path)
     # graph = defaultdict(lambda: (set()))
@@ -106,7 +108,8 @@ def get_parsed_input(input_path: str) -> Tuple[DefaultDict[str, Node], List[str]
         else:
             add_gate(graph, line)
     outputs = [n for n in graph.keys() if n.startswith("z")]
-    return graph, sorted(outputs, reverse=True)
+    # A plain dict, as the default factory can't be pickled (nor called: every wire is added explicitly)
+    return dict(graph), sorted(outputs, reverse=True)
 
 
 def do_topological_sort_step(graph: DefaultDict[str, Node], sinks: List[str], sorted_keys: List[str]):
@@ -0,0 +1,20 @@
+import random
+from typing import Iterator
+
+# `size` is the number of schematics (locks and keys)
+DEFAULT_SIZE = 500
+COLUMNS = 5
+HEIGHT = 7
+
+
+def generate(size: int = DEFAULT_SIZE, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    for i in range(size):
+        is_lock = rng.random() < 0.5
+        heights = [rng.randint(0, HEIGHT - 2) for _ in range(COLUMNS)]
+        if i:
+            yield ""
+        for row in range(HEIGHT):
+            # Locks hang from the top row, keys stand on the bottom one
+            level = row if is_lock else HEIGHT - 1 - row
+            yield "".join("#" if level <= height else "." for height in heights)
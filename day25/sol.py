@@ -1,9 +1,9 @@
 import os
-from pprint import pprint
 from typing import List, Optional
 
 
-from common import handle_solution, read_input_as_lines
+from cache import cached_parse
+from common import handle_solution, iter_input_lines
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
@@ -20,36 +20,35 @@ def get_hist(lines: List[str]):
     return hist
 
 
-def parse_current_lockey(lines: List[str], curr_line_index: int, locks: List[List[int]], keys: List[List[int]]):
-    start_index = curr_line_index
-    while curr_line_index < len(lines) and lines[curr_line_index] != "":
-        curr_line_index += 1
+def add_lockey(lines: List[str], locks: List[List[int]], keys: List[List[int]]):
+    hist = get_hist(lines)
 
-    end_index = curr_line_index
-    curr_line_index += 1
-    hist = get_hist(lines[start_index:end_index])
-
-    line = lines[start_index]
+    line = lines[0]
     if all([c == "#" for c in line]):
         locks.append(hist)
     else:
         assert all([c == "." for c in line])
         keys.append(hist)
 
-    return curr_line_index
-
 
 def does_key_fit_lock(key: List[int], lock: List[int]) -> bool:
     return all(key[i] + lock[i] <= MAX_HEIGHT for i in range(len(key)))
 
 
+@cached_parse(read_only=True)
 def parse_input(input_path: str):
-    lines = read_input_as_lines(input_path)
     keys = []
     locks = []
-    curr_line_index = 0
-    while curr_line_index < len(lines):
-        curr_line_index = parse_current_lockey(lines, curr_line_index, locks, keys)
+    # Only one lock / key is held at a time
+    lockey_lines = []
+    for line in iter_input_lines(input_path):
+        if line == "":
+            add_lockey(lockey_lines, locks, keys)
+            lockey_lines = []
+            continue
+        lockey_lines.append(line)
+    if lockey_lines:
+        add_lockey(lockey_lines, locks, keys)
 
     return locks, keys
 
@@ -58,6 +57,8 @@ def solve_part1(input_path: str, expected_output: Optional[int] = None):
     sol = 0
     locks, keys = parse_input(input_path)
     if DEBUG:
+        from pprint import pprint
+
         pprint(locks)
         print("---------------")
         pprint(keys)
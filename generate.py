@@ -0,0 +1,76 @@
+import argparse
+import importlib
+import os
+import sys
+from types import ModuleType
+from typing import Dict, List, Optional
+
+from registry import get_available_days, get_day_dir
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+GENERATED_DIR = dir_path + os.sep + ".generated"
+
+
+def get_generator(day: int) -> ModuleType:
+    return importlib.import_module(f"day{day:02}.gen")
+
+
+def get_generated_path(day: int, size: int, seed: int) -> str:
+    return GENERATED_DIR + os.sep + f"day{day:02}" + os.sep + f"size{size}-seed{seed}.txt"
+
+
+def write_input(day: int, size: int, seed: int = 0, output_path: Optional[str] = None) -> str:
+    """
+    Writes a generated input (streamed, so arbitrarily large sizes fit) and returns its path.
+    Inputs under `.generated/` are reused, since the generators are deterministic per seed
+    """
+    path = output_path or get_generated_path(day, size, seed)
+    if output_path is None and os.path.exists(path):
+        return path
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "w") as f:
+            for line in get_generator(day).generate(size, seed):
+                f.write(line)
+                f.write("\n")
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return path
+
+
+def get_solve_kwargs(day: int, size: int, part: int) -> Dict:
+    generator = get_generator(day)
+    if not hasattr(generator, "get_solve_kwargs"):
+        return dict()
+    return generator.get_solve_kwargs(size, part)
+
+
+def get_min_size(day: int) -> int:
+    """
+    Smallest size the day's generator makes a solvable input for
+    """
+    return getattr(get_generator(day), "MIN_SIZE", 1)
+
+
+def get_generator_days() -> List[int]:
+    return [day for day in get_available_days() if os.path.exists(get_day_dir(day) + os.sep + "gen.py")]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate synthetic Advent of Code 2024 inputs")
+    parser.add_argument("--day", type=int, required=True, choices=get_generator_days())
+    parser.add_argument("--size", type=int, default=None, help="Meaning depends on the day, see dayNN/gen.py")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default=None, help="Output path (default: under .generated/)")
+    args = parser.parse_args(argv)
+    size = args.size if args.size is not None else get_generator(args.day).DEFAULT_SIZE
+    print(write_input(args.day, size, args.seed, args.output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
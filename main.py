@@ -1,51 +1,253 @@
-from day01.sol import day01
-from day02.sol import day02
-from day03.sol import day03
-from day04.sol import day04
-from day05.sol import day05
-from day06.sol import day06
-from day07.sol import day07
-from day08.sol import day08
-from day09.sol import day09
-from day10.sol import day10
-from day11.sol import day11
-from day12.sol import day12
-from day13.sol import day13
-from day14.sol import day14
-from day15.sol import day15
-from day16.sol import day16
-from day17.sol import day17
-from day18.sol import day18
-from day19.sol import day19
-from day20.sol import day20
-from day21.sol import day21
-from day22.sol import day22
-from day23.sol import day23
-from day24.sol import day24
-from day25.sol import day25
-
-# day01()
-# day02()
-# day03()
-# day04()
-# day05()
-# day06()
-# day07()
-# day08()
-# day09()
-# day10()
-# day11()
-# day12()
-# day13()
-# day14()
-# day15()
-# day16()
-# day17()
-# day18()
-# day19()
-# day20()
-# day21()
-# day22()
-# day23()
-# day24()
-day25()
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+import io
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+from typing import Dict, List, Optional
+
+from cache import CACHE_ENV
+from common import RESULTS_SINK_ENV, STATUS_FAIL
+from profiling import PROFILE_DIR_ENV, PROFILE_ENV, PROFILERS, SAMPLE_INTERVAL_ENV, get_profilers, profile
+from registry import (
+    IMPORT_BUDGET_MS,
+    PARTS,
+    Case,
+    get_available_days,
+    get_day_module,
+    measure_import_time,
+    run_case,
+    select_cases,
+)
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+DURATIONS_PATH = dir_path + os.sep + "durations.json"
+
+# Rough wall times (seconds) of the known slow parts, used until a run records real ones
+SLOW_PARTS = {(6, 2): 120, (14, 2): 90, (20, 2): 5, (23, 1): 10, (23, 2): 60}
+
+STATUS_OK = "OK"
+STATUS_FAILED = "FAILED"
+STATUS_TIMEOUT = "TIMEOUT"
+STATUS_MISSING = "MISSING"
+
+
+@dataclass
+class TaskResult:
+    case: Case
+    status: str
+    elapsed: float
+    output: str = ""
+    error: Optional[str] = None
+    profile_paths: Dict[str, str] = field(default_factory=dict)
+
+
+class TaskTimeout(Exception):
+    pass
+
+
+def parse_selection(selection: str, allowed: List[int]) -> List[int]:
+    selected = set()
+    for item in selection.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if "-" in item:
+            start, end = item.split("-")
+            selected.update(range(int(start), int(end) + 1))
+        else:
+            selected.add(int(item))
+    bad = [n for n in selected if n not in allowed]
+    if bad:
+        raise argparse.ArgumentTypeError(f"Out of range: {sorted(bad)}")
+    return sorted(selected)
+
+
+def get_profile_name(case: Case) -> str:
+    parts = "".join(str(part) for part in case.parts)
+    return f"day{case.day:02}-part{parts}-case{case.index}"
+
+
+def _raise_timeout(signum, frame):
+    raise TaskTimeout()
+
+
+def run_task(case: Case, timeout: Optional[float] = None, trace_memory: bool = True) -> TaskResult:
+    try:
+        module = get_day_module(case.day)
+    except Exception:
+        return TaskResult(case, STATUS_FAILED, 0, error=traceback.format_exc())
+    input_path = getattr(module, case.input_name, None)
+    if input_path is not None and not os.path.exists(input_path):
+        return TaskResult(case, STATUS_MISSING, 0, error=f"{input_path} does not exist")
+
+    has_alarm = timeout and hasattr(signal, "SIGALRM")
+    if has_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    status, error = STATUS_OK, None
+    stdout = io.StringIO()
+    profile_paths = dict()
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(stdout), profile(get_profile_name(case), get_profilers()) as profile_paths:
+            context = run_case(case, trace_memory)
+        if context.has_failed:
+            status = STATUS_FAILED
+            error = "\n".join(
+                f"Part {r.part}: expected {r.expected}, got {r.solution}"
+                for r in context.results
+                if r.status == STATUS_FAIL
+            )
+    except TaskTimeout:
+        status, error = STATUS_TIMEOUT, f"Timed out after {timeout}s"
+    except Exception:
+        status, error = STATUS_FAILED, traceback.format_exc()
+    finally:
+        if has_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    elapsed = time.perf_counter() - start
+
+    return TaskResult(case, status, elapsed, stdout.getvalue(), error, profile_paths)
+
+
+def load_durations() -> Dict[str, float]:
+    if not os.path.exists(DURATIONS_PATH):
+        return dict()
+    with open(DURATIONS_PATH) as f:
+        return json.load(f)
+
+
+def save_durations(durations: Dict[str, float]):
+    with open(DURATIONS_PATH, "w") as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+
+
+def get_expected_duration(case: Case, durations: Dict[str, float]) -> float:
+    if case.key in durations:
+        return durations[case.key]
+    if case.is_example:
+        return 0
+    return max(SLOW_PARTS.get((case.day, part), 1) for part in case.parts)
+
+
+def run_cases(
+    cases: List[Case], workers: Optional[int], timeout: Optional[float], trace_memory: bool = True
+) -> List[TaskResult]:
+    durations = load_durations()
+    # Longest job first, so the slow days don't end up running alone at the tail
+    scheduled = sorted(cases, key=lambda c: get_expected_duration(c, durations), reverse=True)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_task, case, timeout, trace_memory): case for case in scheduled}
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception:
+                results.append(TaskResult(futures[future], STATUS_FAILED, 0, error=traceback.format_exc()))
+
+    for result in results:
+        if result.status == STATUS_OK:
+            durations[result.case.key] = result.elapsed
+    save_durations(durations)
+
+    return sorted(results, key=lambda r: (r.case.day, r.case.index))
+
+
+def print_results(results: List[TaskResult], previous_elapsed: Optional[Dict[str, float]] = None):
+    for result in results:
+        case = result.case
+        timing = f"{result.elapsed:.3f}s"
+        if previous_elapsed and case.key in previous_elapsed and result.status == STATUS_OK:
+            previous = previous_elapsed[case.key]
+            change = f"{result.elapsed / previous - 1:+.0%}" if previous else "n/a"
+            timing += f", was {previous:.3f}s, {change}"
+        print(f"[{result.status}] day{case.day:02} {case.source} ({timing})")
+        for line in result.output.splitlines():
+            print(f"    {line}")
+        if result.error:
+            for line in result.error.rstrip().splitlines():
+                print(f"    ! {line}")
+        for profiler, path in result.profile_paths.items():
+            print(f"    {profiler}: {os.path.relpath(path)}")
+
+
+def print_import_times(days: List[int], budget_ms: float) -> bool:
+    is_within_budget = True
+    for day in days:
+        day_entry, imports = measure_import_time(day)
+        total_ms = day_entry.cumulative_us / 1000
+        status = "OK" if total_ms <= budget_ms else "OVER BUDGET"
+        is_within_budget &= total_ms <= budget_ms
+        print(f"[{status}] {day_entry.name}: {total_ms:.1f}ms (budget {budget_ms}ms)")
+        print("    self [us] | cumulative | imported package")
+        for entry in sorted(imports, key=lambda e: e.self_us, reverse=True)[:10]:
+            print(f"    {entry.self_us:>9} | {entry.cumulative_us:>10} | {'  ' * entry.depth}{entry.name}")
+    return is_within_budget
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run Advent of Code 2024 solutions")
+    parser.add_argument("--days", default="1-25", help="Days to run, e.g. 6,14,20-23")
+    parser.add_argument("--parts", default="1,2", help="Parts to run, e.g. 2")
+    parser.add_argument("--inputs", choices=("all", "example", "input"), default="all")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-task timeout in seconds")
+    parser.add_argument("--results", default=None, help="Append every result as a JSON line to this file")
+    parser.add_argument("--cache", action="store_true", help="Reuse parsed inputs and answers cached on disk")
+    parser.add_argument("--no-trace-memory", action="store_true", help="Don't measure peak memory with tracemalloc")
+    parser.add_argument(
+        "--profile",
+        default="",
+        help=f"Profile every case with some of {','.join(PROFILERS)}, e.g. cprofile,sample",
+    )
+    parser.add_argument("--profile-dir", default=None, help="Where to write the profiles (default: .profiles/)")
+    parser.add_argument("--sample-interval", type=float, default=None, help="Sampling profiler interval in seconds")
+    parser.add_argument("--importtime", action="store_true", help="Report the import time of each day instead")
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    args = parser.parse_args(argv)
+    try:
+        args.days = parse_selection(args.days, get_available_days())
+        args.parts = parse_selection(args.parts, list(PARTS))
+        args.profile = [name.strip() for name in args.profile.split(",") if name.strip()]
+        unknown = [name for name in args.profile if name not in PROFILERS]
+        if unknown:
+            raise ValueError(f"Unknown profilers {unknown}, expected some of {PROFILERS}")
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.importtime:
+        return int(not print_import_times(args.days, args.import_budget_ms))
+
+    if args.results:
+        # Workers pick the sink up from the environment
+        os.environ[RESULTS_SINK_ENV] = os.path.abspath(args.results)
+    if args.cache:
+        os.environ[CACHE_ENV] = "1"
+    if args.profile:
+        os.environ[PROFILE_ENV] = ",".join(args.profile)
+        if args.profile_dir:
+            os.environ[PROFILE_DIR_ENV] = os.path.abspath(args.profile_dir)
+        if args.sample_interval:
+            os.environ[SAMPLE_INTERVAL_ENV] = str(args.sample_interval)
+
+    cases = select_cases(args.days, args.parts, args.inputs)
+    results = run_cases(cases, args.workers, args.timeout, not args.no_trace_memory)
+    print_results(results)
+    return int(any(r.status in (STATUS_FAILED, STATUS_TIMEOUT) for r in results))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+from collections import Counter
+import cProfile
+from contextlib import contextmanager
+import os
+import sys
+import threading
+import tracemalloc
+from types import CodeType, FrameType
+from typing import Dict, Iterator, List, Optional
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+# Comma separated profilers to wrap every case with (see PROFILERS), off when empty
+PROFILE_ENV = "AOC_PROFILE"
+PROFILE_DIR_ENV = "AOC_PROFILE_DIR"
+SAMPLE_INTERVAL_ENV = "AOC_PROFILE_SAMPLE_INTERVAL"
+
+PROFILER_CPROFILE = "cprofile"
+PROFILER_TRACEMALLOC = "tracemalloc"
+PROFILER_SAMPLE = "sample"
+PROFILERS = (PROFILER_CPROFILE, PROFILER_TRACEMALLOC, PROFILER_SAMPLE)
+
+DEFAULT_PROFILE_DIR = dir_path + os.sep + ".profiles"
+DEFAULT_SAMPLE_INTERVAL = 0.001
+TRACEMALLOC_FRAMES = 25
+TRACEMALLOC_TOP = 30
+
+
+def get_profilers() -> List[str]:
+    profilers = [name.strip() for name in os.environ.get(PROFILE_ENV, "").split(",") if name.strip()]
+    unknown = [name for name in profilers if name not in PROFILERS]
+    if unknown:
+        raise ValueError(f"Unknown profilers {unknown}, expected some of {PROFILERS}")
+    return profilers
+
+
+def get_profile_dir() -> str:
+    return os.environ.get(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR)
+
+
+def get_sample_interval() -> float:
+    return float(os.environ.get(SAMPLE_INTERVAL_ENV, DEFAULT_SAMPLE_INTERVAL))
+
+
+def get_frame_name(code: CodeType) -> str:
+    path = code.co_filename
+    if path.startswith(dir_path + os.sep):
+        path = os.path.relpath(path, dir_path)
+    else:
+        path = os.path.basename(path)
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+def get_collapsed_stack(frame: FrameType, root: Optional[FrameType] = None) -> str:
+    names = []
+    while frame is not None:
+        names.append(get_frame_name(frame.f_code))
+        if frame is root:
+            break
+        frame = frame.f_back
+    # Frame names never contain ";", the collapsed format's separator
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """
+    Wall-clock sampling profiler: a background thread records the stack of the profiled thread
+    every `interval` seconds, whether it is computing or blocked.
+    Stacks start at `root` when given, leaving out whatever called it (process pool plumbing, ...)
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL, root: Optional[FrameType] = None):
+        self.interval = interval
+        self.root = root
+        self.counts = Counter()  # type: Counter[str]
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.counts[get_collapsed_stack(frame, self.root)] += 1
+
+    def write_collapsed(self, path: str):
+        # One "frame;frame;frame count" line per distinct stack, as read by flamegraph.pl and speedscope
+        with open(path, "w") as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+
+def write_tracemalloc_report(path: str, snapshot: tracemalloc.Snapshot, peak: int):
+    snapshot = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        )
+    )
+    statistics = snapshot.statistics("traceback")
+    with open(path, "w") as f:
+        f.write(f"Peak traced memory: {peak} bytes\n")
+        f.write(f"Still allocated at the end: {sum(stat.size for stat in statistics)} bytes\n")
+        for stat in statistics[:TRACEMALLOC_TOP]:
+            f.write(f"\n{stat.size} bytes in {stat.count} blocks\n")
+            for line in stat.traceback.format(most_recent_first=True):
+                f.write(f"{line}\n")
+
+
+@contextmanager
+def profile(name: str, profilers: List[str], output_dir: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """
+    Runs the body under the given profilers, and writes their reports as `<output_dir>/<name>.<ext>`:
+    pstats for cProfile (`python -m pstats`, snakeviz, ...), collapsed stacks for the sampler,
+    and the largest allocation tracebacks for tracemalloc.
+    Yields a dict of profiler name to report path, filled in when the body is done
+    """
+    paths = dict()  # type: Dict[str, str]
+    if not profilers:
+        yield paths
+        return
+
+    output_dir = output_dir or get_profile_dir()
+    base_path = output_dir + os.sep + name
+
+    started_tracing = PROFILER_TRACEMALLOC in profilers and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    # Frame of the `with profile(...)` statement (past this generator and contextmanager's __enter__)
+    caller = sys._getframe(2)
+    sampler = StackSampler(get_sample_interval(), caller) if PROFILER_SAMPLE in profilers else None
+    profiler = cProfile.Profile() if PROFILER_CPROFILE in profilers else None
+
+    if sampler is not None:
+        sampler.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield paths
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if sampler is not None:
+            sampler.stop()
+        # Before writing the other reports, so their allocations don't show up
+        snapshot = (
+            tracemalloc.take_snapshot() if PROFILER_TRACEMALLOC in profilers and tracemalloc.is_tracing() else None
+        )
+        peak = tracemalloc.get_traced_memory()[1]
+        os.makedirs(output_dir, exist_ok=True)
+
+        if profiler is not None:
+            paths[PROFILER_CPROFILE] = base_path + ".pstats"
+            profiler.dump_stats(paths[PROFILER_CPROFILE])
+        if sampler is not None:
+            paths[PROFILER_SAMPLE] = base_path + ".collapsed"
+            sampler.write_collapsed(paths[PROFILER_SAMPLE])
+        if snapshot is not None:
+            paths[PROFILER_TRACEMALLOC] = base_path + ".tracemalloc.txt"
+            write_tracemalloc_report(paths[PROFILER_TRACEMALLOC], snapshot, peak)
+        if started_tracing:
+            tracemalloc.stop()
@@ -0,0 +1,257 @@
+import ast
+from dataclasses import dataclass
+import importlib
+import os
+import re
+import subprocess
+import sys
+from types import ModuleType
+from typing import Dict, List, Optional, Set, Tuple
+
+import cache
+from common import SolutionContext, SolutionResult, handle_solution, solution_context
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+PARTS = (1, 2)
+
+# Budget for importing a single day (its `sol` module and everything it drags in), in milliseconds
+IMPORT_BUDGET_MS = 50
+
+IMPORTTIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class Case:
+    day: int
+    parts: Tuple[int, ...]
+    index: int
+    input_name: str
+    source: str
+
+    @property
+    def key(self) -> str:
+        return f"day{self.day:02}:{self.source}"
+
+    @property
+    def is_example(self) -> bool:
+        return not self.input_name.startswith("INPUT")
+
+
+@dataclass
+class ImportTimeEntry:
+    name: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+_loaded_modules = dict()  # type: Dict[int, ModuleType]
+_day_cases = dict()  # type: Dict[int, Tuple[int, List[Case]]]
+
+
+def get_day_dir(day: int) -> str:
+    return dir_path + os.sep + f"day{day:02}"
+
+
+def get_sol_path(day: int) -> str:
+    return get_day_dir(day) + os.sep + "sol.py"
+
+
+def get_module_name(day: int) -> str:
+    return f"day{day:02}.sol"
+
+
+def get_available_days() -> List[int]:
+    days = []
+    for name in sorted(os.listdir(dir_path)):
+        match = re.match(r"^day(\d\d)$", name)
+        if match and os.path.exists(dir_path + os.sep + name + os.sep + "sol.py"):
+            days.append(int(match.group(1)))
+    return days
+
+
+def get_day_module(day: int) -> ModuleType:
+    """
+    Days are only imported once they are actually requested, so running a single day
+    doesn't pay for the imports (numpy, networkx, ...) of all the others
+    """
+    if day not in _loaded_modules:
+        _loaded_modules[day] = importlib.import_module(get_module_name(day))
+    return _loaded_modules[day]
+
+
+def reload_day_module(day: int) -> ModuleType:
+    """
+    Re-executes the day's `sol.py`, for long-lived processes noticing it changed
+    """
+    _loaded_modules[day] = importlib.reload(get_day_module(day))
+    return _loaded_modules[day]
+
+
+def get_day_function(day: int) -> ast.FunctionDef:
+    sol_path = get_sol_path(day)
+    with open(sol_path) as f:
+        tree = ast.parse(f.read(), sol_path)
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == f"day{day:02}":
+            return node
+    raise ValueError(f"day{day:02}() not found in {sol_path}")
+
+
+def get_call_parts(call: ast.Call) -> Tuple[int, ...]:
+    name = call.func.id if isinstance(call.func, ast.Name) else ""
+    if name.startswith("solve_part"):
+        return (int(name.removeprefix("solve_part")),)
+    # Days solving both parts in a single call (e.g. day10's `solve`)
+    return PARTS
+
+
+def get_input_name(call: ast.Call) -> str:
+    for node in ast.walk(call):
+        if isinstance(node, ast.Name) and node.id.endswith("_PATH"):
+            return node.id
+    return ""
+
+
+def get_day_cases(day: int) -> List[Case]:
+    """
+    The hard-coded calls in `dayNN()` are the source of truth for what to run,
+    along with their expected answers. They are read from the source, without importing the day
+    (and read again once the source changes)
+    """
+    mtime = os.stat(get_sol_path(day)).st_mtime_ns
+    if day in _day_cases and _day_cases[day][0] == mtime:
+        return _day_cases[day][1]
+    cases = []
+    for statement in get_day_function(day).body:
+        if not isinstance(statement, ast.Expr) or not isinstance(statement.value, ast.Call):
+            continue
+        call = statement.value
+        cases.append(Case(day, get_call_parts(call), len(cases), get_input_name(call), ast.unparse(call)))
+    _day_cases[day] = (mtime, cases)
+    return cases
+
+
+def get_local_imports(path: str) -> Set[str]:
+    """
+    Paths of this repo's top-level modules (`common`, `cache`, ...) imported anywhere in the file,
+    including the imports inside functions
+    """
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module.split(".")[0])
+    paths = {dir_path + os.sep + name + ".py" for name in names}
+    return {path for path in paths if os.path.exists(path)}
+
+
+def get_day_dependencies(day: int) -> Set[str]:
+    """
+    Files a day's results depend on: its `sol.py` and inputs, and the repo modules it imports (transitively)
+    """
+    day_dir = get_day_dir(day)
+    # The directory itself changes when inputs are added or removed
+    dependencies = {day_dir} | {day_dir + os.sep + name for name in os.listdir(day_dir) if name.endswith(".txt")}
+    pending = [get_sol_path(day)]
+    while pending:
+        path = pending.pop()
+        if path in dependencies:
+            continue
+        dependencies.add(path)
+        pending.extend(get_local_imports(path))
+    return dependencies
+
+
+def select_cases(days: List[int], parts: List[int], inputs: str) -> List[Case]:
+    cases = []
+    for day in days:
+        for case in get_day_cases(day):
+            if not set(case.parts).intersection(parts):
+                continue
+            if inputs == "example" and not case.is_example:
+                continue
+            if inputs == "input" and case.is_example:
+                continue
+            cases.append(case)
+    return cases
+
+
+def get_answer_cache_key(case: Case, module: ModuleType, input_path: str) -> str:
+    # The call's source pins down the part and any extra arguments (board size, thresholds, ...)
+    return cache.get_key(
+        "answer", case.day, case.parts, case.source, cache.get_file_digest(input_path), cache.get_code_version(module)
+    )
+
+
+def run_case(case: Case, trace_memory: bool = True) -> SolutionContext:
+    module = get_day_module(case.day)
+    input_path = getattr(module, case.input_name, None)
+    use_cache = cache.is_cache_enabled() and input_path is not None
+    with solution_context(case.day, case.parts, input_path, trace_memory) as context:
+        key = get_answer_cache_key(case, module, input_path) if use_cache else None
+        answers = cache.load(key) if use_cache else cache.MISS
+        if answers is not cache.MISS:
+            for solution, expected in answers:
+                handle_solution(solution, expected)
+            return context
+
+        eval(compile(case.source, module.__file__, "eval"), vars(module))
+        if use_cache and not context.has_failed:
+            cache.store(key, [(result.solution, result.expected) for result in context.results])
+    return context
+
+
+def run_solve(
+    day: int, part: int, input_path: str, kwargs: Optional[Dict] = None, trace_memory: bool = True
+) -> SolutionResult:
+    """
+    Runs `solve_partN(input_path, **kwargs)` of the day on any input, rather than one of its hard-coded cases
+    """
+    solve_part = getattr(get_day_module(day), f"solve_part{part}", None)
+    if solve_part is None:
+        raise ValueError(f"day{day:02} has no solve_part{part}")
+    with solution_context(day, (part,), input_path, trace_memory) as context:
+        solve_part(input_path, **(kwargs or dict()))
+    if not context.results:
+        raise ValueError(f"day{day:02} solve_part{part} reported no solution")
+    # Days solving both parts in one call report them in order
+    return context.results[min(part, len(context.results)) - 1]
+
+
+def parse_importtime_output(output: str) -> List[ImportTimeEntry]:
+    entries = []
+    for line in output.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        entries.append(ImportTimeEntry(name, len(indent) // 2, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def measure_import_time(day: int) -> Tuple[ImportTimeEntry, List[ImportTimeEntry]]:
+    """
+    Imports the day in a fresh interpreter with `-X importtime`.
+    Returns the entry of the day's module, and all the imports it triggered
+    """
+    module_name = get_module_name(day)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=dir_path,
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise ImportError(f"Failed importing {module_name}:\n{process.stderr}")
+
+    entries = parse_importtime_output(process.stderr)
+    day_index = next(i for i, entry in enumerate(entries) if entry.name == module_name)
+    first_child_index = day_index
+    while first_child_index > 0 and entries[first_child_index - 1].depth > 0:
+        first_child_index -= 1
+    return entries[day_index], entries[first_child_index:day_index]
@@ -0,0 +1,102 @@
+from array import array
+from collections import deque
+from heapq import heapify, heappop, heappush
+from typing import Callable, Iterable, Iterator, Tuple
+
+from common import Grid
+
+# Distance of the states no source can reach (the largest "q" value, so it compares above any real distance)
+UNREACHED = 2**63 - 1
+
+Neighbours = Callable[[int], Iterable[int]]
+WeightedNeighbours = Callable[[int], Iterable[Tuple[int, int]]]
+
+
+def new_distances(num_states: int) -> array:
+    return array("q", [UNREACHED]) * num_states
+
+
+def bfs(num_states: int, sources: Iterable[int], neighbours: Neighbours) -> array:
+    """
+    Distances from the closest of `sources` to every state in `range(num_states)`, all edges weighing 1.
+    `neighbours(state)` yields the states reachable in one step
+    """
+    distances = new_distances(num_states)
+    frontier = []
+    for source in sources:
+        distances[source] = 0
+        frontier.append(source)
+
+    distance = 0
+    while frontier:
+        distance += 1
+        next_frontier = []
+        for state in frontier:
+            for neighbour in neighbours(state):
+                if distances[neighbour] == UNREACHED:
+                    distances[neighbour] = distance
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+    return distances
+
+
+def bfs_01(num_states: int, sources: Iterable[int], neighbours: WeightedNeighbours) -> array:
+    """
+    Like `dijkstra`, for edges weighing 0 or 1 only: a deque instead of a heap
+    (0-weight edges to the front, 1-weight edges to the back)
+    """
+    distances = new_distances(num_states)
+    queue = deque()
+    for source in sources:
+        distances[source] = 0
+        queue.append(source)
+
+    while queue:
+        state = queue.popleft()
+        distance = distances[state]
+        for neighbour, weight in neighbours(state):
+            if distance + weight < distances[neighbour]:
+                distances[neighbour] = distance + weight
+                if weight == 0:
+                    queue.appendleft(neighbour)
+                else:
+                    queue.append(neighbour)
+    return distances
+
+
+def dijkstra(num_states: int, sources: Iterable[int], neighbours: WeightedNeighbours) -> array:
+    """
+    Distances from the closest of `sources` to every state in `range(num_states)`.
+    `neighbours(state)` yields `(state, weight)` pairs, weights must not be negative
+    """
+    distances = new_distances(num_states)
+    heap = []
+    for source in sources:
+        distances[source] = 0
+        heap.append((0, source))
+    heapify(heap)
+
+    while heap:
+        distance, state = heappop(heap)
+        if distance > distances[state]:
+            # Stale entry, the state was reached by a shorter path since it was pushed
+            continue
+        for neighbour, weight in neighbours(state):
+            if distance + weight < distances[neighbour]:
+                distances[neighbour] = distance + weight
+                heappush(heap, (distance + weight, neighbour))
+    return distances
+
+
+def grid_bfs(grid: Grid, sources: Iterable[int], wall: str = "#") -> array:
+    """
+    Distance field over the grid's flat indexes, moving RDLU between cells that aren't `wall`
+    """
+    cells, wall_byte = grid.cells, ord(wall)
+
+    def get_open_neighbours(index: int) -> Iterator[int]:
+        for neighbour in grid.neighbours(index):
+            if cells[neighbour] != wall_byte:
+                yield neighbour
+
+    return bfs(len(cells), sources, get_open_neighbours)
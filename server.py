@@ -0,0 +1,238 @@
+import argparse
+from collections import Counter, deque
+from contextlib import redirect_stdout
+import io
+import ipaddress
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from types import ModuleType
+from typing import Dict, List, Optional, Tuple, Union
+
+import cache
+from common import get_result_record
+from registry import get_day_module, get_sol_path, reload_day_module, run_solve
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+DEFAULT_ADDRESS = dir_path + os.sep + ".aoc.sock"
+
+# Latencies of the last requests, for the percentiles reported by `stats`
+LATENCY_WINDOW = 1000
+
+
+def parse_address(address: str) -> Union[str, Tuple[str, int]]:
+    """
+    `host:port` for localhost TCP, anything else is the path of a Unix socket
+    """
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit() and os.sep not in address:
+        return host, int(port)
+    return address
+
+
+def is_loopback_host(host: str) -> bool:
+    """
+    Whether every address `host` resolves to is a loopback one, so a server bound to it is unreachable from the network
+    """
+    try:
+        infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    except socket.gaierror:
+        return False
+    return all(ipaddress.ip_address(info[4][0]).is_loopback for info in infos)
+
+
+def check_address(address: str, allow_remote: bool):
+    """
+    Requests run code and read any file, so TCP servers only listen on loopback hosts unless `allow_remote` is set
+    """
+    parsed_address = parse_address(address)
+    if isinstance(parsed_address, tuple) and not allow_remote and not is_loopback_host(parsed_address[0]):
+        raise ValueError(f"{parsed_address[0]} is not a loopback host, pass --allow-remote to serve on it anyway")
+
+
+class WarmSolver:
+    """
+    Keeps the day modules imported, and their parsed inputs in memory (through `cached_parse`),
+    between requests. A day is re-imported when its `sol.py` changes on disk
+    """
+
+    def __init__(self):
+        self.mtimes = dict()  # type: Dict[int, int]
+        self.counters = Counter()  # type: Counter[str]
+        self.latencies_ns = deque(maxlen=LATENCY_WINDOW)
+        cache.enable_memory_cache()
+
+    def get_module(self, day: int) -> ModuleType:
+        mtime = os.stat(get_sol_path(day)).st_mtime_ns
+        if day not in self.mtimes:
+            self.counters["module_loads"] += 1
+            module = get_day_module(day)
+        elif self.mtimes[day] != mtime:
+            self.counters["module_reloads"] += 1
+            module = reload_day_module(day)
+        else:
+            self.counters["module_hits"] += 1
+            module = get_day_module(day)
+        self.mtimes[day] = mtime
+        return module
+
+    def solve(self, day: int, part: int, input_path: str, kwargs: Optional[Dict] = None) -> Dict:
+        self.get_module(day)
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            result = run_solve(day, part, input_path, kwargs, trace_memory=False)
+        return dict(get_result_record(result), output=stdout.getvalue())
+
+    def get_stats(self) -> Dict:
+        latencies = sorted(self.latencies_ns)
+        stats = dict(self.counters, **cache.stats)
+        if latencies:
+            stats["latency_ns"] = {
+                "count": len(latencies),
+                "min": latencies[0],
+                "p50": latencies[(len(latencies) - 1) // 2],
+                "p95": latencies[max(round(0.95 * len(latencies)) - 1, 0)],
+                "max": latencies[-1],
+            }
+        return stats
+
+    def handle(self, request: Dict) -> Dict:
+        start = time.perf_counter_ns()
+        self.counters["requests"] += 1
+        op = request.get("op", "solve")
+        try:
+            if op == "solve":
+                response = self.solve(
+                    int(request["day"]), int(request["part"]), request["input_path"], request.get("kwargs")
+                )
+            elif op == "stats":
+                response = {"stats": self.get_stats()}
+            elif op == "shutdown":
+                response = dict()
+            else:
+                raise ValueError(f"Unknown op {op!r}")
+        except Exception:
+            self.counters["errors"] += 1
+            return {"ok": False, "error": traceback.format_exc()}
+
+        latency_ns = time.perf_counter_ns() - start
+        if op == "solve":
+            self.latencies_ns.append(latency_ns)
+        return dict(response, ok=True, latency_ns=latency_ns)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """
+    One JSON object per line in, one JSON object per line out, any number of requests per connection
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                response = {"ok": False, "error": f"Bad request: {e}"}
+                request = dict()
+            else:
+                response = self.server.solver.handle(request)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+            if request.get("op") == "shutdown":
+                # shutdown() waits for serve_forever(), which is running this handler: call it from another thread
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+
+class TCPServer(socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+def serve(address: str, allow_remote: bool = False):
+    """
+    Requests are solved one at a time: solutions share module state, and are CPU bound anyway
+    """
+    check_address(address, allow_remote)
+    parsed_address = parse_address(address)
+    if isinstance(parsed_address, tuple):
+        server = TCPServer(parsed_address, RequestHandler)
+    else:
+        if os.path.exists(parsed_address):
+            os.remove(parsed_address)
+        server = socketserver.UnixStreamServer(parsed_address, RequestHandler)
+    server.solver = WarmSolver()
+    print(f"Serving on {address}", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if not isinstance(parsed_address, tuple) and os.path.exists(parsed_address):
+            os.remove(parsed_address)
+
+
+def send_request(address: str, request: Dict) -> Dict:
+    parsed_address = parse_address(address)
+    family = socket.AF_INET if isinstance(parsed_address, tuple) else socket.AF_UNIX
+    with socket.socket(family, socket.SOCK_STREAM) as connection:
+        connection.connect(parsed_address)
+        connection.sendall(json.dumps(request).encode() + b"\n")
+        with connection.makefile("rb") as f:
+            return json.loads(f.readline())
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Warm Advent of Code 2024 solver daemon")
+    parser.add_argument(
+        "--address", default=DEFAULT_ADDRESS, help="Unix socket path, or host:port for TCP (default: .aoc.sock)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="Run the daemon")
+    serve_parser.add_argument(
+        "--allow-remote",
+        action="store_true",
+        help="Allow a TCP address that isn't loopback: anyone reaching it can run solutions and read files",
+    )
+    solve = commands.add_parser("solve", help="Solve a part of a day through the daemon")
+    solve.add_argument("--day", type=int, required=True)
+    solve.add_argument("--part", type=int, required=True)
+    solve.add_argument("--input", required=True, help="Path of the input file")
+    solve.add_argument("--kwargs", default="{}", help='Extra solve_partN arguments as JSON, e.g. {"board_size": 71}')
+    commands.add_parser("stats", help="Print the daemon's hit/miss and latency counters")
+    commands.add_parser("stop", help="Stop the daemon")
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        try:
+            check_address(args.address, args.allow_remote)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.command == "serve":
+        serve(args.address, args.allow_remote)
+        return 0
+
+    if args.command == "solve":
+        request = {
+            "op": "solve",
+            "day": args.day,
+            "part": args.part,
+            "input_path": os.path.abspath(args.input),
+            "kwargs": json.loads(args.kwargs),
+        }
+    else:
+        request = {"op": "shutdown" if args.command == "stop" else args.command}
+    response = send_request(args.address, request)
+    print(json.dumps(response, indent=2))
+    return int(not response["ok"])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
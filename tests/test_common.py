@@ -0,0 +1,18 @@
+from common import iter_input_lines, read_input_as_lines
+
+
+def test_iter_input_lines_strips_crlf(tmp_path):
+    input_path = tmp_path / "input.txt"
+    input_path.write_bytes(b"3   4\r\n4   3\r\n\r\n#####\r\n.....")
+
+    lines = list(iter_input_lines(str(input_path)))
+
+    assert lines == ["3   4", "4   3", "", "#####", "....."]
+    assert lines == read_input_as_lines(str(input_path))
+
+
+def test_iter_input_lines_empty_file(tmp_path):
+    input_path = tmp_path / "input.txt"
+    input_path.write_bytes(b"")
+
+    assert list(iter_input_lines(str(input_path))) == []
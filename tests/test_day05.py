@@ -0,0 +1,20 @@
+from day05.sol import compile_rules, get_corrected_update, is_correctly_ordered
+
+
+def test_rules_ordering_pages_apart():
+    # No rule between neighbouring pages 1 and 2, nor 2 and 3, but one puts 3 before 1
+    rules = compile_rules([(3, 1), (4, 1)])
+
+    assert not is_correctly_ordered([1, 2, 3], rules)
+    assert is_correctly_ordered([3, 2, 1], rules)
+
+
+def test_corrected_update_partial_rules():
+    # Sorting with the rules as comparison leaves 1 before 3, as 2 is unordered with both
+    rules = compile_rules([(3, 1), (4, 2)])
+
+    corrected = get_corrected_update([1, 2, 3], rules)
+
+    assert sorted(corrected) == [1, 2, 3]
+    assert is_correctly_ordered(corrected, rules)
+    assert corrected.index(3) < corrected.index(1)
@@ -0,0 +1,187 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import os
+import sys
+import time
+import traceback
+from typing import Dict, List, Optional, Set
+
+from main import STATUS_FAILED, STATUS_OK, TaskResult, parse_selection, print_results, run_task
+from registry import (
+    PARTS,
+    Case,
+    get_available_days,
+    get_day_dependencies,
+    get_day_module,
+    get_sol_path,
+    reload_day_module,
+    select_cases,
+)
+
+DEFAULT_INTERVAL = 0.5
+
+# Worker side: mtime of each day's sol.py when the worker last imported it
+_module_mtimes = dict()  # type: Dict[int, int]
+
+
+def warm_up(days: List[int]):
+    """
+    Imports the watched days ahead of the first change, so re-running one doesn't wait for its imports
+    """
+    for day in days:
+        try:
+            get_day_module(day)
+            _module_mtimes[day] = os.stat(get_sol_path(day)).st_mtime_ns
+        except Exception:
+            # Reported when the day runs, it may well be mid-edit
+            pass
+
+
+def refresh_day_module(day: int):
+    mtime = os.stat(get_sol_path(day)).st_mtime_ns
+    if day not in _module_mtimes:
+        get_day_module(day)
+    elif _module_mtimes[day] != mtime:
+        reload_day_module(day)
+    _module_mtimes[day] = mtime
+
+
+def run_watched_cases(cases: List[Case], timeout: Optional[float], trace_memory: bool) -> List[TaskResult]:
+    """
+    Runs in the long-lived worker, re-importing the days whose `sol.py` changed since it last ran them
+    """
+    import_errors = dict()
+    for day in sorted({case.day for case in cases}):
+        try:
+            refresh_day_module(day)
+        except Exception:
+            import_errors[day] = traceback.format_exc()
+    return [
+        (
+            TaskResult(case, STATUS_FAILED, 0, error=import_errors[case.day])
+            if case.day in import_errors
+            else run_task(case, timeout, trace_memory)
+        )
+        for case in cases
+    ]
+
+
+def get_mtimes(paths: Set[str]) -> Dict[str, Optional[int]]:
+    mtimes = dict()
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+class Watcher:
+    """
+    Polls the files the watched days depend on, and re-runs the affected days in a pre-warmed worker.
+    Changes inside day directories only need re-importing that day; a change to a shared module
+    (common.py, ...) replaces the worker, since its days hold references into the old module
+    """
+
+    def __init__(self, days: List[int], parts: List[int], inputs: str, timeout: Optional[float], trace_memory: bool):
+        self.days, self.parts, self.inputs = days, parts, inputs
+        self.timeout, self.trace_memory = timeout, trace_memory
+        self.dependencies = {day: get_day_dependencies(day) for day in days}
+        self.mtimes = get_mtimes(self.get_watched_paths())
+        self.last_elapsed = dict()  # type: Dict[str, float]
+        self.executor = None  # type: Optional[ProcessPoolExecutor]
+
+    def get_watched_paths(self) -> Set[str]:
+        return set().union(*self.dependencies.values())
+
+    def start_worker(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+        self.executor = ProcessPoolExecutor(max_workers=1, initializer=warm_up, initargs=(self.days,))
+
+    def run(self, days: List[int]):
+        try:
+            cases = select_cases(days, self.parts, self.inputs)
+        except Exception:
+            print(f"[{STATUS_FAILED}] reading the cases of {days}:\n{traceback.format_exc()}", flush=True)
+            return
+        start = time.perf_counter()
+        try:
+            results = self.executor.submit(run_watched_cases, cases, self.timeout, self.trace_memory).result()
+        except Exception:
+            # The worker died (e.g. a segfault in an extension), the next run gets a fresh one
+            print(f"[{STATUS_FAILED}] worker:\n{traceback.format_exc()}", flush=True)
+            self.start_worker()
+            return
+        print_results(results, self.last_elapsed)
+        passed = sum(result.status == STATUS_OK for result in results)
+        print(f"--- {passed} / {len(results)} OK in {time.perf_counter() - start:.3f}s, watching...", flush=True)
+        for result in results:
+            if result.status == STATUS_OK:
+                self.last_elapsed[result.case.key] = result.elapsed
+
+    def get_changed_paths(self) -> Set[str]:
+        mtimes = get_mtimes(self.get_watched_paths())
+        changed = {path for path, mtime in mtimes.items() if self.mtimes.get(path) != mtime}
+        self.mtimes = mtimes
+        return changed
+
+    def poll(self):
+        changed = self.get_changed_paths()
+        if not changed:
+            return
+        affected = [day for day in self.days if self.dependencies[day] & changed]
+        day_dirs = {os.path.dirname(get_sol_path(day)) for day in self.days}
+        if any(path not in day_dirs and os.path.dirname(path) not in day_dirs for path in changed):
+            self.start_worker()
+        for day in affected:
+            # Imports or inputs may have been added or removed
+            try:
+                self.dependencies[day] = get_day_dependencies(day)
+            except SyntaxError:
+                # Mid-edit: keep the previous dependencies, the run below reports the error
+                pass
+        self.mtimes = get_mtimes(self.get_watched_paths())
+        print(f"--- Changed: {', '.join(sorted(os.path.relpath(path) for path in changed))}", flush=True)
+        self.run(affected)
+
+    def watch(self, interval: float):
+        self.start_worker()
+        self.run(self.days)
+        try:
+            while True:
+                time.sleep(interval)
+                self.poll()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Re-run Advent of Code 2024 solutions when their files change")
+    parser.add_argument("--days", default="1-25", help="Days to watch, e.g. 6,14,20-23")
+    parser.add_argument("--parts", default="1,2", help="Parts to run, e.g. 2")
+    parser.add_argument("--inputs", choices=("all", "example", "input"), default="all")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-task timeout in seconds")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="Seconds between polls")
+    parser.add_argument("--no-trace-memory", action="store_true", help="Don't measure peak memory with tracemalloc")
+    args = parser.parse_args(argv)
+    try:
+        args.days = parse_selection(args.days, get_available_days())
+        args.parts = parse_selection(args.parts, list(PARTS))
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    watcher = Watcher(args.days, args.parts, args.inputs, args.timeout, not args.no_trace_memory)
+    try:
+        watcher.watch(args.interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())